@@ -0,0 +1,31 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers import asgi
+
+_END = object()
+
+
+class ASGIHandler(asgi.ASGIHandler):
+    """
+    Django 3.2 iterates streaming responses inside the event loop, so generators running ORM queries (e.g. the
+    export) raise ``SynchronousOnlyOperation``. This handler pulls every part of a streaming response in the thread
+    of the synchronous views instead.
+    """
+
+    async def send_response(self, response, send):
+        if not response.streaming:
+            return await super().send_response(response, send)
+        headers = [
+            (header.encode("ascii") if isinstance(header, str) else header,
+             value.encode("latin1") if isinstance(value, str) else value)
+            for header, value in response.items()
+        ]
+        headers += [(b"Set-Cookie", c.output(header="").encode("ascii").strip()) for c in response.cookies.values()]
+        await send({"type": "http.response.start", "status": response.status_code, "headers": headers})
+        # Access `__iter__` and not `streaming_content` directly in case it has been overridden in a subclass.
+        parts = iter(response)
+        next_part = sync_to_async(next, thread_sensitive=True)
+        while (part := await next_part(parts, _END)) is not _END:
+            for chunk, _ in self.chunk_bytes(part):
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body"})
+        await sync_to_async(response.close, thread_sensitive=True)()
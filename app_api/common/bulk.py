@@ -0,0 +1,49 @@
+import math
+
+from django.conf import settings
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
+class BulkRetrieveMixin:
+    """
+    Adds ``GET <list url>/bulk/?ids=1,2,3`` returning the detail representation of up to ``API_BULK_MAX_IDS`` objects
+    in the requested order, loaded with the queryset of ``retrieve``. Ids that do not exist are listed in ``missing``.
+
+    For throttling, a bulk request weighs one request per ``API_BULK_IDS_PER_REQUEST`` ids.
+    """
+    DETAIL_ACTIONS = ("retrieve", "bulk")
+
+    @action(detail=False, methods=["get"])
+    def bulk(self, request, *args, **kwargs):
+        ids = self.get_bulk_ids()
+        objects = {x.pk: x for x in self.filter_queryset(self.get_queryset()).filter(pk__in=ids)}
+        serializer = self.get_serializer([objects[x] for x in ids if x in objects], many=True)
+        return Response({
+            "results": serializer.data,
+            "missing": [x for x in ids if x not in objects],
+        })
+
+    def get_bulk_ids(self):
+        """
+        Returns: Requested ids without duplicates in requested order
+        Raises: ValidationError
+        """
+        value = self.request.query_params.get("ids", "")
+        try:
+            ids = list(dict.fromkeys(int(x) for x in value.split(",") if x.strip()))
+        except ValueError:
+            raise ValidationError({"ids": ["Must be a comma separated list of integers."]})
+        if not ids:
+            raise ValidationError({"ids": ["This parameter is required."]})
+        if len(ids) > settings.API_BULK_MAX_IDS:
+            raise ValidationError({"ids": [f"At most {settings.API_BULK_MAX_IDS} ids are allowed."]})
+        return ids
+
+    def get_throttle_weight(self, request):
+        if self.action != "bulk":
+            return 1
+        ids = [x for x in request.query_params.get("ids", "").split(",") if x.strip()]
+        ids = ids[:settings.API_BULK_MAX_IDS]
+        return max(1, math.ceil(len(ids) / settings.API_BULK_IDS_PER_REQUEST))
@@ -0,0 +1,53 @@
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import parse_etags, patch_cache_control, patch_vary_headers
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ConditionalRetrieveMixin:
+    """
+    Adds a strong ``ETag`` and ``Cache-Control`` to detail responses and answers ``If-None-Match`` requests with 304
+    without loading or serializing the object.
+
+    Viewsets have to implement ``get_watermark(pk)`` returning a value that changes whenever the serialized detail
+    changes, or None if the object does not exist.
+    """
+    ETAG_VERSION = 1
+
+    def get_watermark(self, pk):
+        raise NotImplementedError
+
+    def get_etag(self, watermark):
+        value = repr((
+            self.ETAG_VERSION,
+            self.request.accepted_renderer.format,
+            sorted(self.request.query_params.items()),
+            sorted(watermark.items()),
+        ))
+        return f'"{hashlib.sha1(value.encode("utf8")).hexdigest()}"'
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            watermark = self.get_watermark(kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except (TypeError, ValueError):
+            watermark = None
+        if watermark is None:
+            return super().retrieve(request, *args, **kwargs)
+        etag = self.get_etag(watermark)
+        if self._etag_matches(etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().retrieve(request, *args, **kwargs)
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=settings.API_CACHE_MAX_AGE)
+        patch_vary_headers(response, ["Accept"])
+        return response
+
+    def _etag_matches(self, etag):
+        """
+        Weak comparison as required for If-None-Match (RFC 7232 3.2).
+        """
+        etags = parse_etags(self.request.headers.get("If-None-Match", ""))
+        return "*" in etags or etag in [x[2:] if x.startswith("W/") else x for x in etags]
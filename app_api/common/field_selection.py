@@ -0,0 +1,68 @@
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+def _is_nested(field):
+    return isinstance(field.child if isinstance(field, serializers.ListSerializer) else field, serializers.BaseSerializer)
+
+
+class FieldSelectionSerializerMixin:
+    """
+    Serializer mixin restricting the emitted fields.
+    Args:
+        fields: Names of the fields to emit, None emits all fields.
+        expand: Names of the nested serializers to emit nested. All other nested serializers are emitted as primary
+            keys. None expands all.
+    Raises: ValidationError if an unknown field is requested.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        unknown = set(fields or []) - set(self.fields)
+        if unknown:
+            raise ValidationError({"fields": [f"Unknown field: {x}" for x in sorted(unknown)]})
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        if expand is not None:
+            for name, field in list(self.fields.items()):
+                if name not in expand and _is_nested(field):
+                    source = {"source": field.source} if field.source != name else {}
+                    self.fields[name] = serializers.PrimaryKeyRelatedField(
+                        read_only=True, many=isinstance(field, serializers.ListSerializer), **source,
+                    )
+
+
+class FieldSelectionViewMixin:
+    """
+    Reads the comma separated query params ``fields`` and ``expand`` and passes them to the serializer.
+    Without both params, all fields are emitted fully expanded.
+    Use ``selects(name)`` and ``expands(name)`` to build querysets that load only what is emitted.
+    """
+
+    def get_field_selection(self):
+        fields = self._get_list_param("fields")
+        expand = self._get_list_param("expand")
+        if fields is not None and expand is None:
+            expand = set()
+        return fields, expand
+
+    def selects(self, name):
+        fields, _ = self.get_field_selection()
+        return fields is None or name in fields
+
+    def expands(self, name):
+        _, expand = self.get_field_selection()
+        return self.selects(name) and (expand is None or name in expand)
+
+    def get_serializer(self, *args, **kwargs):
+        fields, expand = self.get_field_selection()
+        kwargs.setdefault("fields", fields)
+        kwargs.setdefault("expand", expand)
+        return super().get_serializer(*args, **kwargs)
+
+    def _get_list_param(self, name):
+        value = self.request.query_params.get(name)
+        if value is None:
+            return None
+        return {x.strip() for x in value.split(",") if x.strip()}
@@ -0,0 +1,79 @@
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.regex_helper import _lazy_re_compile
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+re_accepts_gzip = _lazy_re_compile(r'\bgzip\b')
+re_accepts_brotli = _lazy_re_compile(r'\bbr\b')
+
+
+def compress_string_brotli(s):
+    return brotli.compress(s, mode=brotli.MODE_TEXT)
+
+
+def compress_sequence_brotli(sequence):
+    compressor = brotli.Compressor(mode=brotli.MODE_TEXT)
+    for item in sequence:
+        if data := compressor.process(item):
+            yield data
+        if data := compressor.flush():
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses json responses with brotli (if installed and accepted) or gzip, like django's ``GZipMiddleware``.
+    Only ``COMPRESSED_CONTENT_TYPES`` are compressed, so html pages containing csrf tokens stay uncompressed
+    (BREACH).
+    """
+    MIN_LENGTH = 200
+    COMPRESSED_CONTENT_TYPES = ("application/json", "application/x-ndjson")
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        if not response.streaming and len(response.content) < self.MIN_LENGTH:
+            return response
+        content_type = response.get('Content-Type', '').split(';')[0].strip()
+        if content_type not in self.COMPRESSED_CONTENT_TYPES:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.get_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+        compress_string_func, compress_sequence_func = {
+            "br": (compress_string_brotli, compress_sequence_brotli),
+            "gzip": (compress_string, compress_sequence),
+        }[encoding]
+
+        if response.streaming:
+            response.streaming_content = compress_sequence_func(response.streaming_content)
+            del response['Content-Length']
+        else:
+            compressed_content = compress_string_func(response.content)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response['Content-Length'] = str(len(response.content))
+
+        # The body changed, so a strong ETag is not valid anymore (RFC 7232 2.1).
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def get_encoding(accept_encoding):
+        if brotli is not None and re_accepts_brotli.search(accept_encoding):
+            return "br"
+        if re_accepts_gzip.search(accept_encoding):
+            return "gzip"
+        return None
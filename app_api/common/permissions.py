@@ -0,0 +1,17 @@
+import hmac
+
+from django.conf import settings
+from rest_framework.permissions import BasePermission
+
+
+class HasMetricsToken(BasePermission):
+    """
+    Grants access to requests with the header ``Authorization: Bearer <METRICS_TOKEN>``. Without a configured
+    ``METRICS_TOKEN`` every request is denied.
+    """
+
+    def has_permission(self, request, view):
+        if not settings.METRICS_TOKEN:
+            return False
+        scheme, _, token = request.META.get("HTTP_AUTHORIZATION", "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode())
@@ -0,0 +1,31 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` serializing with orjson. Produces the same output as the default renderer: datetimes, decimals and
+    lazy strings are delegated to DRF's ``JSONEncoder``. Falls back to the default renderer if orjson is not installed,
+    indented output is requested (e.g. by the browsable API), ``COMPACT_JSON`` is off or ``UNICODE_JSON`` is off, or
+    the data contains integers exceeding 64 bit.
+    """
+    OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME if orjson else None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.OPTIONS)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Like the default renderer, fully escape \u2028 and \u2029 to output a strict javascript subset.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -1,10 +1,15 @@
 from rest_framework import serializers
 
-from app_prime_league.models import Team, Match, Player
+from app_api.common.field_selection import FieldSelectionSerializerMixin
+from app_prime_league.models import Team, Match, Player, MatchEvent
 
 
-class TeamSerializer(serializers.ModelSerializer):
-    matches_count = serializers.IntegerField(source="matches_against.count")
+class TeamSerializer(FieldSelectionSerializerMixin, serializers.ModelSerializer):
+    """
+    `matches_count` is read from the `matches_count` annotation, from the `matches_counts` dict of the serializer context
+    or counted as fallback.
+    """
+    matches_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Team
@@ -15,6 +20,14 @@ class TeamSerializer(serializers.ModelSerializer):
             'matches_count',
         ]
 
+    def get_matches_count(self, obj):
+        if hasattr(obj, "matches_count"):
+            return obj.matches_count
+        matches_counts = self.context.get("matches_counts")
+        if matches_counts is not None:
+            return matches_counts.get(obj.id, 0)
+        return obj.matches_against.count()
+
 
 class PlayerSerializer(serializers.ModelSerializer):
     class Meta:
@@ -29,7 +42,7 @@ class PlayerSerializer(serializers.ModelSerializer):
         ]
 
 
-class TeamDetailSerializer(serializers.ModelSerializer):
+class TeamDetailSerializer(FieldSelectionSerializerMixin, serializers.ModelSerializer):
     class MatchSerializer(serializers.ModelSerializer):
         enemy_team_name = serializers.CharField(source="enemy_team.name")
 
@@ -60,7 +73,7 @@ class TeamDetailSerializer(serializers.ModelSerializer):
         ]
 
 
-class MatchSerializer(serializers.ModelSerializer):
+class MatchSerializer(FieldSelectionSerializerMixin, serializers.ModelSerializer):
     team = TeamSerializer()
     enemy_team = TeamSerializer()
 
@@ -75,7 +88,7 @@ class MatchSerializer(serializers.ModelSerializer):
         ]
 
 
-class MatchDetailSerializer(serializers.ModelSerializer):
+class MatchDetailSerializer(FieldSelectionSerializerMixin, serializers.ModelSerializer):
     team = TeamSerializer()
     enemy_team = TeamSerializer()
     team_lineup = PlayerSerializer(many=True)
@@ -95,3 +108,19 @@ class MatchDetailSerializer(serializers.ModelSerializer):
             'enemy_lineup',
             'begin',
         ]
+
+
+class MatchEventSerializer(serializers.ModelSerializer):
+    match_id = serializers.IntegerField(source="match.match_id")
+
+    class Meta:
+        model = MatchEvent
+        fields = [
+            'id',
+            'kind',
+            'match',
+            'match_id',
+            'team',
+            'data',
+            'created_at',
+        ]
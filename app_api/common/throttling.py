@@ -0,0 +1,20 @@
+from rest_framework.throttling import ScopedRateThrottle
+
+
+class WeightedScopedRateThrottle(ScopedRateThrottle):
+    """
+    ``ScopedRateThrottle`` where a request can count as several requests. Views define the weight of a request with
+    ``get_throttle_weight(request)``, all other requests weigh 1.
+    """
+
+    def allow_request(self, request, view):
+        get_weight = getattr(view, "get_throttle_weight", None)
+        self.weight = max(1, get_weight(request)) if get_weight else 1
+        return super().allow_request(request, view)
+
+    def throttle_success(self):
+        if len(self.history) + self.weight > self.num_requests:
+            return self.throttle_failure()
+        self.history[:0] = [self.now] * self.weight
+        self.cache.set(self.key, self.history, self.duration)
+        return True
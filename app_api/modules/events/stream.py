@@ -0,0 +1,277 @@
+import asyncio
+import json
+import logging
+from collections import Counter
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.utils.encoders import JSONEncoder
+
+from app_api.common.serializers import MatchEventSerializer
+from app_prime_league.models import MatchEvent
+
+logger = logging.getLogger("django")
+
+
+def format_event(event: dict) -> bytes:
+    """
+    Returns: Serialized ``MatchEvent`` as server-sent event
+    """
+    data = json.dumps(event, cls=JSONEncoder)
+    return f"id: {event['id']}\nevent: {event['kind']}\ndata: {data}\n\n".encode("utf8")
+
+
+def fetch_events(cursor, team_id=None, limit=None):
+    close_old_connections()
+    qs = MatchEvent.objects.after(cursor=cursor, team_id=team_id)
+    if limit is not None:
+        qs = qs[:limit]
+    return MatchEventSerializer(qs, many=True).data
+
+
+def fetch_latest_event_id():
+    close_old_connections()
+    return MatchEvent.objects.latest_id()
+
+
+class _Subscriber:
+
+    def __init__(self, team_id, max_queue_size, cursor):
+        self.team_id = team_id
+        self.cursor = cursor
+        self.queue = asyncio.Queue(maxsize=max_queue_size)
+        self.overflowed = False
+
+    def put(self, event: dict):
+        if self.team_id is not None and event["team"] != self.team_id:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class MatchEventBroadcaster:
+    """
+    Polls new match events once per ``poll_interval`` for all connected clients and fans them out. The polling task
+    runs only while at least one client is subscribed.
+    """
+
+    def __init__(self, poll_interval=1.0, max_queue_size=1000):
+        self.poll_interval = poll_interval
+        self.max_queue_size = max_queue_size
+        self.subscribers = set()
+        self.cursor = None
+        self._task = None
+
+    async def subscribe(self, team_id=None) -> _Subscriber:
+        """
+        Starts the polling task from the latest event if it is not running.
+        Returns: Subscriber receiving all events after the ``cursor`` of the broadcaster at the time of subscription
+        """
+        if self._task is None or self._task.done():
+            cursor = await sync_to_async(fetch_latest_event_id)()
+            if self._task is None or self._task.done():
+                self.cursor = cursor
+                self._task = asyncio.ensure_future(self._poll())
+        subscriber = _Subscriber(team_id=team_id, max_queue_size=self.max_queue_size, cursor=self.cursor)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: _Subscriber):
+        self.subscribers.discard(subscriber)
+
+    async def _poll(self):
+        while self.subscribers:
+            try:
+                for event in await sync_to_async(fetch_events)(self.cursor):
+                    self.cursor = event["id"]
+                    for subscriber in list(self.subscribers):
+                        subscriber.put(event)
+            except Exception as e:
+                logger.exception(e)
+            await asyncio.sleep(self.poll_interval)
+
+
+class MatchEventStream:
+    """
+    ASGI application streaming match events as server-sent events.
+
+    Query params: ``team`` (optional team id) and ``after`` (event id). Reconnecting clients send the
+    ``Last-Event-ID`` header instead and receive all events they missed before the live events. The missed events are
+    replayed in pages of ``REPLAY_PAGE_SIZE`` until the cursor of the broadcaster, which queues all later events.
+
+    The stream bypasses the django middlewares, so it adds the CORS headers for ``CORS_ALLOWED_ORIGINS`` itself and
+    limits the open connections in total and per client (identified like the throttles of the API).
+    """
+    REPLAY_PAGE_SIZE = 500
+
+    def __init__(self, broadcaster: MatchEventBroadcaster, heartbeat_interval=15.0, max_connections=1000,
+                 max_connections_per_client=5):
+        self.broadcaster = broadcaster
+        self.heartbeat_interval = heartbeat_interval
+        self.max_connections = max_connections
+        self.max_connections_per_client = max_connections_per_client
+        self.connections = Counter()
+
+    async def __call__(self, scope, receive, send):
+        cors_headers = self._get_cors_headers(scope)
+        if scope["method"] == "OPTIONS":
+            await self._send_preflight(send, cors_headers)
+            return
+        if scope["method"] != "GET":
+            await self._send_error(send, 405, b"Method not allowed", cors_headers)
+            return
+        try:
+            team_id, cursor = self._parse_request(scope)
+        except ValueError:
+            await self._send_error(send, 400, b"team and after must be integers", cors_headers)
+            return
+
+        client = self._get_client_ident(scope)
+        if sum(self.connections.values()) >= self.max_connections:
+            await self._send_error(send, 503, b"Too many connections", cors_headers)
+            return
+        if self.connections[client] >= self.max_connections_per_client:
+            await self._send_error(send, 429, b"Too many connections of this client", cors_headers)
+            return
+        self.connections[client] += 1
+        try:
+            await self._serve(send, receive, team_id, cursor, cors_headers)
+        finally:
+            self.connections[client] -= 1
+            if not self.connections[client]:
+                del self.connections[client]
+
+    async def _serve(self, send, receive, team_id, cursor, cors_headers):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+                *cors_headers,
+            ],
+        })
+        subscriber = await self.broadcaster.subscribe(team_id=team_id)
+        disconnected = asyncio.ensure_future(self._wait_for_disconnect(receive))
+        try:
+            if cursor is not None:
+                cursor = await self._replay(send, team_id, cursor, subscriber.cursor, disconnected)
+            await self._stream(send, subscriber, cursor or 0, disconnected)
+        finally:
+            self.broadcaster.unsubscribe(subscriber)
+            disconnected.cancel()
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _replay(self, send, team_id, cursor, until, disconnected):
+        """
+        Sends the events after ``cursor`` at least up to ``until``.
+        Returns: Id of the last sent event
+        """
+        while cursor < until and not disconnected.done():
+            events = await sync_to_async(fetch_events)(cursor, team_id, self.REPLAY_PAGE_SIZE)
+            for event in events:
+                await self._send_event(send, event)
+                cursor = event["id"]
+            if len(events) < self.REPLAY_PAGE_SIZE:
+                break
+        return cursor
+
+    async def _stream(self, send, subscriber, cursor, disconnected):
+        while not disconnected.done() and not subscriber.overflowed:
+            get = asyncio.ensure_future(subscriber.queue.get())
+            done, _ = await asyncio.wait({get, disconnected}, timeout=self.heartbeat_interval,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if get not in done:
+                get.cancel()
+                if not disconnected.done():
+                    await send({"type": "http.response.body", "body": b": heartbeat\n\n", "more_body": True})
+                continue
+            event = get.result()
+            if event["id"] > cursor:
+                await self._send_event(send, event)
+                cursor = event["id"]
+
+    @staticmethod
+    async def _send_event(send, event):
+        await send({"type": "http.response.body", "body": format_event(event), "more_body": True})
+
+    @staticmethod
+    async def _wait_for_disconnect(receive):
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+
+    @staticmethod
+    async def _send_error(send, status, body, headers=()):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"text/plain"), *headers],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def _send_preflight(send, cors_headers):
+        headers = [(b"vary", b"origin")]
+        if cors_headers:
+            headers += [
+                *cors_headers,
+                (b"access-control-allow-methods", b"GET, OPTIONS"),
+                (b"access-control-allow-headers", b"cache-control, last-event-id"),
+                (b"access-control-max-age", b"86400"),
+            ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    def _get_cors_headers(scope):
+        """
+        Returns: CORS headers if the ``Origin`` of the request is allowed, like the ``CorsMiddleware`` of django
+        """
+        origin = dict(scope.get("headers", [])).get(b"origin")
+        if origin is None or origin.decode("latin1") not in settings.CORS_ALLOWED_ORIGINS:
+            return []
+        return [(b"access-control-allow-origin", origin), (b"vary", b"origin")]
+
+    @staticmethod
+    def _get_client_ident(scope):
+        """
+        Returns: ``X-Forwarded-For`` or the address of the client, like ``BaseThrottle.get_ident`` of the API
+        """
+        forwarded_for = dict(scope.get("headers", [])).get(b"x-forwarded-for", b"").decode("latin1")
+        if forwarded_for:
+            return "".join(forwarded_for.split())
+        client = scope.get("client")
+        return client[0] if client else None
+
+    @staticmethod
+    def _parse_request(scope):
+        params = parse_qs(scope.get("query_string", b"").decode("latin1"))
+        headers = dict(scope.get("headers", []))
+        team = params.get("team", [None])[0]
+        cursor = headers.get(b"last-event-id", b"").decode("latin1") or params.get("after", [None])[0]
+        return (
+            int(team) if team is not None else None,
+            int(cursor) if cursor is not None else None,
+        )
+
+
+class EventStreamRouter:
+    """
+    Routes requests to ``EVENT_STREAM_PATH`` to the event stream and everything else to django.
+    """
+
+    def __init__(self, django_application, stream_application):
+        self.django_application = django_application
+        self.stream_application = stream_application
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == settings.EVENT_STREAM_PATH:
+            return await self.stream_application(scope, receive, send)
+        return await self.django_application(scope, receive, send)
@@ -0,0 +1,46 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from app_api.common.serializers import MatchEventSerializer
+from app_prime_league.models import MatchEvent
+
+
+class MatchEventView(APIView):
+    """
+    Returns match events after the cursor ``after`` in ascending order. Pass the returned ``cursor`` as ``after`` of
+    the next request to sync incrementally. Optional filters: ``team`` and ``match`` (ids).
+    Events younger than ``MATCH_EVENT_SETTLE_TIME`` seconds are only returned by later requests.
+    """
+    DEFAULT_LIMIT = 100
+    MAX_LIMIT = 500
+
+    throttle_scope = 'events'
+
+    def get(self, request, format=None):
+        after = self._get_int_param("after", default=0)
+        limit = min(self._get_int_param("limit", default=self.DEFAULT_LIMIT), self.MAX_LIMIT)
+        events = list(MatchEvent.objects.after(
+            cursor=after,
+            team_id=self._get_int_param("team"),
+            match_id=self._get_int_param("match"),
+        )[:limit + 1])
+        has_more = len(events) > limit
+        events = events[:limit]
+        return Response({
+            "results": MatchEventSerializer(events, many=True).data,
+            "cursor": events[-1].id if events else after,
+            "has_more": has_more,
+        })
+
+    def _get_int_param(self, name, default=None):
+        value = self.request.query_params.get(name)
+        if value is None:
+            return default
+        try:
+            value = int(value)
+        except ValueError:
+            raise ValidationError({name: "Must be an integer."})
+        if value < 0 or (name == "limit" and value == 0):
+            raise ValidationError({name: "Must be a positive integer."})
+        return value
@@ -0,0 +1,27 @@
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+from rest_framework.views import APIView
+
+from app_prime_league.export import EXPORT_TYPES, iter_ndjson, iter_records
+
+
+class ExportView(APIView):
+    """
+    Streams all matches (including lineups) and players as newline delimited json with constant memory.
+    Query params: ``type`` comma separated subset of ``matches,players``.
+    The stream is compressed on the fly by the ``CompressionMiddleware`` if the client accepts it. Under ASGI the
+    queries of the stream run outside the event loop, see ``app_api.common.asgi.ASGIHandler``.
+    """
+    CHUNK_SIZE = 1000
+
+    throttle_scope = 'export'
+
+    def get(self, request, format=None):
+        types = [x for x in request.query_params.get("type", ",".join(EXPORT_TYPES)).split(",") if x]
+        if not types or set(types) - set(EXPORT_TYPES):
+            raise ValidationError({"type": [f"Must be a comma separated subset of {','.join(EXPORT_TYPES)}."]})
+        response = StreamingHttpResponse(
+            iter_ndjson(iter_records(types=types, chunk_size=self.CHUNK_SIZE)), content_type="application/x-ndjson",
+        )
+        response["Content-Disposition"] = 'attachment; filename="export.ndjson"'
+        return response
@@ -1,17 +1,56 @@
+from django.db.models import Prefetch
 from rest_framework import viewsets
 
+from app_api.common.bulk import BulkRetrieveMixin
+from app_api.common.conditional import ConditionalRetrieveMixin
+from app_api.common.field_selection import FieldSelectionViewMixin
+from app_api.common.pagination import IdCursorPagination
 from app_api.common.serializers import MatchSerializer, MatchDetailSerializer
-from app_prime_league.models import Match
+from app_prime_league.models import Match, Team, Player
 
 
-class MatchViewSet(viewsets.ReadOnlyModelViewSet):
+class MatchViewSet(BulkRetrieveMixin, ConditionalRetrieveMixin, FieldSelectionViewMixin,
+                    viewsets.ReadOnlyModelViewSet):
     queryset = Match.objects.all()
     serializer_class = MatchSerializer
     detail_serializer_class = MatchDetailSerializer
+    pagination_class = IdCursorPagination
 
     throttle_scope = 'matches'
 
+    TEAM_FIELDS = ("team", "enemy_team")
+    LINEUP_FIELDS = ("team_lineup", "enemy_lineup")
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if related := [x for x in self.TEAM_FIELDS if self.expands(x)]:
+            qs = qs.select_related(*related)
+        if self.action in self.DETAIL_ACTIONS:
+            qs = qs.prefetch_related(*[
+                Prefetch(x, queryset=Player.objects.all() if self.expands(x) else Player.objects.only("id"))
+                for x in self.LINEUP_FIELDS if self.selects(x)
+            ])
+        return qs
+
+    def get_watermark(self, pk):
+        return Match.objects.get_detail_watermark(pk)
+
     def get_serializer_class(self):
-        if self.action == 'retrieve':
+        if self.action in self.DETAIL_ACTIONS:
             return self.detail_serializer_class
         return self.serializer_class
+
+    def get_serializer(self, *args, **kwargs):
+        """
+        Counts the matches of all expanded teams of the serialized matches in one query.
+        """
+        instances = args[0] if args else None
+        expanded = [x for x in self.TEAM_FIELDS if self.expands(x)]
+        if instances is not None and expanded:
+            instances = instances if kwargs.get("many") else [instances]
+            team_ids = [getattr(x, f"{field}_id") for x in instances for field in expanded]
+            kwargs["context"] = {
+                **self.get_serializer_context(),
+                "matches_counts": Team.objects.get_matches_counts([x for x in team_ids if x]),
+            }
+        return super().get_serializer(*args, **kwargs)
@@ -0,0 +1,17 @@
+from django.http import HttpResponse
+from rest_framework.views import APIView
+
+from app_api.common.permissions import HasMetricsToken
+from utils.metrics import CONTENT_TYPE, render
+
+
+class MetricsView(APIView):
+    """
+    Metrics of all web workers in the Prometheus text format, readable with ``METRICS_TOKEN`` only. The metrics of
+    the update commands and bots are written to ``METRICS_TEXTFILE_DIR`` instead.
+    """
+    authentication_classes = []
+    permission_classes = [HasMetricsToken]
+
+    def get(self, request, format=None):
+        return HttpResponse(render(), content_type=CONTENT_TYPE)
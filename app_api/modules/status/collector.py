@@ -0,0 +1,125 @@
+import logging
+import subprocess
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection
+
+from app_prime_league.models import Team, UpdateRun
+from core.api import PrimeLeagueAPI
+
+logger = logging.getLogger("django")
+
+
+class StatusCollector:
+    """
+    Collects the expensive status probes (Prime League API, bot services, latest GitHub release and team counts) and
+    writes them as one snapshot to the cache. ``collect_status`` refreshes the snapshot periodically, the
+    ``StatusView`` only reads it.
+
+    Stale-while-revalidate: A snapshot older than ``STATUS_REFRESH_INTERVAL`` is still returned, but one request
+    triggers a refresh in a background thread. Only without any snapshot the probes are run synchronously.
+    """
+    CACHE_KEY = "status_snapshot"
+    LOCK_KEY = "status_snapshot_refresh"
+    CACHE_DURATION = 60 * 60 * 24
+    LOCK_DURATION = 60
+
+    @classmethod
+    def collect(cls) -> dict:
+        from app_api.modules.status.views import GitHub
+        return {
+            "latest": GitHub.latest_version(),
+            "prime_league_status": cls._get_prime_league_status(),
+            "discord_status": cls._get_service_status("discord_bot"),
+            "telegram_status": cls._get_service_status("telegram_bot"),
+            "registered_teams": Team.objects.get_registered_teams().count(),
+            "total_teams": Team.objects.all().count(),
+            "update_runs": cls._get_update_runs(),
+            "collected_at": time.time(),
+        }
+
+    @classmethod
+    def refresh(cls) -> dict:
+        """
+        Runs all probes and writes the snapshot to the cache.
+        Returns: The new snapshot
+        """
+        snapshot = cls.collect()
+        cache.set(cls.CACHE_KEY, snapshot, cls.CACHE_DURATION)
+        cache.delete(cls.LOCK_KEY)
+        return snapshot
+
+    @classmethod
+    def get_snapshot(cls) -> dict:
+        """
+        Returns: The cached snapshot. Triggers a background refresh if it is stale.
+        """
+        snapshot = cache.get(cls.CACHE_KEY)
+        if snapshot is None:
+            return cls.refresh()
+        if time.time() - snapshot["collected_at"] > settings.STATUS_REFRESH_INTERVAL:
+            cls.revalidate()
+        return snapshot
+
+    @classmethod
+    def revalidate(cls):
+        """
+        Starts a background refresh, unless another process or thread is already refreshing.
+        """
+        if not cache.add(cls.LOCK_KEY, True, cls.LOCK_DURATION):
+            return
+        threading.Thread(target=cls._refresh_in_thread, daemon=True).start()
+
+    @classmethod
+    def _refresh_in_thread(cls):
+        close_old_connections()
+        try:
+            cls.refresh()
+        except Exception as e:
+            logger.exception(e)
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _get_update_runs():
+        """
+        Returns: Per command the statistics of the latest finished run and the durations of the recent runs
+        """
+        update_runs = {}
+        for command in UpdateRun.Commands.values:
+            runs = list(UpdateRun.objects.recent_finished(command))
+            if not runs:
+                update_runs[command] = None
+                continue
+            latest = runs[0]
+            update_runs[command] = {
+                "started_at": latest.started_at,
+                "duration": latest.duration,
+                "checked": latest.checked,
+                "skipped": latest.skipped,
+                "fetch_failures": sum(latest.fetch_failures.values()),
+                "latency_p50": latest.latency_p50,
+                "latency_p95": latest.latency_p95,
+                "recent_durations": [round(x.duration, 2) for x in runs],
+            }
+        return update_runs
+
+    @staticmethod
+    def _get_prime_league_status():
+        try:
+            response = PrimeLeagueAPI.request_team(1, timeout=5)
+            return response.status_code == 200
+        except Exception:
+            return False
+
+    @staticmethod
+    def _get_service_status(service):
+        try:
+            return subprocess.call(["systemctl", "is-active", "--quiet", service], timeout=5) == 0
+        except FileNotFoundError:
+            return None
+        except Exception:
+            return False
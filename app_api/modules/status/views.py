@@ -1,14 +1,14 @@
 import logging
-import subprocess
 
 import requests
-from django.conf import settings
 from django.core.cache import cache
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from app_prime_league.models import Team
+from app_api.modules.status.collector import StatusCollector
 from core.api import PrimeLeagueAPI
+from core.providers.circuit_breaker import CircuitBreaker
+from core.providers.concurrency import AdaptiveConcurrencyLimiter
 
 logger = logging.getLogger("django")
 
@@ -84,58 +84,34 @@ class StatusView(APIView):
 
     def get(self, request, ):
         logger.info("Request PrimeBot Website")
+        snapshot = StatusCollector.get_snapshot()
         data = {
-            "latest": GitHub.latest_version(),
-            "prime_league_status": self._get_prime_league_status(),
-            "discord_status": self._get_discord_bot_status(),
-            "telegram_status": self._get_telegram_bot_status(),
-            "registered_teams": Team.objects.get_registered_teams().count(),
-            "total_teams": Team.objects.all().count(),
+            "latest": snapshot["latest"],
+            "prime_league_status": snapshot["prime_league_status"],
+            "prime_league_circuit": self._get_prime_league_circuit(),
+            "prime_league_concurrency": self._get_prime_league_concurrency(),
+            "discord_status": snapshot["discord_status"],
+            "telegram_status": snapshot["telegram_status"],
+            "registered_teams": snapshot["registered_teams"],
+            "total_teams": snapshot["total_teams"],
+            "update_runs": snapshot.get("update_runs"),
         }
         return Response(data)
 
-    def _get_prime_league_status(self):
-        cache_key = "prime_league_status"
-        cache_duration = 60
-        cached = cache.get(cache_key, )
-        if cached:
-            return cached
-        try:
-            response = PrimeLeagueAPI.request_team(1, timeout=5)
-            data = response.status_code == 200
-            cache.set(cache_key, data, cache_duration)
-            return data
-        except Exception:
-            return False
-
-    def _get_discord_bot_status(self):
-        cache_key = "discord_bot_status"
-        cache_duration = 60
-        cached = cache.get(cache_key, )
-        if cached:
-            return cached
-        try:
-            stat = subprocess.call(["systemctl", "is-active", "--quiet", "discord_bot"])
-            is_active = stat == 0
-            cache.set(cache_key, is_active, cache_duration)
-            return is_active
-        except FileNotFoundError:
-            return None
-        except Exception:
-            return False
-
-    def _get_telegram_bot_status(self):
-        cache_key = "telegram_bot_status"
-        cache_duration = 60
-        cached = cache.get(cache_key, )
-        if cached:
-            return cached
-        try:
-            stat = subprocess.call(["systemctl", "is-active", "--quiet", "telegram_bot"])
-            is_active = stat == 0
-            cache.set(cache_key, is_active, cache_duration)
-            return is_active
-        except FileNotFoundError:
-            return None
-        except Exception:
-            return False
+    def _get_prime_league_circuit(self):
+        """
+        Returns: Last known state of the Prime League circuit breaker of the update processes
+        """
+        snapshot = CircuitBreaker.cached_snapshot(PrimeLeagueAPI.circuit_breaker.name)
+        if snapshot is None:
+            return {"state": CircuitBreaker.STATE_CLOSED, "changed_at": None}
+        return {"state": snapshot["state"], "changed_at": snapshot["changed_at"]}
+
+    def _get_prime_league_concurrency(self):
+        """
+        Returns: Last known concurrency limit and latency of the update processes
+        """
+        snapshot = AdaptiveConcurrencyLimiter.cached_snapshot(PrimeLeagueAPI.concurrency_limiter.name)
+        if snapshot is None:
+            return {"limit": None, "latency_ms": None}
+        return {"limit": snapshot["limit"], "latency_ms": snapshot["latency_ms"]}
@@ -1,17 +1,42 @@
+from django.db.models import Prefetch
 from rest_framework import viewsets
 
+from app_api.common.bulk import BulkRetrieveMixin
+from app_api.common.conditional import ConditionalRetrieveMixin
+from app_api.common.field_selection import FieldSelectionViewMixin
+from app_api.common.pagination import IdCursorPagination
 from app_api.common.serializers import TeamSerializer, TeamDetailSerializer
-from app_prime_league.models import Team
+from app_prime_league.models import Team, Match, Player
 
 
-class TeamViewSet(viewsets.ReadOnlyModelViewSet):
+class TeamViewSet(BulkRetrieveMixin, ConditionalRetrieveMixin, FieldSelectionViewMixin,
+                   viewsets.ReadOnlyModelViewSet):
     queryset = Team.objects.all()
     serializer_class = TeamSerializer
     detail_serializer_class = TeamDetailSerializer
+    pagination_class = IdCursorPagination
 
     throttle_scope = 'teams'
 
+    def get_queryset(self):
+        if self.action not in self.DETAIL_ACTIONS:
+            return Team.objects.with_matches_count() if self.selects("matches_count") else super().get_queryset()
+        prefetches = []
+        if self.selects("players"):
+            players = Player.objects.all() if self.expands("players") else Player.objects.only("id", "team_id")
+            prefetches.append(Prefetch("player_set", queryset=players))
+        if self.selects("matches_against"):
+            if self.expands("matches_against"):
+                matches = Match.objects.select_related("enemy_team")
+            else:
+                matches = Match.objects.only("id", "team_id")
+            prefetches.append(Prefetch("matches_against", queryset=matches))
+        return super().get_queryset().prefetch_related(*prefetches)
+
+    def get_watermark(self, pk):
+        return Team.objects.get_detail_watermark(pk)
+
     def get_serializer_class(self):
-        if self.action == 'retrieve':
+        if self.action in self.DETAIL_ACTIONS:
             return self.detail_serializer_class
         return self.serializer_class
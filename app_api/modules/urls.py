@@ -1,7 +1,10 @@
 from django.urls import path
 from rest_framework.routers import SimpleRouter
 
+from app_api.modules.events.views import MatchEventView
+from app_api.modules.export.views import ExportView
 from app_api.modules.matches.views import MatchViewSet
+from app_api.modules.metrics.views import MetricsView
 from app_api.modules.teams.views import TeamViewSet
 from app_api.modules.views import api_root
 
@@ -10,7 +13,10 @@ router.register(r'teams', TeamViewSet, basename='team')
 router.register(r'matches', MatchViewSet, basename='match')
 
 urlpatterns = [
-    path('', api_root, name='api-root')
+    path('', api_root, name='api-root'),
+    path('events/', MatchEventView.as_view(), name='event-list'),
+    path('export/', ExportView.as_view(), name='export'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
 ]
 
 urlpatterns += router.urls
@@ -7,5 +7,6 @@ from rest_framework.reverse import reverse
 def api_root(request, format=None):
     return Response({
         'teams': reverse('team-list', request=request, format=format),
-        'matches': reverse('match-list', request=request, format=format)
+        'matches': reverse('match-list', request=request, format=format),
+        'events': reverse('event-list', request=request, format=format),
     })
@@ -1,7 +1,28 @@
+import asyncio
+import gzip
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TransactionTestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
 
-from app_prime_league.models import Team, Match
+from app_api.common.asgi import ASGIHandler
+from app_api.common.renderers import FastJSONRenderer
+from app_api.common.throttling import WeightedScopedRateThrottle
+from app_api.modules.status.collector import StatusCollector
+from app_api.modules.events.stream import MatchEventBroadcaster, MatchEventStream
+from app_api.modules.export.views import ExportView
+from app_prime_league.models import Team, Match, MatchEvent, Player, UpdateRun
+from core.comparers.match_diff import MatchChange, MatchDiff
+from utils.metrics import time_stage
 
 
 class TeamTests(APITestCase):
@@ -19,8 +40,8 @@ class TeamTests(APITestCase):
         url = reverse('team-list')
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.data[0]['team_tag'], 'TT1')
-        self.assertEqual(response.data[1]['team_tag'], 'TT2')
+        self.assertEqual(response.data['results'][0]['team_tag'], 'TT1')
+        self.assertEqual(response.data['results'][1]['team_tag'], 'TT2')
 
     def test_team_detail_read_only(self):
         url = reverse('team-detail', args=(1,))
@@ -52,8 +73,10 @@ class MatchTests(APITestCase):
         url = reverse('match-list')
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.data[0]['result'], '1:0')
-        self.assertEqual(response.data[1]['result'], '2:0')
+        self.assertEqual(response.data['results'][0]['result'], '1:0')
+        self.assertEqual(response.data['results'][1]['result'], '2:0')
+        self.assertEqual(response.data['results'][0]['team']['matches_count'], 2)
+        self.assertEqual(response.data['results'][0]['enemy_team']['matches_count'], 0)
 
     def test_match_detail_read_only(self):
         url = reverse('match-detail', args=(1,))
@@ -66,6 +89,482 @@ class MatchTests(APITestCase):
         self.assertEqual(response.status_code, 405)
 
 
+class ConditionalRequestTests(APITestCase):
+    def setUp(self) -> None:
+        self.team = Team.objects.create(id=1, name='TestTeam1', team_tag='TT1')
+        self.enemy_team = Team.objects.create(id=2, name='TestTeam2', team_tag='TT2')
+        self.match = Match.objects.create(id=1, match_id=1, team=self.team, enemy_team=self.enemy_team,
+                                          has_side_choice=0)
+
+    def assertNotModifiedUntilChanged(self, url, change):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("max-age", response["Cache-Control"])
+        etag = response["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=f"W/{etag}").status_code, 304)
+
+        change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_team_detail_player_added(self):
+        self.assertNotModifiedUntilChanged(
+            reverse('team-detail', args=(1,)),
+            lambda: Player.objects.create(id=1, name="Player", team=self.team),
+        )
+
+    def test_team_detail_enemy_team_renamed(self):
+        def change():
+            self.enemy_team.name = "Renamed"
+            self.enemy_team.save()
+
+        self.assertNotModifiedUntilChanged(reverse('team-detail', args=(1,)), change)
+
+    def test_match_detail_lineup_changed(self):
+        def change():
+            player = Player.objects.create(id=1, name="Player", team=self.enemy_team)
+            self.match.enemy_lineup.add(player)
+
+        self.assertNotModifiedUntilChanged(reverse('match-detail', args=(1,)), change)
+
+    def test_match_detail_match_count_changed(self):
+        self.assertNotModifiedUntilChanged(
+            reverse('match-detail', args=(1,)),
+            lambda: Match.objects.create(match_id=2, team=self.enemy_team, has_side_choice=0),
+        )
+
+    def test_unknown_detail(self):
+        self.assertEqual(self.client.get(reverse('team-detail', args=(99,))).status_code, 404)
+        self.assertEqual(self.client.get(reverse('match-detail', args=("abc",))).status_code, 404)
+
+
+class FieldSelectionTests(APITestCase):
+    def setUp(self) -> None:
+        self.team = Team.objects.create(id=1, name='TestTeam1', team_tag='TT1')
+        self.enemy_team = Team.objects.create(id=2, name='TestTeam2', team_tag='TT2')
+        match = Match.objects.create(id=1, match_id=1, team=self.team, enemy_team=self.enemy_team, has_side_choice=0)
+        Player.objects.create(id=1, name="Player", team=self.team)
+        match.team_lineup.add(1)
+
+    def test_team_detail_fields(self):
+        response = self.client.get(reverse('team-detail', args=(1,)), {"fields": "id,name,players"})
+        self.assertEqual(response.data, {"id": 1, "name": "TestTeam1", "players": [1]})
+
+    def test_team_detail_expand(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('team-detail', args=(1,)), {"fields": "id,players",
+                                                                          "expand": "players"})
+        self.assertEqual(response.data["players"][0]["name"], "Player")
+
+    def test_team_detail_without_relations(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('team-detail', args=(1,)), {"fields": "id,name"})
+        self.assertEqual(response.data, {"id": 1, "name": "TestTeam1"})
+
+    def test_match_detail_fields(self):
+        response = self.client.get(reverse('match-detail', args=(1,)), {"fields": "id,team,team_lineup",
+                                                                        "expand": "team"})
+        self.assertEqual(set(response.data), {"id", "team", "team_lineup"})
+        self.assertEqual(response.data["team"]["name"], "TestTeam1")
+        self.assertEqual(response.data["team_lineup"], [1])
+
+    def test_match_list_without_teams(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('match-list'), {"fields": "id,result"})
+        self.assertEqual(dict(response.data["results"][0]), {"id": 1, "result": None})
+
+    def test_default_is_fully_expanded(self):
+        response = self.client.get(reverse('match-detail', args=(1,)))
+        self.assertEqual(response.data["enemy_team"]["name"], "TestTeam2")
+        self.assertEqual(response.data["team_lineup"][0]["name"], "Player")
+
+    def test_unknown_field(self):
+        response = self.client.get(reverse('team-detail', args=(1,)), {"fields": "id,secret"})
+        self.assertEqual(response.status_code, 400)
+
+
+class BulkTests(APITestCase):
+    def setUp(self) -> None:
+        teams = [Team.objects.create(id=i, name=f'TestTeam{i}', team_tag=f'TT{i}') for i in range(1, 6)]
+        for i, team in enumerate(teams, start=1):
+            Match.objects.create(id=i, match_id=i, team=team, enemy_team=teams[i - 2], has_side_choice=0)
+
+    def test_match_bulk(self):
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('match-bulk'), {"ids": "3,1,99,3"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([x["id"] for x in response.data["results"]], [3, 1])
+        self.assertEqual(response.data["missing"], [99])
+        self.assertIn("team_lineup", response.data["results"][0])
+
+    def test_team_bulk_fields(self):
+        response = self.client.get(reverse('team-bulk'), {"ids": "1,2", "fields": "id,name"})
+        self.assertEqual([dict(x) for x in response.data["results"]],
+                         [{"id": 1, "name": "TestTeam1"}, {"id": 2, "name": "TestTeam2"}])
+
+    @override_settings(API_BULK_MAX_IDS=3)
+    def test_invalid_ids(self):
+        self.assertEqual(self.client.get(reverse('match-bulk')).status_code, 400)
+        self.assertEqual(self.client.get(reverse('match-bulk'), {"ids": "1,a"}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('match-bulk'), {"ids": "1,2,3,4"}).status_code, 400)
+
+    @override_settings(API_BULK_IDS_PER_REQUEST=2)
+    def test_bulk_is_weighted_request(self):
+        with mock.patch.object(WeightedScopedRateThrottle, "cache", LocMemCache("throttle", {})), \
+                mock.patch.object(WeightedScopedRateThrottle, "THROTTLE_RATES", {"matches": "3/day"}):
+            self.assertEqual(self.client.get(reverse('match-bulk'), {"ids": "1,2,3"}).status_code, 200)
+            self.assertEqual(self.client.get(reverse('match-bulk'), {"ids": "1,2,3"}).status_code, 429)
+            self.assertEqual(self.client.get(reverse('match-bulk'), {"ids": "1,2"}).status_code, 200)
+            self.assertEqual(self.client.get(reverse('match-detail', args=(1,))).status_code, 429)
+
+
+class ExportTests(APITestCase):
+    def setUp(self) -> None:
+        team = Team.objects.create(id=1, name='TestTeam1', team_tag='TT1')
+        Match.objects.create(id=1, match_id=1, team=team, has_side_choice=0)
+        Player.objects.create(id=1, name="Player", team=team)
+
+    def test_export_stream(self):
+        response = self.client.get(reverse('export'), {"type": "matches"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode("utf8").splitlines()
+        self.assertEqual([json.loads(x)["type"] for x in lines], ["matches"])
+
+    def test_export_gzip(self):
+        with mock.patch("app_api.common.middleware.brotli", None):
+            response = self.client.get(reverse('export'), HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        lines = gzip.decompress(b"".join(response.streaming_content)).decode("utf8").splitlines()
+        self.assertEqual([json.loads(x)["type"] for x in lines], ["matches", "players"])
+
+    def test_export_invalid_type(self):
+        self.assertEqual(self.client.get(reverse('export'), {"type": "teams"}).status_code, 400)
+
+
+class ASGIExportTests(TransactionTestCase):
+    def setUp(self) -> None:
+        team = Team.objects.create(id=1, name='TestTeam1', team_tag='TT1')
+        for i in range(1, 4):
+            Player.objects.create(id=i, name=f"Player{i}", team=team)
+
+    def test_export_queries_outside_event_loop(self):
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/api/export/", "query_string": b"type=players",
+                 "headers": [], "client": ("127.0.0.1", 50000), "server": ("testserver", 80)}
+        with mock.patch.object(ExportView, "CHUNK_SIZE", 2):
+            async_to_sync(ASGIHandler())(scope, receive, send)
+        self.assertEqual(messages[0]["status"], 200)
+        lines = b"".join(x.get("body", b"") for x in messages[1:]).decode("utf8").splitlines()
+        self.assertEqual([json.loads(x)["id"] for x in lines], [1, 2, 3])
+
+
+class QueryCountTests(APITestCase):
+    def setUp(self) -> None:
+        teams = [Team.objects.create(id=i, name=f'TestTeam{i}', team_tag=f'TT{i}') for i in range(1, 21)]
+        for i, team in enumerate(teams):
+            Match.objects.create(match_id=i, team=team, enemy_team=teams[i - 1], has_side_choice=0)
+
+    def test_match_list_queries(self):
+        url = reverse('match-list')
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {"page_size": 2})
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {"page_size": 20})
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertEqual(response.data['results'][0]['team']['matches_count'], 1)
+
+    def test_team_list_queries(self):
+        url = reverse('team-list')
+        with self.assertNumQueries(1):
+            self.client.get(url, {"page_size": 2})
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {"page_size": 20})
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertEqual(response.data['results'][0]['matches_count'], 1)
+
+    def test_cursor_pagination(self):
+        url = reverse('match-list')
+        response = self.client.get(url, {"page_size": 15})
+        self.assertIsNotNone(response.data['next'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertIsNone(response.data['next'])
+
+
+@override_settings(MATCH_EVENT_SETTLE_TIME=0)
+class MatchEventTests(APITestCase):
+    def setUp(self) -> None:
+        team = Team.objects.create(id=1, name='TestTeam1', team_tag='TT1')
+        enemy_team = Team.objects.create(id=2, name='TestTeam2', team_tag='TT2')
+        match = Match.objects.create(id=1, match_id=10, team=team, enemy_team=enemy_team, has_side_choice=0)
+        enemy_match = Match.objects.create(id=2, match_id=10, team=enemy_team, enemy_team=team, has_side_choice=1)
+        MatchEvent.objects.record(match, [
+            MatchChange(MatchDiff.NEW_ENEMY_SUGGESTION),
+            MatchChange(MatchDiff.NEW_COMMENTS, [1, 2]),
+        ])
+        MatchEvent.objects.record(enemy_match, [MatchChange(MatchDiff.NEW_TEAM_SUGGESTION)])
+        MatchEvent.objects.record(match, [MatchChange(MatchDiff.MATCH_CLOSED, "2:0")])
+        self.url = reverse('event-list')
+
+    def test_events_after_cursor(self):
+        response = self.client.get(self.url, {"limit": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([x["kind"] for x in response.data["results"]],
+                         [MatchDiff.NEW_ENEMY_SUGGESTION, MatchDiff.NEW_COMMENTS])
+        self.assertEqual(response.data["results"][1]["data"], [1, 2])
+        self.assertEqual(response.data["results"][0]["match_id"], 10)
+        self.assertTrue(response.data["has_more"])
+
+        response = self.client.get(self.url, {"after": response.data["cursor"]})
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertFalse(response.data["has_more"])
+
+        cursor = response.data["cursor"]
+        response = self.client.get(self.url, {"after": cursor})
+        self.assertEqual(response.data["results"], [])
+        self.assertEqual(response.data["cursor"], cursor)
+
+    def test_events_of_team(self):
+        response = self.client.get(self.url, {"team": 1})
+        self.assertEqual([x["kind"] for x in response.data["results"]],
+                         [MatchDiff.NEW_ENEMY_SUGGESTION, MatchDiff.NEW_COMMENTS, MatchDiff.MATCH_CLOSED])
+
+    def test_unsettled_events_are_hidden(self):
+        with override_settings(MATCH_EVENT_SETTLE_TIME=60):
+            response = self.client.get(self.url)
+            self.assertEqual(response.data["results"], [])
+            self.assertEqual(response.data["cursor"], 0)
+            self.assertEqual(MatchEvent.objects.latest_id(), 0)
+        self.assertEqual(MatchEvent.objects.latest_id(), MatchEvent.objects.order_by("id").last().id)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"after": "abc"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_events_are_append_only(self):
+        event = MatchEvent.objects.first()
+        with self.assertRaises(ValueError):
+            event.save()
+
+    def test_events_read_only(self):
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, 405)
+
+
+@override_settings(MATCH_EVENT_SETTLE_TIME=0)
+class MatchEventStreamTests(TransactionTestCase):
+    def setUp(self) -> None:
+        team = Team.objects.create(id=1, name='TestTeam1', team_tag='TT1')
+        enemy_team = Team.objects.create(id=2, name='TestTeam2', team_tag='TT2')
+        self.match = Match.objects.create(id=1, match_id=10, team=team, enemy_team=enemy_team, has_side_choice=0)
+        self.enemy_match = Match.objects.create(id=2, match_id=10, team=enemy_team, enemy_team=team, has_side_choice=1)
+        MatchEvent.objects.record(self.match, [MatchChange(MatchDiff.NEW_ENEMY_SUGGESTION)])
+        MatchEvent.objects.record(self.enemy_match, [MatchChange(MatchDiff.NEW_TEAM_SUGGESTION)])
+        self.stream = MatchEventStream(MatchEventBroadcaster(poll_interval=0.01), heartbeat_interval=0.05)
+
+    def run_stream(self, query_string, until_events, while_streaming=None, headers=()):
+        """
+        Returns: Sent ASGI messages, the client disconnects after ``until_events`` events
+        """
+        messages = []
+
+        def events():
+            return [x for x in messages if x.get("body", b"").startswith(b"id:")]
+
+        async def receive():
+            if while_streaming is not None:
+                while not self.stream.broadcaster.subscribers:
+                    await asyncio.sleep(0.01)
+                await while_streaming()
+            while len(events()) < until_events:
+                await asyncio.sleep(0.01)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/api/events/stream/", "query_string": query_string,
+                 "headers": list(headers), "client": ("127.0.0.1", 50000)}
+        async_to_sync(asyncio.wait_for)(self.stream(scope, receive, send), timeout=5)
+        return messages, events()
+
+    def test_replay_after_cursor_of_team(self):
+        messages, events = self.run_stream(b"team=1&after=0", until_events=1)
+        self.assertEqual(messages[0]["status"], 200)
+        self.assertIn((b"content-type", b"text/event-stream"), messages[0]["headers"])
+        self.assertEqual(len(events), 1)
+        self.assertIn(b"event: new_enemy_suggestion", events[0]["body"])
+
+    def test_replay_is_paged_until_broadcaster_cursor(self):
+        MatchEvent.objects.record(self.match, [MatchChange(MatchDiff.NEW_COMMENTS), MatchChange(MatchDiff.MATCH_CLOSED)])
+        self.stream.REPLAY_PAGE_SIZE = 1
+        messages, events = self.run_stream(b"team=1&after=0", until_events=3)
+        self.assertEqual([x["body"].split(b"\n")[1] for x in events],
+                         [b"event: new_enemy_suggestion", b"event: new_comments", b"event: match_closed"])
+
+    def test_live_events(self):
+        async def record():
+            await sync_to_async(MatchEvent.objects.record)(self.match, [MatchChange(MatchDiff.MATCH_CLOSED, "2:0")])
+
+        messages, events = self.run_stream(b"team=1", until_events=1, while_streaming=record)
+        self.assertEqual(len(events), 1)
+        self.assertIn(b"event: match_closed", events[0]["body"])
+        self.assertFalse(self.stream.broadcaster.subscribers)
+
+    def test_invalid_team(self):
+        messages, _ = self.run_stream(b"team=abc", until_events=0)
+        self.assertEqual(messages[0]["status"], 400)
+
+    def test_cors_headers_of_allowed_origins(self):
+        messages, _ = self.run_stream(b"after=0", until_events=1, headers=[(b"origin", b"http://localhost:3000")])
+        self.assertIn((b"access-control-allow-origin", b"http://localhost:3000"), messages[0]["headers"])
+        messages, _ = self.run_stream(b"after=0", until_events=1, headers=[(b"origin", b"https://example.com")])
+        self.assertNotIn(b"access-control-allow-origin", dict(messages[0]["headers"]))
+
+    def test_connection_limits(self):
+        self.stream.connections["10.0.0.1"] = self.stream.max_connections_per_client
+        messages, _ = self.run_stream(b"", until_events=0, headers=[(b"x-forwarded-for", b"10.0.0.1")])
+        self.assertEqual(messages[0]["status"], 429)
+        messages, _ = self.run_stream(b"after=0", until_events=1)
+        self.assertEqual(messages[0]["status"], 200)
+        self.assertEqual(self.stream.connections, {"10.0.0.1": self.stream.max_connections_per_client})
+
+        self.stream.max_connections = self.stream.max_connections_per_client
+        messages, _ = self.run_stream(b"", until_events=0)
+        self.assertEqual(messages[0]["status"], 503)
+
+
+class RendererTests(APITestCase):
+    def test_same_output_as_json_renderer(self):
+        data = {
+            "id": 2 ** 40,
+            "name": "Team \u00e4\u2028",
+            "begin": datetime(2022, 10, 3, 18, 30, 15, 123456),
+            "decimal": Decimal("1.50"),
+            "lazy": gettext_lazy("Team"),
+            "nested": [{"a": None, "b": 1.5, "c": True}],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_large_integer_fallback(self):
+        data = {"id": 2 ** 70}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+class CompressionTests(APITestCase):
+    def setUp(self) -> None:
+        for i in range(1, 11):
+            Team.objects.create(id=i, name=f'TestTeam{i}', team_tag=f'TT{i}')
+
+    def test_gzip_json(self):
+        response = self.client.get(reverse('team-list'), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))["results"]), 10)
+
+    def test_not_accepted(self):
+        response = self.client.get(reverse('team-list'))
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(len(response.json()["results"]), 10)
+
+    def test_html_not_compressed(self):
+        response = self.client.get(reverse('team-list'), HTTP_ACCEPT="text/html", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_compressed_etag_is_weak(self):
+        Player.objects.bulk_create(Player(id=i, name=f"Player {i}", team_id=1) for i in range(1, 11))
+        url = reverse('team-detail', args=(1,))
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+
+@mock.patch("app_api.modules.status.collector.cache", LocMemCache("status", {}))
+@mock.patch.object(StatusCollector, "_get_prime_league_status", lambda: True)
+@mock.patch.object(StatusCollector, "_get_service_status", lambda service: None)
+@mock.patch("app_api.modules.status.views.GitHub.latest_version", lambda: {"version": None, "released_at": None})
+class StatusTests(APITestCase):
+    def setUp(self) -> None:
+        Team.objects.create(id=1, name='TestTeam1', team_tag='TT1')
+
+    def test_cold_cache_collects_synchronously(self):
+        response = self.client.get("/api/status/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total_teams"], 1)
+        self.assertTrue(response.data["prime_league_status"])
+
+    def test_fresh_snapshot_is_served_from_cache(self):
+        StatusCollector.refresh()
+        Team.objects.create(id=2, name='TestTeam2', team_tag='TT2')
+        with self.assertNumQueries(0), mock.patch.object(StatusCollector, "revalidate") as revalidate:
+            response = self.client.get("/api/status/")
+        self.assertEqual(response.data["total_teams"], 1)
+        revalidate.assert_not_called()
+
+    @override_settings(STATUS_REFRESH_INTERVAL=0)
+    def test_stale_snapshot_is_revalidated(self):
+        StatusCollector.refresh()
+        Team.objects.create(id=2, name='TestTeam2', team_tag='TT2')
+        with mock.patch.object(StatusCollector, "revalidate") as revalidate:
+            response = self.client.get("/api/status/")
+        self.assertEqual(response.data["total_teams"], 1)
+        revalidate.assert_called_once()
+        self.assertEqual(StatusCollector.refresh()["total_teams"], 2)
+
+    def test_update_runs(self):
+        started_at = timezone.now() - timedelta(minutes=10)
+        for minutes in (60, 30):
+            UpdateRun.objects.create(command=UpdateRun.Commands.UPDATE_MATCHES, started_at=started_at, checked=100,
+                                     finished_at=started_at + timedelta(seconds=minutes), latency_p95=0.5)
+            started_at += timedelta(minutes=5)
+        UpdateRun.objects.create(command=UpdateRun.Commands.UPDATE_MATCHES, started_at=timezone.now())
+        StatusCollector.refresh()
+        response = self.client.get("/api/status/")
+        update_runs = response.data["update_runs"]
+        self.assertIsNone(update_runs["update_teams"])
+        self.assertEqual(update_runs["update_matches"]["duration"], 30)
+        self.assertEqual(update_runs["update_matches"]["checked"], 100)
+        self.assertEqual(update_runs["update_matches"]["recent_durations"], [30, 60])
+
+
+@override_settings(METRICS_TOKEN="secret")
+class MetricsTests(APITestCase):
+
+    def test_prometheus_text_format(self):
+        with time_stage("fetch"):
+            pass
+        response = self.client.get("/api/metrics/", HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        content = response.content.decode()
+        self.assertIn("# TYPE primebot_stage_duration_seconds histogram", content)
+        self.assertIn('primebot_stage_duration_seconds_bucket{le="+Inf",stage="fetch"}', content)
+        self.assertIn("primebot_prime_league_circuit_open 0.0", content)
+
+    def test_requires_token(self):
+        self.assertEqual(self.client.get("/api/metrics/").status_code, 403)
+        self.assertEqual(self.client.get("/api/metrics/", HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+        with self.settings(METRICS_TOKEN=None):
+            self.assertEqual(self.client.get("/api/metrics/", HTTP_AUTHORIZATION="Bearer ").status_code, 403)
+
+
 class RouteTest(APITestCase):
     def test_api_root(self):
         url = reverse('api-root')
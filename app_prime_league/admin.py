@@ -2,13 +2,14 @@ from django.contrib import admin
 
 from app_prime_league.admin_sites.champions import ChampionAdmin
 from app_prime_league.admin_sites.comment import CommentAdmin
-from app_prime_league.admin_sites.match import MatchAdmin, SuggestionAdmin
+from app_prime_league.admin_sites.match import MatchAdmin, SuggestionAdmin, MatchEventAdmin
 from app_prime_league.admin_sites.player import PlayerAdmin
 from app_prime_league.admin_sites.scouting_website import ScoutingWebsiteAdmin
 from app_prime_league.admin_sites.team import TeamAdmin
 from app_prime_league.admin_sites.team_settings import SettingsExpiringAdmin, SettingAdmin
+from app_prime_league.admin_sites.update_run import UpdateRunAdmin
 from app_prime_league.models import Player, Match, ScoutingWebsite, Suggestion, Comment, Team, Setting, \
-    SettingsExpiring, Champion
+    SettingsExpiring, Champion, MatchEvent, UpdateRun
 
 admin.site.register(Player, PlayerAdmin)
 admin.site.register(Match, MatchAdmin)
@@ -19,3 +20,5 @@ admin.site.register(Team, TeamAdmin)
 admin.site.register(Setting, SettingAdmin)
 admin.site.register(SettingsExpiring, SettingsExpiringAdmin)
 admin.site.register(Champion, ChampionAdmin)
+admin.site.register(MatchEvent, MatchEventAdmin)
+admin.site.register(UpdateRun, UpdateRunAdmin)
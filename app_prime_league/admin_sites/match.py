@@ -23,3 +23,16 @@ class MatchAdmin(admin.ModelAdmin):
 
 class SuggestionAdmin(admin.ModelAdmin):
     list_display = ['id', 'begin', 'match', 'created_at']
+
+
+class MatchEventAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'match', 'team', 'created_at']
+    list_filter = ['kind', 'created_at']
+    readonly_fields = ('match', 'team', 'kind', 'data', 'created_at',)
+    search_fields = ['match__match_id', 'team__id', 'team__name']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
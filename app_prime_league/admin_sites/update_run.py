@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+
+class UpdateRunAdmin(admin.ModelAdmin):
+    list_display = ['id', 'command', 'started_at', 'duration', 'checked', 'skipped', 'queries', 'latency_p50',
+                    'latency_p95']
+    list_filter = ['command', 'started_at']
+    readonly_fields = ('command', 'started_at', 'finished_at', 'duration', 'checked', 'skipped', 'fetch_failures',
+                       'notifications', 'queries', 'latency_p50', 'latency_p95',)
+    date_hierarchy = 'started_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="Dauer (s)")
+    def duration(self, obj):
+        return None if obj.duration is None else round(obj.duration, 2)
@@ -0,0 +1,94 @@
+import json
+import zlib
+from typing import Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from app_prime_league.models import Match, Player
+
+MATCH_FIELDS = (
+    "id", "match_id", "match_day", "match_type", "team_id", "enemy_team_id", "team_made_latest_suggestion",
+    "match_begin_confirmed", "has_side_choice", "begin", "closed", "result", "created_at", "updated_at",
+)
+PLAYER_FIELDS = ("id", "name", "team_id", "summoner_name", "is_leader", "created_at", "updated_at")
+
+EXPORT_MATCHES = "matches"
+EXPORT_PLAYERS = "players"
+EXPORT_TYPES = (EXPORT_MATCHES, EXPORT_PLAYERS)
+
+
+def _iter_chunks(qs, fields, chunk_size) -> Iterator[list]:
+    """
+    Keyset pagination on the primary key, every chunk is one range query of at most ``chunk_size`` rows.
+    """
+    last_id = 0
+    while True:
+        chunk = list(qs.filter(id__gt=last_id).order_by("id").values(*fields)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]["id"]
+
+
+def _lineups(through, match_ids) -> dict:
+    lineups = {}
+    for match_id, player_id in through.objects.filter(match_id__in=match_ids).values_list("match_id", "player_id"):
+        lineups.setdefault(match_id, []).append(player_id)
+    return lineups
+
+
+def iter_matches(chunk_size=1000) -> Iterator[dict]:
+    """
+    Yields all matches including the player ids of both lineups. Three queries per chunk.
+    """
+    for chunk in _iter_chunks(Match.objects.all(), MATCH_FIELDS, chunk_size):
+        match_ids = [x["id"] for x in chunk]
+        team_lineups = _lineups(Match.team_lineup.through, match_ids)
+        enemy_lineups = _lineups(Match.enemy_lineup.through, match_ids)
+        for match in chunk:
+            match["team_lineup"] = team_lineups.get(match["id"], [])
+            match["enemy_lineup"] = enemy_lineups.get(match["id"], [])
+            yield match
+
+
+def iter_players(chunk_size=1000) -> Iterator[dict]:
+    for chunk in _iter_chunks(Player.objects.all(), PLAYER_FIELDS, chunk_size):
+        yield from chunk
+
+
+def iter_records(types=EXPORT_TYPES, chunk_size=1000) -> Iterator[dict]:
+    """
+    Yields the records of the given export types, every record is tagged with its ``type``.
+    """
+    sources = {
+        EXPORT_MATCHES: iter_matches,
+        EXPORT_PLAYERS: iter_players,
+    }
+    for export_type in types:
+        for record in sources[export_type](chunk_size=chunk_size):
+            yield {"type": export_type, **record}
+
+
+def iter_ndjson(records: Iterable[dict], lines_per_chunk=100) -> Iterator[bytes]:
+    """
+    Serializes records as newline delimited json. Lines are joined to chunks to reduce the number of writes.
+    """
+    lines = []
+    for record in records:
+        lines.append(json.dumps(record, cls=DjangoJSONEncoder))
+        if len(lines) >= lines_per_chunk:
+            yield ("\n".join(lines) + "\n").encode("utf8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf8")
+
+
+def iter_gzip(chunks: Iterable[bytes], level=6) -> Iterator[bytes]:
+    """
+    Compresses a byte stream on the fly as a single gzip member.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        if data := compressor.compress(chunk):
+            yield data
+    yield compressor.flush()
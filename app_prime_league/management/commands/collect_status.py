@@ -0,0 +1,30 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from app_api.modules.status.collector import StatusCollector
+
+logger = logging.getLogger("django")
+
+
+class Command(BaseCommand):
+    help = "Refreshes the status snapshot of the StatusView."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Keep refreshing every STATUS_REFRESH_INTERVAL seconds instead of refreshing once.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            start_time = time.time()
+            try:
+                StatusCollector.refresh()
+            except Exception as e:
+                logger.exception(e)
+            if not options["loop"]:
+                return
+            time.sleep(max(settings.STATUS_REFRESH_INTERVAL - (time.time() - start_time), 0))
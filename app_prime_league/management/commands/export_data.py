@@ -0,0 +1,32 @@
+import sys
+
+from django.core.management import BaseCommand
+
+from app_prime_league.export import EXPORT_TYPES, iter_gzip, iter_ndjson, iter_records
+
+
+class Command(BaseCommand):
+    help = "Exports matches (including lineups) and players as newline delimited json with constant memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--type", action="append", choices=EXPORT_TYPES, dest="types",
+                            help="Export only the given type, can be repeated. Default: all types")
+        parser.add_argument("--output", default="-", help="Output file, default: stdout")
+        parser.add_argument("--gzip", action="store_true", help="Compress the output with gzip")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per query")
+
+    def handle(self, *args, **options):
+        chunks = iter_ndjson(iter_records(types=options["types"] or EXPORT_TYPES, chunk_size=options["chunk_size"]))
+        if options["gzip"]:
+            chunks = iter_gzip(chunks)
+        if options["output"] == "-":
+            self._write(chunks, sys.stdout.buffer)
+        else:
+            with open(options["output"], "wb") as f:
+                self._write(chunks, f)
+
+    @staticmethod
+    def _write(chunks, f):
+        for chunk in chunks:
+            f.write(chunk)
+        f.flush()
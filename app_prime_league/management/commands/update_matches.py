@@ -3,19 +3,47 @@ import threading
 import time
 from datetime import datetime
 
+from django.conf import settings
 from django.core.management import BaseCommand
 
-from app_prime_league.models import Match
+from app_prime_league.models import Match, UpdateRun
+from core.api import PrimeLeagueAPI
+from core.updater.match_queue import MatchUpdateQueue
 from core.updater.matches_check_executor import update_uncompleted_matches
+from core.updater.run_stats import update_run
+from utils.messages_logger import update_errors
+from utils.metrics import export_command_metrics
 
 thread_local = threading.local()
 logger = logging.getLogger("updates")
 
 
 class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--time-budget", type=int, default=settings.MATCH_UPDATE_TIME_BUDGET,
+            help="Seconds after which no further matches are started. Skipped matches are checked first next run.",
+        )
+
     def handle(self, *args, **options):
         start_time = time.time()
-        uncompleted_matches = Match.objects.get_matches_to_update()
-        logger.info(f"Checking {len(uncompleted_matches)} uncompleted matches...")
-        update_uncompleted_matches(matches=uncompleted_matches)
-        logger.info(f"Checked {len(uncompleted_matches)} uncompleted matches in {time.time() - start_time:.2f} seconds")
+        PrimeLeagueAPI.publish_state()
+        update_run.start(UpdateRun.Commands.UPDATE_MATCHES)
+        uncompleted_matches = MatchUpdateQueue(Match.objects.get_matches_to_update())
+        total = len(uncompleted_matches)
+        logger.info(f"Checking {total} uncompleted matches ({len(uncompleted_matches.carried_over)} carried over)...")
+        missed = update_uncompleted_matches(matches=uncompleted_matches, time_budget=options["time_budget"])
+        MatchUpdateQueue.save_carry_over(missed)
+        if missed:
+            logger.warning(f"Time budget of {options['time_budget']}s exceeded, carrying over {len(missed)} matches")
+        logger.info(f"Checked {total - len(missed)} uncompleted matches in {time.time() - start_time:.2f} seconds")
+        circuit = PrimeLeagueAPI.circuit_breaker.snapshot()
+        if circuit["rejected_calls"]:
+            logger.warning(f"Prime League circuit is {circuit['state']}, {circuit['rejected_calls']} calls failed fast")
+        concurrency = PrimeLeagueAPI.concurrency_limiter.snapshot()
+        logger.info(f"Prime League concurrency limit {concurrency['limit']}, latency {concurrency['latency_ms']}ms")
+        update_errors.report(title="update_matches")
+        run = update_run.finish()
+        logger.info(f"Run {run.id}: {run.checked} checked, {run.skipped} skipped, {run.queries} queries, "
+                    f"p50 {run.latency_p50 or 0:.2f}s, p95 {run.latency_p95 or 0:.2f}s")
+        export_command_metrics("update_matches", duration=time.time() - start_time)
@@ -5,8 +5,12 @@ from datetime import datetime
 
 from django.core.management import BaseCommand
 
-from app_prime_league.models import Team
+from app_prime_league.models import Team, UpdateRun
+from core.api import PrimeLeagueAPI
+from core.updater.run_stats import update_run
 from core.updater.teams_check_executor import update_teams
+from utils.messages_logger import update_errors
+from utils.metrics import export_command_metrics
 
 thread_local = threading.local()
 logger = logging.getLogger("updates")
@@ -15,7 +19,19 @@ logger = logging.getLogger("updates")
 class Command(BaseCommand):
     def handle(self, *args, **options):
         start_time = time.time()
+        PrimeLeagueAPI.publish_state()
+        update_run.start(UpdateRun.Commands.UPDATE_TEAMS)
         teams = Team.objects.all()
         logger.info(f"Updating {len(teams)} teams...")
         update_teams(teams=teams, )
         logger.info(f"Updated {len(teams)} teams in {time.time() - start_time:.2f} seconds")
+        circuit = PrimeLeagueAPI.circuit_breaker.snapshot()
+        if circuit["rejected_calls"]:
+            logger.warning(f"Prime League circuit is {circuit['state']}, {circuit['rejected_calls']} calls failed fast")
+        concurrency = PrimeLeagueAPI.concurrency_limiter.snapshot()
+        logger.info(f"Prime League concurrency limit {concurrency['limit']}, latency {concurrency['latency_ms']}ms")
+        update_errors.report(title="update_teams")
+        run = update_run.finish()
+        logger.info(f"Run {run.id}: {run.checked} checked, {run.skipped} skipped, {run.queries} queries, "
+                    f"p50 {run.latency_p50 or 0:.2f}s, p95 {run.latency_p95 or 0:.2f}s")
+        export_command_metrics("update_teams", duration=time.time() - start_time)
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.15 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_prime_league', '0041_auto_20220803_2159'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='snapshot',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
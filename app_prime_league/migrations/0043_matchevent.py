@@ -0,0 +1,34 @@
+# Generated by Django 3.2.15 on 2026-10-19 10:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_prime_league', '0042_match_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('new_enemy_team', 'Neues gegnerisches Team'), ('new_enemy_suggestion', 'Terminvorschlag der Gegner'), ('new_team_suggestion', 'Eigener Terminvorschlag'), ('scheduling_confirmed', 'Termin festgelegt'), ('new_enemy_lineup', 'Lineup der Gegner'), ('new_team_lineup', 'Eigenes Lineup'), ('new_comments', 'Neue Kommentare'), ('match_closed', 'Ergebnis')], max_length=30)),
+                ('data', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='app_prime_league.match')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_events', to='app_prime_league.team')),
+            ],
+            options={
+                'verbose_name': 'Matchevent',
+                'verbose_name_plural': 'Matchevents',
+                'db_table': 'match_events',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='matchevent',
+            index=models.Index(fields=['team', 'id'], name='match_events_team_id_cursor'),
+        ),
+    ]
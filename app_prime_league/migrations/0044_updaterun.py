@@ -0,0 +1,38 @@
+# Generated by Django 3.2.15 on 2026-10-19 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_prime_league', '0043_matchevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UpdateRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('command', models.CharField(choices=[('update_matches', 'Matches'), ('update_teams', 'Teams')], max_length=30)),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('checked', models.PositiveIntegerField(default=0)),
+                ('skipped', models.PositiveIntegerField(default=0)),
+                ('fetch_failures', models.JSONField(blank=True, default=dict)),
+                ('notifications', models.JSONField(blank=True, default=dict)),
+                ('queries', models.PositiveIntegerField(default=0)),
+                ('latency_p50', models.FloatField(blank=True, null=True)),
+                ('latency_p95', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Update-Lauf',
+                'verbose_name_plural': 'Update-Läufe',
+                'db_table': 'update_runs',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='updaterun',
+            index=models.Index(fields=['command', 'started_at'], name='update_runs_command_started'),
+        ),
+    ]
@@ -2,13 +2,22 @@ import logging
 from datetime import timedelta
 from typing import List
 
+from django.conf import settings
 from django.db import models, IntegrityError
-from django.db.models import Q
+from django.db.models import Q, OuterRef, Subquery, Count, Max, F
 from django.utils import timezone
 
 update_logger = logging.getLogger("updates")
 
 
+def _related_max(qs, group_by, field="updated_at"):
+    return Subquery(qs.order_by().values(group_by).annotate(x=Max(field)).values("x")[:1])
+
+
+def _related_count(qs, group_by):
+    return Subquery(qs.order_by().values(group_by).annotate(x=Count("pk")).values("x")[:1])
+
+
 class TeamManager(models.Manager):
 
     def get_registered_teams(self):
@@ -30,19 +39,76 @@ class TeamManager(models.Manager):
     def get_team(self, team_id):
         return self.model.objects.filter(id=team_id).first()
 
+    def with_matches_count(self):
+        """
+        Annotiert die Anzahl der Matches jedes Teams als `matches_count`.
+        :return: Queryset of Team Model
+        """
+        return self.model.objects.annotate(matches_count=Count("matches_against"))
+
+    def get_matches_counts(self, team_ids) -> dict:
+        """
+        Zählt die Matches der gegebenen Teams in einer Query.
+        :return: Dict team_id -> matches_count
+        """
+        return dict(self.with_matches_count().filter(id__in=set(team_ids)).values_list("id", "matches_count"))
+
+    def get_detail_watermark(self, team_id):
+        """
+        Änderungsstand der Team-Detailansicht (Team, Spieler, Matches und Gegner) in einer Query.
+        :return: Dict or None if the team does not exist
+        """
+        from app_prime_league.models import Match, Player
+        players = Player.objects.filter(team=OuterRef("pk"))
+        matches = Match.objects.filter(team=OuterRef("pk"))
+        return self.model.objects.filter(id=team_id).values("updated_at").annotate(
+            players_updated_at=_related_max(players, "team"),
+            players_count=_related_count(players, "team"),
+            matches_updated_at=_related_max(matches, "team"),
+            matches_count=_related_count(matches, "team"),
+            enemy_teams_updated_at=_related_max(matches, "team", field="enemy_team__updated_at"),
+        ).first()
+
 
 class MatchManager(models.Manager):
 
+    def get_detail_watermark(self, match_id):
+        """
+        Änderungsstand der Match-Detailansicht (Match, Teams, Lineups und Matchanzahl der Teams) in einer Query.
+        :return: Dict or None if the match does not exist
+        """
+        team_lineup = self.model.team_lineup.through.objects.filter(match=OuterRef("pk"))
+        enemy_lineup = self.model.enemy_lineup.through.objects.filter(match=OuterRef("pk"))
+        return self.model.objects.filter(id=match_id).values("updated_at").annotate(
+            team_updated_at=F("team__updated_at"),
+            enemy_team_updated_at=F("enemy_team__updated_at"),
+            team_lineup_updated_at=_related_max(team_lineup, "match", field="player__updated_at"),
+            team_lineup_count=_related_count(team_lineup, "match"),
+            enemy_lineup_updated_at=_related_max(enemy_lineup, "match", field="player__updated_at"),
+            enemy_lineup_count=_related_count(enemy_lineup, "match"),
+            team_matches_count=_related_count(self.model.objects.filter(team=OuterRef("team")), "team"),
+            enemy_team_matches_count=_related_count(self.model.objects.filter(team=OuterRef("enemy_team")), "team"),
+        ).first()
+
     def get_matches_to_update(self):
         """
         Gibt alle Matches zurück die nicht `closed` oder `NULL` sind oder deren Spielbeginn weniger als 2 Tage her ist.
+        Annotiert den Zeitpunkt des letzten Terminvorschlags und des letzten Kommentars für die Priorisierung.
+        Die Spieler des Teams werden für den Vergleich der Kommentare vorgeladen.
         Returns: queryset
 
         """
+        from app_prime_league.models import Suggestion, Comment
+        latest_suggestion = Suggestion.objects.filter(match=OuterRef("pk")).order_by("-created_at")
+        latest_comment = Comment.objects.filter(match=OuterRef("pk")).order_by("-created_at")
         qs = self.model.objects.filter(
             Q(closed=False) |
             Q(closed__isnull=True) |
-            Q(closed=True, begin__gte=timezone.now() - timedelta(days=2)))
+            Q(closed=True, begin__gte=timezone.now() - timedelta(days=2))
+        ).select_related("team").prefetch_related("team__player_set").annotate(
+            latest_suggestion_at=Subquery(latest_suggestion.values("created_at")[:1]),
+            latest_comment_at=Subquery(latest_comment.values("created_at")[:1]),
+        )
         return qs
 
 
@@ -101,6 +167,64 @@ class CommentManager(models.Manager):
     pass
 
 
+class MatchEventManager(models.Manager):
+
+    def record(self, match: "Match", changes) -> List["MatchEvent"]:
+        """
+        Appends one event per detected change of the match.
+        Args:
+            match: Match
+            changes: Iterable of ``core.comparers.match_diff.MatchChange``
+        """
+        events = [
+            self.model(match=match, team_id=match.team_id, kind=change.kind, data=change.data) for change in changes
+        ]
+        return self.model.objects.bulk_create(events)
+
+    def settled(self):
+        """
+        Events older than ``MATCH_EVENT_SETTLE_TIME``. Ids are assigned on insert, but concurrent transactions commit
+        in any order, so a cursor at the newest id could skip an event with a lower id which is committed later.
+        Returns: queryset
+        """
+        return self.model.objects.filter(
+            created_at__lt=timezone.now() - timedelta(seconds=settings.MATCH_EVENT_SETTLE_TIME)
+        )
+
+    def after(self, cursor: int = 0, team_id=None, match_id=None):
+        """
+        Gibt alle Events nach dem Cursor aufsteigend sortiert zurück, ohne die noch nicht ``settled`` Events.
+        Returns: queryset
+        """
+        qs = self.settled().filter(id__gt=cursor)
+        if team_id is not None:
+            qs = qs.filter(team_id=team_id)
+        if match_id is not None:
+            qs = qs.filter(match_id=match_id)
+        return qs.select_related("match").order_by("id")
+
+    def latest_id(self) -> int:
+        """
+        Returns: Id of the newest settled event or 0, the cursor of clients which only want new events
+        """
+        return self.settled().order_by("-id").values_list("id", flat=True).first() or 0
+
+
+class UpdateRunManager(models.Manager):
+
+    def recent_finished(self, command, limit=20):
+        """
+        Returns: The finished runs of the command, newest first
+        """
+        return self.model.objects.filter(command=command, finished_at__isnull=False).order_by("-started_at")[:limit]
+
+    def prune(self, days):
+        """
+        Deletes runs which started more than ``days`` ago.
+        """
+        return self.model.objects.filter(started_at__lt=timezone.now() - timedelta(days=days)).delete()
+
+
 class ChampionManager(models.Manager):
     def get_banned_champions(self, until=None):
         """
@@ -1,11 +1,14 @@
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.template.defaultfilters import urlencode, truncatechars
 from django.utils.translation import gettext_lazy as _
 
 from app_prime_league.model_manager import TeamManager, MatchManager, PlayerManager, ScoutingWebsiteManager, \
-    ChampionManager
+    ChampionManager, MatchEventManager, UpdateRunManager
 from utils.utils import current_match_day
 
 
@@ -177,6 +180,7 @@ class Match(models.Model):
     team_lineup = models.ManyToManyField(Player, related_name="matches")
     closed = models.BooleanField(null=True)
     result = models.CharField(max_length=5, null=True)
+    snapshot = models.JSONField(null=True, blank=True)  # Last accepted payload, see core.comparers.match_diff
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -200,7 +204,12 @@ class Match(models.Model):
         self.enemy_team = Team.objects.get_team(team_id=gmd.enemy_team_id)
         self.save(update_fields=["enemy_team"])
 
-    def update_match_data(self, tmd):
+    def update_match_data(self, tmd, snapshot=None):
+        """
+        Args:
+            tmd: TemporaryMatchData
+            snapshot: Accepted snapshot of the payload. If None, the snapshot is rebuilt on the next check.
+        """
         self.match_id = tmd.match_id
         self.match_day = tmd.match_day
         self.match_type = tmd.match_type
@@ -210,6 +219,7 @@ class Match(models.Model):
         self.closed = tmd.closed
         self.result = tmd.result
         self.has_side_choice = tmd.has_side_choice
+        self.snapshot = snapshot
         self.save()
 
     def update_match_begin(self, gmd):
@@ -368,6 +378,90 @@ class Comment(models.Model):
         return f"{self.id = }, {self.match = }, {self.comment_id = }"
 
 
+class MatchEvent(models.Model):
+    """
+    Log of the changes detected by the match update. Clients sync incrementally by the event id.
+    Events are never modified, but deleted together with their match or team, e.g. if a match no longer exists.
+    """
+    class Kinds(models.TextChoices):
+        NEW_ENEMY_TEAM = "new_enemy_team", "Neues gegnerisches Team"
+        NEW_ENEMY_SUGGESTION = "new_enemy_suggestion", "Terminvorschlag der Gegner"
+        NEW_TEAM_SUGGESTION = "new_team_suggestion", "Eigener Terminvorschlag"
+        SCHEDULING_CONFIRMED = "scheduling_confirmed", "Termin festgelegt"
+        NEW_ENEMY_LINEUP = "new_enemy_lineup", "Lineup der Gegner"
+        NEW_TEAM_LINEUP = "new_team_lineup", "Eigenes Lineup"
+        NEW_COMMENTS = "new_comments", "Neue Kommentare"
+        MATCH_CLOSED = "match_closed", "Ergebnis"
+
+    match = models.ForeignKey(Match, on_delete=models.CASCADE, related_name="events")
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="match_events")
+    kind = models.CharField(max_length=30, choices=Kinds.choices)
+    data = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = MatchEventManager()
+
+    class Meta:
+        db_table = "match_events"
+        verbose_name = "Matchevent"
+        verbose_name_plural = "Matchevents"
+        indexes = [
+            models.Index(fields=["team", "id"], name="match_events_team_id_cursor"),
+        ]
+
+    def __str__(self):
+        return f"{self.id}: {self.kind} ({self.match_id})"
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Match events are append-only.")
+        super().save(*args, **kwargs)
+
+
+class UpdateRun(models.Model):
+    """
+    Statistics of one run of ``update_matches`` or ``update_teams``. The run is created when it starts, runs without
+    ``finished_at`` were aborted or are still running. ``checked`` and ``skipped`` count matches or teams, items
+    whose fetch failed are only counted in ``fetch_failures``.
+    """
+    class Commands(models.TextChoices):
+        UPDATE_MATCHES = "update_matches", "Matches"
+        UPDATE_TEAMS = "update_teams", "Teams"
+
+    command = models.CharField(max_length=30, choices=Commands.choices)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    checked = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    fetch_failures = models.JSONField(default=dict, blank=True)  # exception name -> count
+    notifications = models.JSONField(default=dict, blank=True)  # message class -> count
+    queries = models.PositiveIntegerField(default=0)
+    latency_p50 = models.FloatField(null=True, blank=True)  # seconds per checked match or team
+    latency_p95 = models.FloatField(null=True, blank=True)
+
+    objects = UpdateRunManager()
+
+    class Meta:
+        db_table = "update_runs"
+        verbose_name = "Update-Lauf"
+        verbose_name_plural = "Update-Läufe"
+        indexes = [
+            models.Index(fields=["command", "started_at"], name="update_runs_command_started"),
+        ]
+
+    def __str__(self):
+        return f"{self.command} {self.started_at}"
+
+    @property
+    def duration(self):
+        """
+        Returns: Seconds of the finished run or None
+        """
+        if self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
+
+
 class Champion(models.Model):
     name = models.CharField(max_length=100, unique=True)
     banned = models.BooleanField()
@@ -382,3 +476,18 @@ class Champion(models.Model):
         db_table = "champions"
         verbose_name = "Champion"
         verbose_name_plural = "Champions"
+
+
+TEAMS_VERSION_CACHE_KEY = "teams_version"
+
+
+@receiver([post_save, post_delete], sender=Team, dispatch_uid="bump_teams_version")
+def bump_teams_version(sender, **kwargs):
+    """
+    Changes the shared version of the teams on every save or delete in any process, so in-process caches of teams
+    (e.g. the Discord ``ChannelTeamRegistry``) know when to reload.
+    """
+    try:
+        cache.incr(TEAMS_VERSION_CACHE_KEY)
+    except ValueError:  # the key does not exist yet
+        cache.set(TEAMS_VERSION_CACHE_KEY, 1, None)
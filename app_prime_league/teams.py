@@ -1,36 +1,106 @@
 import concurrent.futures
+import functools
 import logging
 import sys
 import traceback
+from typing import Dict, List
 
 from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
 
-from app_prime_league.models import Team, Player, Match, Suggestion
+from app_prime_league.models import Comment, Team, Player, Match, Suggestion
 from bots.telegram_interface.tg_singleton import send_message_to_devs
+from core.comparers.match_diff import snapshot_from_temporary_match_data
+from core.processors.match_processor import MatchDataProcessor
 from core.processors.team_processor import TeamDataProcessor
 from core.temporary_match_data import TemporaryMatchData
 from utils.messages_logger import log_exception
 
+_backfill_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=settings.REGISTRATION_BACKFILL_WORKERS, thread_name_prefix="match_backfill",
+)
+_running_backfills: Dict[int, concurrent.futures.Future] = {}
 
-def register_team(*, team_id, **kwargs):
+
+def register_team(*, team_id, background=not settings.DEBUG, post_overview=True, **kwargs):
     """
     This Function should be used in Bot commands!
-    Add or Update a Team, Add or Update Matches.
+    Add or Update a Team. The matches are created by ``backfill_matches`` afterwards, which posts the
+    ``MatchesOverview`` to the team when it finishes. Only the team website is requested before this function returns.
     **kwargs will be directly parsed to the Team model. Usually telegram ID or discord IDs
+    :param background: Run the backfill in the background instead of before returning
+    :param post_overview: Post the ``MatchesOverview`` after the backfill. The Telegram registration is a conversation,
+        which sends the overview itself with ``after_backfill`` when it ends.
     :raises PrimeLeagueConnectionException, TeamWebsite404Exception
     """
     team, provider = create_or_update_team(team_id=team_id, **kwargs)
     if team is None:
         return None
-    try:
-        create_matches(provider.get_matches(), team)
+    match_ids = provider.get_matches()
+    if background:
+        future = _backfill_executor.submit(_backfill_matches_in_thread, team, match_ids, post_overview)
+        _running_backfills[team.id] = future
+        future.add_done_callback(functools.partial(_forget_backfill, team.id))
+    else:
+        backfill_matches(team, match_ids, post_overview=post_overview)
+    return team
 
+
+def backfill_matches(team: Team, match_ids, post_overview=True):
+    """
+    Second stage of the registration: Creates the matches and enemy teams concurrently and posts the
+    ``MatchesOverview`` to the team if ``post_overview`` is set.
+    """
+    from bots.message_dispatcher import MessageDispatcher
+    from bots.messages import MatchesOverview
+
+    try:
+        create_matches(match_ids, team)
+        if post_overview:
+            team.refresh_from_db()
+            dispatcher = MessageDispatcher(team)
+            dispatcher.dispatch_raw_message(MatchesOverview(team=team))
     except Exception as e:
         trace = "".join(traceback.format_tb(sys.exc_info()[2]))
         send_message_to_devs(
             f"Ein Fehler ist beim Registrieren von Team {team.id} {team.name} aufgetreten:\n<code>{trace}\n{e}</code>")
         logging.getLogger("commands").exception(e)
-    return team
+
+
+def after_backfill(team_id, fn):
+    """
+    Calls ``fn`` when the background backfill of the team has finished, right away if none is running.
+    """
+    future = _running_backfills.get(team_id)
+    if future is None:
+        fn()
+        return
+
+    def callback(_):
+        # Runs in the backfill thread after its connection was closed
+        close_old_connections()
+        try:
+            fn()
+        except Exception as e:
+            logging.getLogger("commands").exception(e)
+        finally:
+            connection.close()
+
+    future.add_done_callback(callback)
+
+
+def _forget_backfill(team_id, future):
+    if _running_backfills.get(team_id) is future:
+        del _running_backfills[team_id]
+
+
+def _backfill_matches_in_thread(team: Team, match_ids, post_overview):
+    close_old_connections()
+    try:
+        backfill_matches(team, match_ids, post_overview=post_overview)
+    finally:
+        connection.close()
 
 
 def create_or_update_team(*, team_id, **kwargs):
@@ -58,87 +128,209 @@ def create_or_update_team(*, team_id, **kwargs):
 
 
 @log_exception
-def create_match_and_enemy_team(team, match_id, ):
+def fetch_match_and_enemy_team(team, match_id) -> TemporaryMatchData:
     """
-    Create Match, Enemy Team, Enemy Players, Enemy Lineup, Suggestions
-    Args:
-        team:
-        match_id:
-
-    Returns:
-
+    Requests a match and its enemy team. Does not query the database.
+    Returns: ``TemporaryMatchData`` including ``enemy_team`` and ``enemy_team_members``, None on errors
     """
-    # Create Match
-    tmd = TemporaryMatchData.create_from_website(team=team, match_id=match_id, )
-    match, created = Match.objects.update_or_create(match_id=match_id, team=team, defaults={
-        "match_id": tmd.match_id,
-        "match_day": tmd.match_day,
-        "match_type": tmd.match_type,
-        "team": tmd.team,
-        "begin": tmd.begin,
-        "team_made_latest_suggestion": tmd.team_made_latest_suggestion,
-        "match_begin_confirmed": tmd.match_begin_confirmed,
-        "closed": tmd.closed,
-        "result": tmd.result,
-        "has_side_choice": tmd.has_side_choice,
-    })
-
-    # Create Team Lineup
-    if tmd.team_lineup is not None:
-        players = Player.objects.create_or_update_players(tmd.team_lineup, team=team)
-        match.team_lineup.add(*players)
-
-    # Create Enemy Team
-    if tmd.enemy_team_id is not None:
-        processor = TeamDataProcessor(team_id=tmd.enemy_team_id) # TODO duplicate code
-        enemy_team, created = Team.objects.update_or_create(id=tmd.enemy_team_id, defaults={
-            "name": processor.get_team_name(),
-            "team_tag": processor.get_team_tag(),
-            "division": processor.get_current_division(),
-        })
-        match.enemy_team = enemy_team
-
-        # Create Enemy Players
-        Player.objects.remove_old_player_relations(processor.get_members(), team)
-        Player.objects.create_or_update_players(processor.get_members(), enemy_team)
-
-    # Create Enemy Lineup
-    # TODO: duplicate code, refactor to use match.update_enemy_lineup(md=tmd)
-    match.update_enemy_lineup(md=tmd)
-    if tmd.enemy_lineup is not None:
-        match.enemy_lineup.clear()
-        players = Player.objects.filter(id__in=[x[0] for x in tmd.enemy_lineup])
-        match.enemy_lineup.add(*players)
-
-    # Create Suggestions
-    # TODO: duplicate code, refactor to use match.update_latest_suggestions(md=tmd)
-    if tmd.latest_suggestions is not None:
-        match.suggestion_set.all().delete()
-        for suggestion in tmd.latest_suggestions:
-            match.suggestion_set.add(Suggestion(match=match, begin=suggestion), bulk=False)
-    match.team_made_latest_suggestion = match.team_made_latest_suggestion
-
-    # Create Comments
-    match.update_comments(tmd)
-
-    match.save()
+    processor = MatchDataProcessor(match_id, team.id)
+    tmd = TemporaryMatchData.create_from_processor(team=team, match_id=match_id, processor=processor)
+    tmd.create_enemy_team_data_from_website()
+    return tmd
 
 
 def create_matches(match_ids, team: Team, use_concurrency=not settings.DEBUG):
     """
-    Used for registering new teams.
+    Used for registering new teams. The matches are requested concurrently and written in one transaction.
     Args:
         match_ids:
         team:
         use_concurrency:
 
-    Returns: None
+    Returns: Dict match_id -> Match
 
     """
     if use_concurrency:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            executor.map(lambda p: create_match_and_enemy_team(*p), ((team, match_id) for match_id in match_ids))
-        return
+        with concurrent.futures.ThreadPoolExecutor(max_workers=settings.PRIME_LEAGUE_CONCURRENCY_MAX) as executor:
+            fetched = list(executor.map(lambda match_id: fetch_match_and_enemy_team(team, match_id), match_ids))
+    else:
+        fetched = [fetch_match_and_enemy_team(team, match_id) for match_id in match_ids]
+    return RegistrationWriter(team).write([x for x in fetched if x is not None])
+
+
+class RegistrationWriter:
+    """
+    Persists the matches of a team including enemy teams, players, lineups, suggestions and comments in one
+    transaction. Every table is written with bulk queries, so the number of queries does not depend on the number of
+    matches.
+    """
+
+    def __init__(self, team: Team):
+        self.team = team
+        self.now = timezone.now()
+
+    def write(self, matches: List[TemporaryMatchData]) -> Dict[int, Match]:
+        """
+        Returns: Dict match_id -> Match
+        """
+        if not matches:
+            return {}
+        with transaction.atomic():
+            enemy_team_ids = self._write_enemy_teams(matches)
+            player_ids = self._write_players(matches, enemy_team_ids)
+            db_matches = self._write_matches(matches, enemy_team_ids)
+            self._write_lineups(matches, db_matches, player_ids)
+            self._write_suggestions(matches, db_matches)
+            self._write_comments(matches, db_matches)
+        return db_matches
+
+    def _upsert(self, model, rows: dict):
+        """
+        Creates missing and updates changed rows of ``model``.
+        Args:
+            rows: Dict pk -> field values
+        Returns: Set of the pks of all rows
+        """
+        if not rows:
+            return set()
+        existing = model.objects.in_bulk(list(rows))
+        to_create, to_update = [], []
+        for pk, values in rows.items():
+            obj = existing.get(pk)
+            if obj is None:
+                to_create.append(model(pk=pk, **values))
+            elif any(getattr(obj, key) != value for key, value in values.items()):
+                for key, value in values.items():
+                    setattr(obj, key, value)
+                obj.updated_at = self.now  # bulk_update does not touch auto_now fields
+                to_update.append(obj)
+        model.objects.bulk_create(to_create)
+        model.objects.bulk_update(to_update, fields=[*next(iter(rows.values())), "updated_at"])
+        return set(rows)
+
+    def _write_enemy_teams(self, matches):
+        """
+        Returns: Ids of all enemy teams that exist
+        """
+        rows = {x.enemy_team_id: x.enemy_team for x in matches if x.enemy_team_id is not None and x.enemy_team}
+        enemy_team_ids = self._upsert(Team, rows)
+        unknown = {x.enemy_team_id for x in matches if x.enemy_team_id is not None} - enemy_team_ids
+        if unknown:
+            enemy_team_ids |= set(Team.objects.filter(id__in=unknown).values_list("id", flat=True))
+        return enemy_team_ids
+
+    def _write_players(self, matches, enemy_team_ids):
+        """
+        Creates or updates all lineup players and enemy team members. Players no longer listed as members of an
+        enemy team lose their team relation.
+        Returns: Ids of all written players
+        """
+        rows = {}
+
+        def add(players, team_id):
+            for (account_id, name, summoner_name, is_leader) in players or []:
+                if name is None or summoner_name is None:
+                    continue
+                rows[account_id] = {
+                    "name": name, "summoner_name": summoner_name, "is_leader": is_leader or False, "team_id": team_id,
+                }
+
+        members = {x.enemy_team_id: x.enemy_team_members for x in matches if x.enemy_team_members is not None}
+        for tmd in matches:
+            add(tmd.team_lineup, self.team.id)
+            enemy_team_id = tmd.enemy_team_id if tmd.enemy_team_id in enemy_team_ids else None
+            add(tmd.enemy_lineup, enemy_team_id)
+        for enemy_team_id, players in members.items():
+            add(players, enemy_team_id)
+
+        if members:
+            Player.objects.filter(team_id__in=list(members)).exclude(
+                id__in=[account_id for players in members.values() for (account_id, *_) in players]
+            ).update(team=None, updated_at=self.now)
+        return self._upsert(Player, rows)
+
+    def _write_matches(self, matches, enemy_team_ids):
+        existing = self._select_matches(matches)
+        to_create, to_update = [], []
+        fields = [
+            "match_day", "match_type", "begin", "team_made_latest_suggestion", "match_begin_confirmed", "closed",
+            "result", "has_side_choice", "snapshot", "enemy_team_id",
+        ]
+        for tmd in matches:
+            match = existing.get(tmd.match_id) or Match(match_id=tmd.match_id, team=self.team)
+            match.match_day = tmd.match_day
+            match.match_type = tmd.match_type
+            match.begin = tmd.begin
+            match.team_made_latest_suggestion = tmd.team_made_latest_suggestion
+            match.match_begin_confirmed = tmd.match_begin_confirmed
+            match.closed = tmd.closed
+            match.result = tmd.result
+            match.has_side_choice = tmd.has_side_choice
+            match.snapshot = snapshot_from_temporary_match_data(tmd)
+            if tmd.enemy_team_id in enemy_team_ids:
+                match.enemy_team_id = tmd.enemy_team_id
+            if match.pk is None:
+                to_create.append(match)
+            else:
+                match.updated_at = self.now
+                to_update.append(match)
+        Match.objects.bulk_update(to_update, fields=[*fields, "updated_at"])
+        if to_create:
+            # bulk_create does not return primary keys on MySQL
+            Match.objects.bulk_create(to_create)
+            existing = self._select_matches(matches)
+        return existing
+
+    def _select_matches(self, matches):
+        qs = Match.objects.filter(team=self.team, match_id__in=[x.match_id for x in matches])
+        return {x.match_id: x for x in qs}
+
+    def _write_lineups(self, matches, db_matches, player_ids):
+        for attr in ("team_lineup", "enemy_lineup"):
+            through = getattr(Match, attr).through
+            lineups = {
+                db_matches[x.match_id].pk: getattr(x, attr) for x in matches if getattr(x, attr) is not None
+            }
+            if not lineups:
+                continue
+            through.objects.filter(match_id__in=list(lineups)).delete()
+            through.objects.bulk_create([
+                through(match_id=match_pk, player_id=account_id)
+                for match_pk, players in lineups.items()
+                for account_id in {account_id for (account_id, *_) in players} if account_id in player_ids
+            ])
+
+    def _write_suggestions(self, matches, db_matches):
+        suggestions = {
+            db_matches[x.match_id].pk: x.latest_suggestions for x in matches if x.latest_suggestions is not None
+        }
+        if not suggestions:
+            return
+        Suggestion.objects.filter(match_id__in=list(suggestions)).delete()
+        Suggestion.objects.bulk_create([
+            Suggestion(match_id=match_pk, begin=begin) for match_pk, begins in suggestions.items() for begin in begins
+        ])
 
-    for i in match_ids:
-        create_match_and_enemy_team(team, match_id=i)
+    def _write_comments(self, matches, db_matches):
+        comments = {
+            (db_matches[x.match_id].pk, comment.comment_id): comment.comment_as_dict()
+            for x in matches for comment in x.comments
+        }
+        if not comments:
+            return
+        existing = {
+            (x.match_id, x.comment_id): x
+            for x in Comment.objects.filter(match_id__in=list({match_pk for match_pk, _ in comments}))
+        }
+        to_create, to_update = [], []
+        for (match_pk, comment_id), values in comments.items():
+            comment = existing.get((match_pk, comment_id))
+            if comment is None:
+                to_create.append(Comment(match_id=match_pk, comment_id=comment_id, **values))
+                continue
+            for key, value in values.items():
+                setattr(comment, key, value)
+            comment.updated_at = self.now
+            to_update.append(comment)
+        Comment.objects.bulk_create(to_create)
+        Comment.objects.bulk_update(to_update, fields=[*next(iter(comments.values())), "updated_at"])
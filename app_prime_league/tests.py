@@ -1,10 +1,21 @@
+import gzip
+import json
+import os
+import tempfile
 from datetime import datetime
 from unittest import mock
 
 import pytz
+from django.core.management import call_command
 from django.test import TestCase
 
-from app_prime_league.models import Team, Match
+from app_prime_league.export import iter_gzip, iter_ndjson, iter_records
+from app_prime_league.models import Comment, Team, Match, Player, Suggestion
+from app_prime_league.teams import RegistrationWriter, register_team
+from bots.messages import MatchesOverview
+from core.processors.team_processor import PlayerRecord
+from core.temporary_match_data import TemporaryMatchData
+from core.test_utils import create_temporary_comment
 
 
 class MatchesTest(TestCase):
@@ -108,3 +119,124 @@ class MatchesTest(TestCase):
         result = list(self.team_a.get_obvious_matches_based_on_stage(0).values_list("match_id", flat=True))
         self.assertListEqual([1000, 2000, 3000], result)
 
+
+class ExportTest(TestCase):
+
+    def setUp(self):
+        team = Team.objects.create(id=1, name="Team A", team_tag="TA")
+        enemy_team = Team.objects.create(id=2, name="Team B", team_tag="TB")
+        players = Player.objects.create_or_update_players([(i, f"Player {i}", f"Summoner {i}", False) for i in
+                                                           range(1, 6)], team)
+        for i in range(1, 6):
+            match = Match.objects.create(match_id=i, team=team, enemy_team=enemy_team, has_side_choice=True)
+            match.team_lineup.add(*players[:i])
+
+    def test_matches_in_chunks(self):
+        with self.assertNumQueries(3 * 3 + 1):
+            records = list(iter_records(types=["matches"], chunk_size=2))
+        self.assertEqual([x["match_id"] for x in records], [1, 2, 3, 4, 5])
+        self.assertEqual(records[2]["team_lineup"], [1, 2, 3])
+        self.assertEqual(records[0]["type"], "matches")
+
+    def test_ndjson_gzip(self):
+        data = gzip.decompress(b"".join(iter_gzip(iter_ndjson(iter_records(chunk_size=2), lines_per_chunk=3))))
+        lines = [json.loads(x) for x in data.decode("utf8").splitlines()]
+        self.assertEqual([x["type"] for x in lines], ["matches"] * 5 + ["players"] * 5)
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "export.ndjson.gz")
+            call_command("export_data", "--type", "players", "--gzip", "--output", path)
+            with gzip.open(path, "rt", encoding="utf8") as f:
+                self.assertEqual([json.loads(x)["id"] for x in f], [1, 2, 3, 4, 5])
+
+
+@mock.patch("app_prime_league.teams.TeamDataProcessor")
+class RegistrationTest(TestCase):
+
+    def setUp(self):
+        self.processor = mock.Mock(**{
+            "get_team_name.return_value": "Team A",
+            "get_team_tag.return_value": "TA",
+            "get_current_division.return_value": "4.1",
+            "get_logo.return_value": None,
+            "get_matches.return_value": [1, 2],
+        })
+
+    @mock.patch("app_prime_league.teams._backfill_executor")
+    def test_matches_are_backfilled_in_background(self, executor, processor_class):
+        processor_class.return_value = self.processor
+        team = register_team(team_id=1, telegram_id=5, background=True)
+        self.assertEqual(team.telegram_id, 5)
+        self.assertEqual(processor_class.call_count, 1)
+        self.assertEqual(executor.submit.call_args.args[1:], (team, [1, 2], True))
+
+    @mock.patch("bots.message_dispatcher.MessageDispatcher.dispatch_raw_message")
+    @mock.patch("app_prime_league.teams.create_matches")
+    def test_backfill_posts_overview(self, create_matches, dispatch_raw_message, processor_class):
+        processor_class.return_value = self.processor
+        team = register_team(team_id=1, telegram_id=5, background=False)
+        create_matches.assert_called_once_with([1, 2], team)
+        self.assertIsInstance(dispatch_raw_message.call_args.args[0], MatchesOverview)
+
+    @mock.patch("bots.message_dispatcher.MessageDispatcher.dispatch_raw_message")
+    @mock.patch("app_prime_league.teams.create_matches")
+    def test_backfill_without_overview(self, create_matches, dispatch_raw_message, processor_class):
+        processor_class.return_value = self.processor
+        team = register_team(team_id=1, telegram_id=5, background=False, post_overview=False)
+        create_matches.assert_called_once_with([1, 2], team)
+        dispatch_raw_message.assert_not_called()
+
+
+class RegistrationWriterTest(TestCase):
+
+    def setUp(self):
+        self.team = Team.objects.create(id=1, name="Team A", team_tag="TA")
+
+    def create_matches(self, count):
+        matches = []
+        for i in range(1, count + 1):
+            enemy_team_id = 100 + i
+            enemy_members = [PlayerRecord(enemy_team_id * 10 + j, f"Enemy {j}", f"Summoner {j}", j == 0)
+                             for j in range(5)]
+            matches.append(TemporaryMatchData(
+                match_id=i, match_day=i, match_type=Match.MATCH_TYPE_LEAGUE, team=self.team, has_side_choice=True,
+                enemy_team_id=enemy_team_id, enemy_team={"name": f"Team {i}", "team_tag": f"T{i}", "division": "4.1"},
+                enemy_team_members=enemy_members, enemy_lineup=enemy_members[:3],
+                team_lineup=[PlayerRecord(j, f"Player {j}", f"Summoner {j}") for j in range(1, 6)],
+                latest_suggestions=[datetime(2022, 6, i, 18, tzinfo=pytz.utc), datetime(2022, 6, i, 19, tzinfo=pytz.utc)],
+                team_made_latest_suggestion=False, match_begin_confirmed=False,
+                comments=[create_temporary_comment(comment_id=i * 10 + j, user_id=enemy_team_id * 10) for j in range(2)],
+            ))
+        return matches
+
+    def test_constant_number_of_queries(self):
+        with self.assertNumQueries(18):
+            RegistrationWriter(self.team).write(self.create_matches(2))
+        self.team.matches_against.all().delete()
+        with self.assertNumQueries(18):
+            matches = RegistrationWriter(self.team).write(self.create_matches(20))
+        self.assertEqual(len(matches), 20)
+        self.assertEqual(matches[3].enemy_team.name, "Team 3")
+        self.assertEqual(sorted(matches[3].enemy_lineup.values_list("id", flat=True)), [1030, 1031, 1032])
+        self.assertEqual(matches[3].team_lineup.count(), 5)
+        self.assertEqual(matches[3].suggestion_set.count(), 2)
+        self.assertEqual(matches[3].comment_set.count(), 2)
+        self.assertEqual(matches[3].snapshot["enemy_lineup"], [1030, 1031, 1032])
+
+    def test_reregistration(self):
+        RegistrationWriter(self.team).write(self.create_matches(2))
+        Player.objects.create(id=9999, name="Old member", team_id=101)
+        matches = self.create_matches(2)
+        matches[0].enemy_lineup = None
+        matches[0].enemy_team["name"] = "Renamed"
+        matches[1].enemy_team_members.append(PlayerRecord(1010, "Enemy 0", "Summoner 0", False))
+        RegistrationWriter(self.team).write(matches)
+        self.assertEqual(Team.objects.get(id=101).name, "Renamed")
+        self.assertEqual(Player.objects.get(id=1010).team_id, 102)
+        self.assertEqual(Match.objects.count(), 2)
+        self.assertEqual(Comment.objects.count(), 4)
+        self.assertEqual(Suggestion.objects.count(), 4)
+        self.assertEqual(Team.objects.get(id=101).player_set.count(), 4)
+        self.assertIsNone(Player.objects.get(id=9999).team)
+        self.assertEqual(Match.objects.get(match_id=1).enemy_lineup.count(), 3)
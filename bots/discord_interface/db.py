@@ -0,0 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import SyncToAsync
+from django.conf import settings
+
+from bots.utils import connection_health
+
+_executor = ThreadPoolExecutor(max_workers=settings.DISCORD_DB_WORKERS, thread_name_prefix="discord_db")
+
+
+def database_sync_to_async(func):
+    """
+    Use instead of ``sync_to_async`` for all database access of the Discord bot.
+
+    Runs ``func`` on the bounded database pool of the bot instead of the single thread used by
+    ``thread_sensitive=True``, so ORM access and message rendering of different interactions run in parallel.
+    The connection of the worker is kept usable by ``connection_health``. Context variables, like the language
+    activated by ``translation_override``, are preserved.
+    """
+    return SyncToAsync(connection_health(func), thread_sensitive=False, executor=_executor)
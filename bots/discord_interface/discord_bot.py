@@ -6,10 +6,13 @@ from django.conf import settings
 from django.utils.translation import gettext as _
 
 from bots.base.bot_interface import BotInterface
+from bots.discord_interface.db import database_sync_to_async
+from bots.discord_interface.registry import registry
 from bots.discord_interface.utils import ChannelNotInUse, DiscordHelper, translation_override
 from bots.messages.base import BaseMessage
 from utils.exceptions import VariableNotSetException
 from utils.messages_logger import log_from_discord
+from utils.metrics import track_request
 
 discord_logger = logging.getLogger("discord")
 notifications_logger = logging.getLogger("notifications")
@@ -41,7 +44,9 @@ class DiscordBot(BotInterface):
             token=team.discord_webhook_token,
         )
         try:
-            webhook.send(**DiscordHelper.create_msg_arguments(discord_role_id=team.discord_role_id, msg=msg))
+            with track_request("discord") as tracked:
+                webhook.send(**DiscordHelper.create_msg_arguments(discord_role_id=team.discord_role_id, msg=msg))
+                tracked.status = 204
         except NotFound as e:
             team.set_discord_null()
             notifications_logger.info(f"Could not send message to {team}: {e}. Soft deleted'")
@@ -96,6 +101,7 @@ class _DiscordBotV2(Bot):
 
     async def setup_hook(self):
         discord_logger.info("Hook setup...")
+        await database_sync_to_async(registry.start)()
         await self.load_extensions()
         # await self.sync_commands()
         discord_logger.info("Hooked setup.")
@@ -1,8 +1,8 @@
-from asgiref.sync import sync_to_async
 from discord.ext import commands
 from django.conf import settings
 from django.utils.translation import gettext as _
 
+from bots.discord_interface.db import database_sync_to_async
 from bots.discord_interface.utils import DiscordHelper, check_channel_in_use, translation_override
 
 
@@ -15,7 +15,7 @@ async def delete(ctx, ):
         channel = ctx.message.channel
         team = await DiscordHelper.get_registered_team_by_channel_id(channel_id=channel.id)
         await ctx.send(_("Alright, I will delete all links to this channel and the team."))
-        await sync_to_async(team.set_discord_null)()
+        await database_sync_to_async(team.set_discord_null)()
         webhooks = [x for x in await channel.webhooks() if settings.DISCORD_APP_CLIENT_ID == x.user.id]
         for webhook in webhooks:
             await webhook.delete()
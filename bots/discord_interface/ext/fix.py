@@ -1,8 +1,8 @@
-from asgiref.sync import sync_to_async
 from discord.ext import commands
 from django.conf import settings
 from django.utils.translation import gettext as _
 
+from bots.discord_interface.db import database_sync_to_async
 from bots.discord_interface.utils import DiscordHelper, check_channel_in_use, translation_override
 
 
@@ -17,7 +17,7 @@ async def fix(ctx):
 
         team.discord_webhook_id = webhook.id
         team.discord_webhook_token = webhook.token
-        await sync_to_async(team.save)()
+        await database_sync_to_async(team.save)()
     await ctx.send(_(
         "The webhook has been recreated. "
         "If you still experience problems, check our website {website}/discord/ for help "
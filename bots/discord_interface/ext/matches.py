@@ -1,12 +1,18 @@
-from asgiref.sync import sync_to_async
+import asyncio
+
 from discord.ext import commands
 from django.utils.translation import gettext as _
 
+from bots.discord_interface.db import database_sync_to_async
 from bots.discord_interface.discord_bot import discord_logger
 from bots.discord_interface.utils import DiscordHelper, check_channel_in_use, translation_override
 from bots.messages import MatchesOverview, MatchOverview
 
 
+def render_embed(msg_class, **kwargs):
+    return msg_class(**kwargs).generate_discord_embed()
+
+
 @commands.hybrid_command(help="Creates an overview for open matches", )
 @commands.guild_only()
 @check_channel_in_use()
@@ -15,8 +21,7 @@ async def matches(ctx, ):
     async with ctx.typing():
         channel_id = ctx.message.channel.id
         team = await DiscordHelper.get_registered_team_by_channel_id(channel_id=channel_id)
-        msg = await sync_to_async(MatchesOverview)(team=team)
-        embed = await sync_to_async(msg.generate_discord_embed)()
+        embed = await database_sync_to_async(render_embed)(MatchesOverview, team=team)
     await ctx.send(embed=embed)
 
 
@@ -28,13 +33,15 @@ async def match_information(ctx, match_day: int, ):
     async with ctx.typing():
         try:
             team = await DiscordHelper.get_registered_team_by_channel_id(channel_id=ctx.message.channel.id)
-            found_matches = await sync_to_async(list)(
-                await sync_to_async(team.get_obvious_matches_based_on_stage)(match_day=match_day))
+            found_matches = await database_sync_to_async(list)(
+                await database_sync_to_async(team.get_obvious_matches_based_on_stage)(match_day=match_day))
             if not found_matches:
                 return await ctx.send(_("This match day was not found. Try `/match 1`."))
-            for i in found_matches:
-                msg = await sync_to_async(MatchOverview)(team=team, match=i)
-                embed = await sync_to_async(msg.generate_discord_embed)()
+            # Render all match days in parallel, but send them in order
+            embeds = await asyncio.gather(*[
+                database_sync_to_async(render_embed)(MatchOverview, team=team, match=i) for i in found_matches
+            ])
+            for embed in embeds:
                 await ctx.send(embed=embed)
         except Exception as e:
             discord_logger.exception(e, exc_info=True)
@@ -1,16 +1,15 @@
 import logging
 
-from asgiref.sync import sync_to_async
 from discord.ext import commands
 from django.conf import settings
 from django.utils.translation import gettext as _
 
 from app_prime_league.models import ScoutingWebsite
 from app_prime_league.teams import register_team
+from bots.discord_interface.db import database_sync_to_async
 from bots.discord_interface.utils import (
     DiscordHelper, ChannelInUse, TeamInUse, NoWebhookPermissions, check_channel_not_in_use, check_team_not_registered,
     translation_override)
-from bots.messages import MatchesOverview
 from utils.exceptions import (
     CouldNotParseURLException, TeamWebsite404Exception, PrimeLeagueConnectionException, Div1orDiv2TeamException)
 from utils.utils import get_valid_team_id
@@ -42,7 +41,7 @@ async def start(ctx: commands.Context, team_id_or_url: TeamIDConverter):
             "This may take a moment...⏳\n"
         ))
         try:
-            team = await sync_to_async(register_team)(
+            team = await database_sync_to_async(register_team)(
                 team_id=team_id, discord_webhook_id=webhook.id,
                 discord_webhook_token=webhook.token, discord_channel_id=ctx.channel.id
             )
@@ -69,9 +68,8 @@ async def start(ctx: commands.Context, team_id_or_url: TeamIDConverter):
             "Just try it out! 🎁 \n"
             "The **status of the Prime League API** can be viewed at any time on {website}."
         ).format(team_name=team.name, website=settings.SITE_ID, scouting_website=ScoutingWebsite.default().name)
-        msg = await sync_to_async(MatchesOverview)(team=team)
-        embed = await sync_to_async(msg.generate_discord_embed)()
-    return await ctx.send(response, embed=embed)
+    # The MatchesOverview is posted by the match backfill of the registration
+    return await ctx.send(response)
 
 
 @start.error
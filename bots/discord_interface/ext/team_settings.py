@@ -1,12 +1,12 @@
 import typing
 
 import discord
-from asgiref.sync import sync_to_async
 from discord.ext import commands
 from django.conf import settings
 from django.utils.translation import gettext as _
 
 from app_api.modules.team_settings.maker import SettingsMaker
+from bots.discord_interface.db import database_sync_to_async
 from bots.discord_interface.utils import DiscordHelper, check_channel_in_use, COLOR_SETTINGS, translation_override
 
 
@@ -20,7 +20,7 @@ async def set_role(ctx, role: typing.Optional[discord.Role], ):
         team = await DiscordHelper.get_registered_team_by_channel_id(channel_id=channel_id)
         if role is None:
             team.discord_role_id = None
-            await sync_to_async(team.save)()
+            await database_sync_to_async(team.save)()
             await ctx.send(_(
                 "All right, I've removed the role mention. "
                 "You can turn it back on if needed, just use `/role ROLE_NAME`."
@@ -33,7 +33,7 @@ async def set_role(ctx, role: typing.Optional[discord.Role], ):
             return
 
         team.discord_role_id = role.id
-        await sync_to_async(team.save)()
+        await database_sync_to_async(team.save)()
     await ctx.send(
         _("Okay, I'll inform the role **{role_name}** for new notifications from now on. 📯").format(
             role_name=role.name))
@@ -47,8 +47,8 @@ async def team_settings(ctx, ):
     async with ctx.typing():
         channel_id = ctx.message.channel.id
         team = await DiscordHelper.get_registered_team_by_channel_id(channel_id=channel_id)
-        maker = await sync_to_async(SettingsMaker)(team=team)
-        link = await sync_to_async(maker.generate_expiring_link)(platform="discord")
+        maker = await database_sync_to_async(SettingsMaker)(team=team)
+        link = await database_sync_to_async(maker.generate_expiring_link)(platform="discord")
         embed = discord.Embed(
             title=_("Change settings for {team}").format(team=team.name),
             url=link,
@@ -0,0 +1,112 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+
+from app_prime_league.models import Team, TEAMS_VERSION_CACHE_KEY
+from bots.discord_interface.db import database_sync_to_async
+
+discord_logger = logging.getLogger("discord")
+
+
+class ChannelTeamRegistry:
+    """
+    In-process mapping of Discord channel ids to the teams registered in them, so checks, language detection and
+    commands do not query the database for every lookup.
+
+    The registry is loaded once on ``start()`` and kept up to date by the ``post_save`` and ``post_delete`` signals of
+    ``Team`` in this process (registration, deletion, role and webhook changes). Changes made by other processes,
+    e.g. settings changed on the website, change the shared ``TEAMS_VERSION_CACHE_KEY`` and cause a full reload on
+    the next lookup. Changes without signals (queryset updates) are picked up by a full reload after ``ttl`` seconds.
+    Until ``start()`` is called, every lookup queries the database.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.active = False
+        self._lock = threading.Lock()
+        self._teams: Dict[str, Team] = {}
+        self._channel_ids: Dict[int, str] = {}
+        self._webhook_teams: Dict[int, Team] = {}
+        self._loaded_at = None
+        self._version = None
+
+    def start(self):
+        self.load()
+        post_save.connect(self._on_team_saved, sender=Team, dispatch_uid="discord_channel_team_registry")
+        post_delete.connect(self._on_team_deleted, sender=Team, dispatch_uid="discord_channel_team_registry")
+        self.active = True
+
+    def stop(self):
+        post_save.disconnect(sender=Team, dispatch_uid="discord_channel_team_registry")
+        post_delete.disconnect(sender=Team, dispatch_uid="discord_channel_team_registry")
+        self.active = False
+
+    def load(self):
+        version = cache.get(TEAMS_VERSION_CACHE_KEY)
+        teams = list(
+            Team.objects.filter(Q(discord_channel_id__isnull=False) | Q(discord_webhook_id__isnull=False))
+            .select_related("scouting_website")
+        )
+        with self._lock:
+            self._teams = {x.discord_channel_id: x for x in teams if x.discord_channel_id is not None}
+            self._channel_ids = {x.id: x.discord_channel_id for x in self._teams.values()}
+            self._webhook_teams = {x.id: x for x in teams if x.discord_webhook_id is not None}
+            self._loaded_at = time.monotonic()
+            self._version = version
+        discord_logger.info(f"Loaded {len(self._teams)} teams into the channel registry")
+
+    async def get_by_channel_id(self, channel_id) -> Optional[Team]:
+        if not self.active:
+            return await database_sync_to_async(Team.objects.filter(discord_channel_id=channel_id).first)()
+        await self._reload_if_outdated()
+        with self._lock:
+            return self._teams.get(str(channel_id))
+
+    async def get_by_team_id(self, team_id) -> Optional[Team]:
+        """
+        Returns: Team with a Discord webhook
+        """
+        if not self.active:
+            qs = Team.objects.filter(id=team_id, discord_webhook_id__isnull=False)
+            return await database_sync_to_async(qs.first)()
+        await self._reload_if_outdated()
+        with self._lock:
+            return self._webhook_teams.get(team_id)
+
+    def update(self, team: Team):
+        with self._lock:
+            self._discard(team.id)
+            if team.discord_channel_id is not None:
+                self._teams[str(team.discord_channel_id)] = team
+                self._channel_ids[team.id] = str(team.discord_channel_id)
+            if team.discord_webhook_id is not None:
+                self._webhook_teams[team.id] = team
+
+    def discard(self, team_id):
+        with self._lock:
+            self._discard(team_id)
+
+    def _discard(self, team_id):
+        self._webhook_teams.pop(team_id, None)
+        channel_id = self._channel_ids.pop(team_id, None)
+        if channel_id is not None:
+            self._teams.pop(channel_id, None)
+
+    async def _reload_if_outdated(self):
+        if time.monotonic() - self._loaded_at > self.ttl or cache.get(TEAMS_VERSION_CACHE_KEY) != self._version:
+            await database_sync_to_async(self.load)()
+
+    def _on_team_saved(self, sender, instance: Team, **kwargs):
+        self.update(instance)
+
+    def _on_team_deleted(self, sender, instance: Team, **kwargs):
+        self.discard(instance.id)
+
+
+registry = ChannelTeamRegistry(ttl=settings.DISCORD_TEAM_REGISTRY_TTL)
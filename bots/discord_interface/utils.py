@@ -2,7 +2,6 @@ import functools
 import os
 from typing import Callable, Union
 
-from asgiref.sync import sync_to_async
 from discord import Colour, Embed, Webhook, Forbidden, Interaction
 from discord.ext import commands
 from discord.ext.commands import Context
@@ -10,6 +9,7 @@ from django.conf import settings
 from django.utils import translation
 
 from app_prime_league.models import Team
+from bots.discord_interface.registry import registry
 from bots.messages.base import BaseMessage
 from utils.messages_logger import log_from_discord
 
@@ -82,11 +82,11 @@ class DiscordHelper:
 
     @staticmethod
     async def get_registered_team_by_channel_id(channel_id: int) -> Union[None, Team]:
-        return await sync_to_async(Team.objects.filter(discord_channel_id=channel_id).first)()
+        return await registry.get_by_channel_id(channel_id)
 
     @staticmethod
     async def get_registered_team_by_team_id(team_id: int) -> Union[None, Team]:
-        return await sync_to_async(Team.objects.filter(id=team_id, discord_webhook_id__isnull=False).first)()
+        return await registry.get_by_team_id(team_id)
 
 
 def check_channel_in_use() -> Callable:
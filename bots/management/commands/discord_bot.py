@@ -1,8 +1,10 @@
 from django.core.management import BaseCommand
 
 from bots.discord_interface.discord_bot import DiscordBot
+from utils.metrics import export_process_metrics
 
 
 class Command(BaseCommand):
     def handle(self, *args, **options):
+        export_process_metrics("discord_bot")
         DiscordBot().run()
@@ -1,9 +1,11 @@
 from django.core.management import BaseCommand
 
 from bots.telegram_interface.telegram_bot import TelegramBot
+from utils.metrics import export_process_metrics
 
 
 class Command(BaseCommand):
     def handle(self, *args, **options):
         print("Bot is listening...")
+        export_process_metrics("telegram_bot")
         TelegramBot().run()
@@ -2,6 +2,8 @@ from app_prime_league.models import Team
 from bots.discord_interface.discord_bot import DiscordBot
 from bots.messages.base import BaseMessage
 from bots.telegram_interface.telegram_bot import TelegramBot
+from core.updater.run_stats import update_run
+from utils.metrics import time_stage
 
 
 class MessageDispatcher:
@@ -22,9 +24,15 @@ class MessageDispatcher:
         msg = msg_class(team=self.team, **kwargs)
         if not msg.team_wants_notification():
             return
-        for bot in self.bots:
-            bot.send_message(msg=msg, team=self.team)
+        if self.bots:
+            update_run.record_notification(msg_class)
+        with time_stage("dispatch"):
+            for bot in self.bots:
+                bot.send_message(msg=msg, team=self.team)
 
     def dispatch_raw_message(self, msg, **kwargs):
-        for bot in self.bots:
-            bot.send_message(msg=msg, team=self.team, )
+        if self.bots:
+            update_run.record_notification(type(msg))
+        with time_stage("dispatch"):
+            for bot in self.bots:
+                bot.send_message(msg=msg, team=self.team, )
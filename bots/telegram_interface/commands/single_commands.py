@@ -13,7 +13,7 @@ from app_prime_league.models import Team
 from bots.base.bop import GIFinator
 from bots.messages import MatchesOverview
 from bots.telegram_interface.validation_messages import channel_not_registered
-from bots.utils import mysql_has_gone_away_decorator
+from bots.utils import connection_health
 from utils.messages_logger import log_command
 
 logger = logging.getLogger("commands")
@@ -45,7 +45,7 @@ def set_photo(chat_id, context: CallbackContext, url):
 
 # /set_logo
 @log_command
-@mysql_has_gone_away_decorator
+@connection_health(retry=True)
 def set_logo(update: Update, context: CallbackContext):
     chat_id = update.message.chat.id
     if not Team.objects.filter(telegram_id=chat_id).exists():
@@ -114,7 +114,7 @@ def helpcommand(update: Update, context: CallbackContext):
 
 
 @log_command
-@mysql_has_gone_away_decorator
+@connection_health(retry=True)
 def matches(update: Update, context: CallbackContext):
     chat_id = update.message.chat.id
     try:
@@ -132,7 +132,7 @@ def matches(update: Update, context: CallbackContext):
 
 
 @log_command
-@mysql_has_gone_away_decorator
+@connection_health(retry=True)
 def delete(update: Update, context: CallbackContext):
     chat_id = update.message.chat.id
     if not Team.objects.filter(telegram_id=chat_id).exists():
@@ -151,7 +151,7 @@ def delete(update: Update, context: CallbackContext):
 
 
 @log_command
-@mysql_has_gone_away_decorator
+@connection_health(retry=True)
 def team_settings(update: Update, context: CallbackContext):
     chat_id = update.message.chat.id
     try:
@@ -175,7 +175,7 @@ def team_settings(update: Update, context: CallbackContext):
     return ConversationHandler.END
 
 
-@mysql_has_gone_away_decorator
+@connection_health(retry=True)
 def migrate_chat(update: Update, context: CallbackContext):
     if update.message.chat.type == "supergroup":
         return
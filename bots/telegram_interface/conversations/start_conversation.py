@@ -1,14 +1,16 @@
+import functools
+
 from django.conf import settings
 from telegram import Update, ParseMode
 from telegram.error import BadRequest
 from telegram.ext import CallbackContext, ConversationHandler
 
 from app_prime_league.models import Team, ScoutingWebsite
-from app_prime_league.teams import register_team
+from app_prime_league.teams import after_backfill, register_team
 from bots.messages import MatchesOverview
 from bots.telegram_interface.commands.single_commands import set_photo
 from bots.telegram_interface.keyboards import boolean_keyboard
-from bots.utils import mysql_has_gone_away_decorator
+from bots.utils import connection_health
 from utils.exceptions import CouldNotParseURLException, PrimeLeagueConnectionException, TeamWebsite404Exception, \
     Div1orDiv2TeamException
 from utils.messages_logger import log_command, log_callbacks
@@ -51,7 +53,7 @@ def team_is_locked(team_id):
 
 # /start
 @log_command
-@mysql_has_gone_away_decorator
+@connection_health
 def start(update: Update, context: CallbackContext):
     chat_type = update.message.chat.type
     if chat_type not in ["group", "supergroup"]:
@@ -103,7 +105,7 @@ def team_has_chat_id(team_id):
 
 
 @log_command
-@mysql_has_gone_away_decorator
+@connection_health
 def team_registration(update: Update, context: CallbackContext):
     try:
         team_id = get_valid_team_id(update.message.text)
@@ -151,7 +153,8 @@ def team_registration(update: Update, context: CallbackContext):
         new_team_old_chat_id = Team.objects.get_team(team_id).telegram_id
 
     try:
-        new_team = register_team(team_id=team_id, telegram_id=chat_id)
+        # The MatchesOverview is sent by finish_registration once the backfill has finished
+        new_team = register_team(team_id=team_id, telegram_id=chat_id, background=True, post_overview=False)
 
     except TeamWebsite404Exception:
         update.message.reply_markdown(
@@ -219,7 +222,7 @@ def team_registration(update: Update, context: CallbackContext):
 
 
 @log_callbacks
-@mysql_has_gone_away_decorator
+@connection_health(retry=True)
 def set_optional_photo(update: Update, context: CallbackContext):
     query = update.callback_query
     chat_id = query.message.chat_id
@@ -244,7 +247,7 @@ def set_optional_photo(update: Update, context: CallbackContext):
 
 
 @log_callbacks
-@mysql_has_gone_away_decorator
+@connection_health(retry=True)
 def finish_registration(update: Update, context: CallbackContext):
     query = update.callback_query
     chat_id = query.message.chat_id
@@ -271,9 +274,12 @@ def finish_registration(update: Update, context: CallbackContext):
         disable_web_page_preview=True,
         parse_mode=ParseMode.MARKDOWN,
     )
+    after_backfill(team.id, functools.partial(send_matches_overview, context.bot, chat_id, team))
+
 
+def send_matches_overview(bot, chat_id, team: Team):
     msg = MatchesOverview(team=team)
-    context.bot.send_message(
+    bot.send_message(
         text=msg.generate_message(),
         chat_id=chat_id,
         disable_web_page_preview=True,
@@ -4,6 +4,8 @@ import telepot
 from django.conf import settings
 from telegram import ParseMode
 
+from utils.metrics import track_request
+
 bot = telepot.Bot(token=settings.TELEGRAM_BOT_KEY)
 
 notifications_logger = logging.getLogger("notifications")
@@ -21,7 +23,10 @@ def send_message(msg: str, chat_id: int, parse_mode=ParseMode.MARKDOWN, raise_ag
     Sends a Message using Markdown as default.
     """
     try:
-        return bot.sendMessage(chat_id=chat_id, text=msg, parse_mode=parse_mode, disable_web_page_preview=True)
+        with track_request("telegram") as tracked:
+            message = bot.sendMessage(chat_id=chat_id, text=msg, parse_mode=parse_mode, disable_web_page_preview=True)
+            tracked.status = 200
+        return message
     except Exception as e:
         notifications_logger.exception(
             f"Error Sending Message in Chat chat_id={chat_id} msg={msg}\n{e}")
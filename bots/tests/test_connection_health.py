@@ -0,0 +1,83 @@
+import os
+import re
+import tempfile
+import time
+from unittest import mock
+
+from django.db import OperationalError, connection
+from django.test import TransactionTestCase, override_settings
+
+from app_prime_league.models import Team
+from bots.utils import ConnectionHealth, connection_health
+from utils.metrics import export_process_metrics
+
+
+class ConnectionHealthTests(TransactionTestCase):
+
+    def setUp(self):
+        self.now = 0
+        self.health = ConnectionHealth(idle_timeout=60, clock=lambda: self.now)
+
+    def test_no_probe_query(self):
+        with self.assertNumQueries(1):
+            self.assertFalse(self.health(Team.objects.exists)())
+        self.assertEqual(self.health.snapshot()["checkouts"], 1)
+
+    def test_retry_if_connection_was_lost_before_first_query(self):
+        fn = mock.Mock(side_effect=[OperationalError(2006, "MySQL server has gone away"), "ok"], __name__="fn")
+        self.assertEqual(self.health(retry=True)(fn)(), "ok")
+        self.assertEqual(fn.call_count, 2)
+        snapshot = self.health.snapshot()
+        self.assertEqual((snapshot["reconnects"], snapshot["retries"]), (1, 1))
+
+    def test_no_retry_by_default(self):
+        fn = mock.Mock(side_effect=[OperationalError(2006, "MySQL server has gone away"), "ok"], __name__="fn")
+        with self.assertRaises(OperationalError):
+            self.health(fn)()
+        self.assertEqual(fn.call_count, 1)
+        self.assertEqual(self.health.snapshot()["retries"], 0)
+
+    def test_no_retry_after_successful_query(self):
+        def fn():
+            Team.objects.exists()
+            raise OperationalError(2013, "Lost connection to MySQL server during query")
+
+        with self.assertRaises(OperationalError):
+            self.health.call_with_retry(fn)
+        self.assertEqual(self.health.snapshot()["retries"], 0)
+
+    def test_no_retry_of_other_errors(self):
+        with self.assertRaises(OperationalError):
+            self.health.call_with_retry(mock.Mock(side_effect=OperationalError(1205, "Lock wait timeout exceeded")))
+
+    def test_validate_idle_connection(self):
+        self.health(Team.objects.exists)()
+        self.now = 30
+        with mock.patch.object(connection, "is_usable") as is_usable:
+            self.health.checkout()
+            is_usable.assert_not_called()
+            self.now = 100
+            is_usable.return_value = False
+            self.health.checkout()
+            is_usable.assert_called_once()
+        snapshot = self.health.snapshot()
+        self.assertEqual((snapshot["validations"], snapshot["reconnects"]), (1, 1))
+
+
+class ConnectionHealthMetricsTests(TransactionTestCase):
+
+    def test_counters_are_exported_by_bot_processes(self):
+        connection_health(Team.objects.exists)()
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_TEXTFILE_DIR=directory):
+            export_process_metrics("test_bot", interval=60).set()
+            path = os.path.join(directory, "primebot_test_bot.prom")
+            for _ in range(100):
+                if os.path.exists(path):
+                    break
+                time.sleep(0.01)
+            with open(path, encoding="utf8") as f:
+                content = f.read()
+        for counter in ("checkouts", "validations", "reconnects", "retries"):
+            self.assertIn(f"# TYPE primebot_db_connection_{counter}_total counter", content)
+        checkouts = re.search(r'^primebot_db_connection_checkouts_total\{process="test_bot"} (\S+)$', content, re.M)
+        self.assertGreaterEqual(float(checkouts.group(1)), 1)
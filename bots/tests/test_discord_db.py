@@ -0,0 +1,41 @@
+import asyncio
+import threading
+import time
+
+from asgiref.sync import async_to_sync
+from django.test import TransactionTestCase
+from django.utils import translation
+
+from app_prime_league.models import Team
+from bots.discord_interface.db import database_sync_to_async
+
+
+class DatabaseSyncToAsyncTests(TransactionTestCase):
+
+    def test_runs_on_database_pool(self):
+        Team.objects.create(id=1, name="ABC", team_tag="abc")
+
+        def get_team():
+            return threading.current_thread().name, Team.objects.get(id=1)
+
+        thread_name, team = async_to_sync(database_sync_to_async(get_team))()
+        self.assertTrue(thread_name.startswith("discord_db"))
+        self.assertEqual(team.name, "ABC")
+
+    def test_preserves_translation(self):
+        async def get_language():
+            translation.activate("de")
+            try:
+                return await database_sync_to_async(translation.get_language)()
+            finally:
+                translation.deactivate()
+
+        self.assertEqual(async_to_sync(get_language)(), "de")
+
+    def test_calls_run_in_parallel(self):
+        async def run():
+            await asyncio.gather(*[database_sync_to_async(time.sleep)(0.2) for _ in range(4)])
+
+        start = time.monotonic()
+        async_to_sync(run)()
+        self.assertLess(time.monotonic() - start, 0.6)
@@ -0,0 +1,96 @@
+import threading
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TransactionTestCase
+
+from app_prime_league.models import Team
+from bots.discord_interface.registry import ChannelTeamRegistry
+
+
+class ChannelTeamRegistryTests(TransactionTestCase):
+
+    def setUp(self):
+        self.team = Team.objects.create(id=1, name="ABC", team_tag="abc", discord_channel_id="100",
+                                        discord_webhook_id=1)
+        Team.objects.create(id=2, name="XYZ", team_tag="xyz")
+        self.registry = ChannelTeamRegistry(ttl=300)
+        self.registry.start()
+
+    def tearDown(self):
+        self.registry.stop()
+
+    def get_by_channel_id(self, channel_id):
+        return async_to_sync(self.registry.get_by_channel_id)(channel_id)
+
+    def test_lookups_without_queries(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_by_channel_id(100), self.team)
+            self.assertIsNone(self.get_by_channel_id(200))
+            self.assertEqual(async_to_sync(self.registry.get_by_team_id)(1), self.team)
+            self.assertIsNone(async_to_sync(self.registry.get_by_team_id)(2))
+
+    def test_invalidation_on_save_and_delete(self):
+        team = Team.objects.get(id=2)
+        team.discord_channel_id = "200"
+        team.save()
+        self.assertEqual(self.get_by_channel_id(200).name, "XYZ")
+
+        self.team.set_discord_null()
+        self.assertIsNone(self.get_by_channel_id(100))
+
+        team.delete()
+        self.assertIsNone(self.get_by_channel_id(200))
+
+    def test_reload_after_ttl(self):
+        Team.objects.filter(id=1).update(language="en")
+        self.assertEqual(self.get_by_channel_id(100).language, "de")
+        self.registry.ttl = 0
+        self.assertEqual(self.get_by_channel_id(100).language, "en")
+
+    def test_reload_after_change_in_other_process(self):
+        cache = LocMemCache("test_discord_registry", {})
+        with mock.patch("app_prime_league.models.cache", cache), \
+                mock.patch("bots.discord_interface.registry.cache", cache):
+            self.registry.load()
+            self.assertEqual(self.get_by_channel_id(100).language, "de")
+            # saved by another process, without the signals of this registry
+            self.registry.stop()
+            team = Team.objects.get(id=1)
+            team.language = "en"
+            team.save()
+            self.registry.active = True
+            with mock.patch.object(self.registry, "load", wraps=self.registry.load) as load:
+                self.assertEqual(self.get_by_channel_id(100).language, "en")
+                self.get_by_channel_id(100)
+            load.assert_called_once()
+
+    def test_team_id_lookup_requires_webhook(self):
+        Team.objects.create(id=3, name="Webhook", team_tag="wh", discord_webhook_id=3)
+        team = Team.objects.create(id=4, name="Channel", team_tag="ch", discord_channel_id="400")
+        self.registry.load()
+        self.assertEqual(async_to_sync(self.registry.get_by_team_id)(3).name, "Webhook")
+        self.assertIsNone(async_to_sync(self.registry.get_by_team_id)(4))
+        self.assertEqual(self.get_by_channel_id(400), team)
+
+    def test_lookup_during_update_finds_team(self):
+        results, threads = [], []
+        discard = self.registry._discard
+
+        def discard_and_lookup(team_id):
+            discard(team_id)
+            thread = threading.Thread(target=lambda: results.append(self.get_by_channel_id(100)))
+            thread.start()
+            thread.join(0.1)  # blocked by the lock of the update
+            results.append("updated")
+            threads.append(thread)
+
+        with mock.patch.object(self.registry, "_discard", discard_and_lookup):
+            self.registry.update(self.team)
+        threads[0].join()
+        self.assertEqual(results, ["updated", self.team])
+
+    def test_inactive_registry_queries_database(self):
+        self.registry.stop()
+        self.assertEqual(self.get_by_channel_id(100), self.team)
@@ -0,0 +1,59 @@
+import concurrent.futures
+from unittest import mock
+
+from django.test import TransactionTestCase
+
+from app_prime_league import teams
+from app_prime_league.models import Team
+from bots.telegram_interface.conversations import start_conversation
+
+
+class TelegramRegistrationTests(TransactionTestCase):
+
+    def setUp(self):
+        self.team = Team.objects.create(id=1, name="ABC", team_tag="abc")
+        self.context = mock.Mock()
+        self.backfill = concurrent.futures.Future()
+        executor = mock.patch.object(teams, "_backfill_executor", **{"submit.return_value": self.backfill})
+        executor.start()
+        self.addCleanup(executor.stop)
+        self.addCleanup(teams._running_backfills.clear)
+        spread_message = mock.patch("utils.messages_logger.spread_message")
+        spread_message.start()
+        self.addCleanup(spread_message.stop)
+
+    def register(self):
+        processor = mock.Mock(**{
+            "get_team_name.return_value": "ABC",
+            "get_team_tag.return_value": "abc",
+            "get_current_division.return_value": "4.1",
+            "get_logo.return_value": None,
+            "get_matches.return_value": [1, 2],
+        })
+        update = mock.Mock(**{"message.text": "1", "message.chat.id": 5})
+        with mock.patch("app_prime_league.teams.TeamDataProcessor", return_value=processor):
+            return start_conversation.team_registration(update, self.context)
+
+    def finish_registration(self):
+        update = mock.Mock(**{"callback_query.message.chat_id": 5})
+        start_conversation.finish_registration(update, self.context)
+
+    @mock.patch.object(start_conversation, "send_matches_overview")
+    def test_overview_after_backfill(self, send_matches_overview):
+        self.register()
+        self.assertEqual(Team.objects.get(id=1).telegram_id, "5")
+        self.assertEqual(teams._backfill_executor.submit.call_args.args[1:], (self.team, [1, 2], False))
+
+        self.finish_registration()
+        send_matches_overview.assert_not_called()
+        self.backfill.set_result(None)
+        send_matches_overview.assert_called_once_with(self.context.bot, 5, self.team)
+
+    @mock.patch.object(start_conversation, "send_matches_overview")
+    def test_overview_at_finish_registration(self, send_matches_overview):
+        self.register()
+        self.backfill.set_result(None)
+        send_matches_overview.assert_not_called()
+
+        self.finish_registration()
+        send_matches_overview.assert_called_once_with(self.context.bot, 5, self.team)
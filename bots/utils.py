@@ -1,31 +1,135 @@
+import functools
 import logging
+import threading
+import time
 
-import django
-from django import db
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from prometheus_client import Counter
 
-from app_prime_league.models import Team
+from utils.metrics import NAMESPACE
 
+logger = logging.getLogger("django")
 
-def mysql_has_gone_away_decorator(fn):
+connection_counters = {
+    x: Counter(
+        f"db_connection_{x}", f"Database connection {x} of the connection health management.", namespace=NAMESPACE
+    )
+    for x in ("checkouts", "validations", "reconnects", "retries")
+}
+
+# MySQL client errors of dropped connections: server has gone away, lost connection, lost connection on read
+CONNECTION_LOST_ERROR_CODES = (2006, 2013, 2055)
+
+
+def is_connection_lost_error(e: OperationalError) -> bool:
+    return bool(e.args) and e.args[0] in CONNECTION_LOST_ERROR_CODES
+
+
+class ConnectionHealth:
     """
-    This decorator function checks if my sql has gone away and establish a new connection if so.
-    :param fn:
-    :return:
+    Keeps the database connection of the calling thread usable without probing it on every call.
+
+    On checkout, expired connections (``CONN_MAX_AGE``) and connections with errors are closed. Connections which
+    were idle longer than ``idle_timeout`` are pinged once. Functions decorated with ``retry=True`` are called again
+    once if the connection was lost before any query succeeded, so only use it for functions without side effects
+    before their first query (e.g. sent messages). Calls inside atomic blocks are never retried.
+
+    ``snapshot()`` returns the counters of this process.
     """
 
-    def wrapper(*args, **kwargs):
-        mysql_has_gone_away()
-        return fn(*args, **kwargs)
+    def __init__(self, idle_timeout=60, alias=DEFAULT_DB_ALIAS, clock=time.monotonic):
+        self.idle_timeout = idle_timeout
+        self.alias = alias
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._counters = {"checkouts": 0, "validations": 0, "reconnects": 0, "retries": 0}
+
+    def __call__(self, fn=None, *, retry=False):
+        """
+        Use this as a decorator: ``@connection_health`` or ``@connection_health(retry=True)``.
+        """
+        if fn is None:
+            return functools.partial(self, retry=retry)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if retry:
+                return self.call_with_retry(fn, *args, **kwargs)
+            return self.call(fn, *args, **kwargs)
+
+        return wrapper
+
+    def call(self, fn, *args, **kwargs):
+        self.checkout()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.release()
+
+    def call_with_retry(self, fn, *args, **kwargs):
+        """
+        Like ``call``, but calls ``fn`` again if the connection was lost before its first query.
+        """
+        self.checkout()
+        try:
+            executed = []
+            try:
+                with connections[self.alias].execute_wrapper(self._count_queries(executed)):
+                    return fn(*args, **kwargs)
+            except OperationalError as e:
+                if not self._can_retry(e, executed):
+                    raise
+                self._reconnect(reason=e)
+                self._increment("retries")
+                return fn(*args, **kwargs)
+        finally:
+            self.release()
+
+    def checkout(self):
+        conn = connections[self.alias]
+        self._increment("checkouts")
+        if conn.in_atomic_block:
+            return
+        conn.close_if_unusable_or_obsolete()
+        if conn.connection is None:
+            return
+        if self._clock() - getattr(conn, "health_last_used", 0) > self.idle_timeout:
+            self._increment("validations")
+            if not conn.is_usable():
+                self._reconnect(reason="idle connection is not usable")
+
+    def release(self):
+        conn = connections[self.alias]
+        conn.health_last_used = self._clock()
+        if not conn.in_atomic_block:
+            conn.close_if_unusable_or_obsolete()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._counters)
+
+    def _can_retry(self, e, executed):
+        return is_connection_lost_error(e) and not executed and not connections[self.alias].in_atomic_block
+
+    def _reconnect(self, reason):
+        connections[self.alias].close()
+        self._increment("reconnects")
+        logger.info(f"Database connection reopened ({reason}), {self.snapshot()}")
+
+    def _increment(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+        connection_counters[counter].inc()
+
+    @staticmethod
+    def _count_queries(executed):
+        def wrapper(execute, sql, params, many, context):
+            result = execute(sql, params, many, context)
+            executed.append(True)
+            return result
 
-    return wrapper
+        return wrapper
 
 
-def mysql_has_gone_away(*args):
-    try:
-        Team.objects.exists()
-    except django.db.utils.OperationalError as e:
-        log_text = f"{e}: TRY ESTABLISH NEW CONNECTION"
-        logging.getLogger("django").info(log_text)
-        db.close_old_connections()
-    finally:
-        return True
+connection_health = ConnectionHealth(idle_timeout=settings.DB_CONNECTION_IDLE_TIMEOUT)
@@ -1,13 +1,48 @@
 import requests
 from django.conf import settings
+from prometheus_client import Counter, Gauge
+from rest_framework import status
 
-from utils.exceptions import PrimeLeagueConnectionException
+from core.providers.circuit_breaker import CircuitBreaker
+from core.providers.concurrency import AdaptiveConcurrencyLimiter
+from utils.exceptions import PrimeLeagueCircuitOpenException, PrimeLeagueConnectionException
+from utils.metrics import NAMESPACE, track_request
+
+circuit_open = Gauge(
+    "prime_league_circuit_open", "1 if the Prime League circuit breaker is open or half open.",
+    namespace=NAMESPACE, multiprocess_mode="livemax",
+)
+circuit_rejected_calls = Counter(
+    "prime_league_circuit_rejected_calls", "Calls failed fast by the Prime League circuit breaker.",
+    namespace=NAMESPACE,
+)
+concurrency_limit = Gauge(
+    "prime_league_concurrency_limit", "Current adaptive concurrency limit of Prime League requests.",
+    namespace=NAMESPACE, multiprocess_mode="livemin",
+)
+latency_seconds = Gauge(
+    "prime_league_latency_seconds", "Smoothed latency of Prime League requests.",
+    namespace=NAMESPACE, multiprocess_mode="livemax",
+)
 
 
 class PrimeLeagueAPI:
     _TEAM = "/team/%s/"
     _MATCH = "/match/%s/"
     BASE_URL = settings.GAME_SPORTS_BASE_URL
+    circuit_breaker = CircuitBreaker(
+        name="prime_league",
+        failure_threshold=settings.PRIME_LEAGUE_CIRCUIT_FAILURE_THRESHOLD,
+        error_rate_threshold=settings.PRIME_LEAGUE_CIRCUIT_ERROR_RATE_THRESHOLD,
+        recovery_timeout=settings.PRIME_LEAGUE_CIRCUIT_RECOVERY_TIMEOUT,
+    )
+    concurrency_limiter = AdaptiveConcurrencyLimiter(
+        name="prime_league",
+        initial_limit=settings.PRIME_LEAGUE_CONCURRENCY_INITIAL,
+        min_limit=settings.PRIME_LEAGUE_CONCURRENCY_MIN,
+        max_limit=settings.PRIME_LEAGUE_CONCURRENCY_MAX,
+        latency_target=settings.PRIME_LEAGUE_LATENCY_TARGET,
+    )
 
     @classmethod
     def request(cls, endpoint, request=requests.get, query_params=None, **kwargs):
@@ -17,7 +52,7 @@ class PrimeLeagueAPI:
         :param query_params: optional list of strings
         :param kwargs: optional params passed to requests method
         :return:
-        :raises: PrimeLeagueConnectionException
+        :raises: PrimeLeagueConnectionException, PrimeLeagueCircuitOpenException
         """
         if endpoint is None:
             raise Exception("Endpoint cannot be None")
@@ -30,11 +65,51 @@ class PrimeLeagueAPI:
             "timeout": 10,
         }
         try:
-            response = request(url=path, **{**default_requests_params, **kwargs})
-        except requests.exceptions.ConnectionError:
-            raise PrimeLeagueConnectionException()
+            cls.circuit_breaker.before_call()
+        except PrimeLeagueCircuitOpenException:
+            circuit_rejected_calls.inc()
+            raise
+        try:
+            with cls.concurrency_limiter.acquire() as permit:
+                try:
+                    with track_request("prime_league") as tracked:
+                        response = request(url=path, **{**default_requests_params, **kwargs})
+                        tracked.status = response.status_code
+                except requests.exceptions.RequestException as e:
+                    cls.circuit_breaker.record_failure()
+                    raise PrimeLeagueConnectionException(msg=f"{type(e).__name__} {endpoint}")
+                permit.overloaded = cls.is_outage_status(response.status_code)
+            if permit.overloaded:
+                cls.circuit_breaker.record_failure()
+            else:
+                cls.circuit_breaker.record_success()
+        finally:
+            cls._observe_state()
         return response
 
+    @classmethod
+    def _observe_state(cls):
+        circuit_open.set(cls.circuit_breaker.state != CircuitBreaker.STATE_CLOSED)
+        concurrency_limit.set(cls.concurrency_limiter.limit)
+        if (latency_ms := cls.concurrency_limiter.snapshot()["latency_ms"]) is not None:
+            latency_seconds.set(latency_ms / 1000)
+
+    @classmethod
+    def publish_state(cls):
+        """
+        Publishes the circuit state and concurrency limit of this process for the ``StatusView``.
+        Called by the update commands only.
+        """
+        cls.circuit_breaker.publish = True
+        cls.concurrency_limiter.publish = True
+
+    @staticmethod
+    def is_outage_status(status_code):
+        """
+        Returns: True if the status code indicates that the api is down or throttling
+        """
+        return status.is_server_error(status_code) or status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
     @classmethod
     def request_match(cls, match_id):
         return cls.request(cls._MATCH % match_id)
@@ -51,3 +126,4 @@ class PrimeLeagueAPI:
 
         """
         return cls.request(cls._TEAM % team_id, **kwargs)
+
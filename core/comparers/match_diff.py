@@ -0,0 +1,148 @@
+from typing import Any, Iterable, List, NamedTuple, Optional
+
+from app_prime_league.models import MatchEvent
+
+SNAPSHOT_VERSION = 1
+
+
+class MatchChange(NamedTuple):
+    kind: str
+    data: Any = None
+
+
+def _timestamp(value):
+    return None if value is None else int(value.timestamp())
+
+
+def _lineup_ids(lineup):
+    if lineup is None:
+        return None
+    return sorted(user_id for (user_id, *_) in lineup)
+
+
+def snapshot_from_temporary_match_data(tmd) -> dict:
+    """
+    Compact, json serializable representation of the parts of a match payload that trigger notifications.
+    Lineups are lists of player ids, comments are ``[comment_id, user_id]`` pairs.
+    """
+    return {
+        "v": SNAPSHOT_VERSION,
+        "enemy_team_id": tmd.enemy_team_id,
+        "team_made_latest_suggestion": tmd.team_made_latest_suggestion,
+        "match_begin_confirmed": bool(tmd.match_begin_confirmed),
+        "begin": _timestamp(tmd.begin),
+        "closed": tmd.closed,
+        "result": tmd.result,
+        "enemy_lineup": _lineup_ids(tmd.enemy_lineup),
+        "team_lineup": _lineup_ids(tmd.team_lineup),
+        "comments": sorted([x.comment_id, x.user_id] for x in tmd.comments),
+    }
+
+
+def snapshot_from_match(match) -> dict:
+    """
+    Builds the snapshot from the database state of a match. Only used for matches without a stored snapshot.
+    """
+    return {
+        "v": SNAPSHOT_VERSION,
+        "enemy_team_id": match.enemy_team_id,
+        "team_made_latest_suggestion": match.team_made_latest_suggestion,
+        "match_begin_confirmed": bool(match.match_begin_confirmed),
+        "begin": _timestamp(match.begin),
+        "closed": match.closed,
+        "result": match.result,
+        "enemy_lineup": sorted(match.enemy_lineup.values_list("id", flat=True)),
+        "team_lineup": sorted(match.team_lineup.values_list("id", flat=True)),
+        "comments": sorted(list(x) for x in match.comment_set.values_list("comment_id", "user_id")),
+    }
+
+
+def get_match_snapshot(match) -> dict:
+    """
+    Returns: The stored snapshot of the match, or a snapshot built from the database if none is stored or outdated
+    """
+    if match.snapshot and match.snapshot.get("v") == SNAPSHOT_VERSION:
+        return match.snapshot
+    return snapshot_from_match(match)
+
+
+class MatchDiff:
+    """
+    Structural diff of two match snapshots. Change detection is done in memory, no queries are made.
+    Changes are emitted in the order notifications should be sent.
+    """
+    NEW_ENEMY_TEAM = MatchEvent.Kinds.NEW_ENEMY_TEAM.value
+    NEW_ENEMY_SUGGESTION = MatchEvent.Kinds.NEW_ENEMY_SUGGESTION.value
+    NEW_TEAM_SUGGESTION = MatchEvent.Kinds.NEW_TEAM_SUGGESTION.value
+    SCHEDULING_CONFIRMED = MatchEvent.Kinds.SCHEDULING_CONFIRMED.value
+    NEW_ENEMY_LINEUP = MatchEvent.Kinds.NEW_ENEMY_LINEUP.value
+    NEW_TEAM_LINEUP = MatchEvent.Kinds.NEW_TEAM_LINEUP.value
+    NEW_COMMENTS = MatchEvent.Kinds.NEW_COMMENTS.value
+    MATCH_CLOSED = MatchEvent.Kinds.MATCH_CLOSED.value
+
+    def __init__(self, old: dict, new: dict, team_member_ids: Iterable[int] = ()):
+        """
+        Args:
+            old: Last accepted snapshot
+            new: Snapshot of the current payload
+            team_member_ids: Player ids of the team. Comments of team members do not count as new comments.
+        """
+        self.old = old
+        self.new = new
+        self.team_member_ids = set(team_member_ids)
+        self.changes: List[MatchChange] = list(self._diff())
+
+    def __contains__(self, kind):
+        return self.get(kind) is not None
+
+    def __iter__(self):
+        return iter(self.changes)
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    def get(self, kind) -> Optional[MatchChange]:
+        return next((x for x in self.changes if x.kind == kind), None)
+
+    def _diff(self):
+        old, new = self.old, self.new
+        if new["enemy_team_id"] != old["enemy_team_id"]:
+            yield MatchChange(self.NEW_ENEMY_TEAM, new["enemy_team_id"])
+        suggestion = new["team_made_latest_suggestion"]
+        if suggestion is not None and suggestion != old["team_made_latest_suggestion"]:
+            yield MatchChange(self.NEW_TEAM_SUGGESTION if suggestion else self.NEW_ENEMY_SUGGESTION)
+        if new["match_begin_confirmed"] and not old["match_begin_confirmed"]:
+            yield MatchChange(self.SCHEDULING_CONFIRMED, new["begin"])
+        if self._lineup_changed("enemy_lineup"):
+            yield MatchChange(self.NEW_ENEMY_LINEUP, new["enemy_lineup"])
+        if self._lineup_changed("team_lineup"):
+            yield MatchChange(self.NEW_TEAM_LINEUP, new["team_lineup"])
+        if comment_ids := self._new_comment_ids():
+            yield MatchChange(self.NEW_COMMENTS, comment_ids)
+        if new["closed"] and not old["closed"]:
+            yield MatchChange(self.MATCH_CLOSED, new["result"])
+
+    def _lineup_changed(self, key):
+        if self.new[key] is None:
+            return False
+        return not set(self.new[key]).issubset(self.old[key] or [])
+
+    def _new_comment_ids(self):
+        old_comment_ids = {comment_id for comment_id, _ in self.old["comments"]}
+        return sorted(
+            comment_id for comment_id, user_id in self.new["comments"]
+            if comment_id not in old_comment_ids and user_id not in self.team_member_ids
+        )
+
+    def accepted_snapshot(self) -> dict:
+        """
+        Returns: Snapshot to store after the changes were applied. Unavailable or unchanged lineups keep their last
+        accepted value and comments are accumulated, like the database state.
+        """
+        snapshot = dict(self.new)
+        for kind, key in ((self.NEW_ENEMY_LINEUP, "enemy_lineup"), (self.NEW_TEAM_LINEUP, "team_lineup")):
+            if kind not in self:
+                snapshot[key] = self.old[key]
+        comments = {comment_id: user_id for comment_id, user_id in self.old["comments"] + self.new["comments"]}
+        snapshot["comments"] = sorted([comment_id, user_id] for comment_id, user_id in comments.items())
+        return snapshot
@@ -0,0 +1,81 @@
+import copy
+import json
+import os
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from app_prime_league.models import Team
+from core.comparers.match_diff import MatchDiff, snapshot_from_temporary_match_data
+from core.processors.match_processor import MatchDataProcessor
+from core.temporary_match_data import TemporaryMatchData
+
+
+class MatchDiffFixtureTest(SimpleTestCase):
+    """
+    Diffs payloads of the ``storage`` fixtures. SimpleTestCase fails on any database query.
+    """
+    MATCH_ID = 936449
+    TEAM_ID = 168138
+    ENEMY_TEAM_ID = 90935
+
+    def setUp(self) -> None:
+        with open(os.path.join(settings.STORAGE_DIR, f"match_{self.MATCH_ID}.json"), "r", encoding="utf8") as f:
+            self.data = json.load(f)
+        self.team = Team(id=self.TEAM_ID)
+
+    def snapshot(self, data):
+        processor = MatchDataProcessor(self.MATCH_ID, self.TEAM_ID, data=data)
+        tmd = TemporaryMatchData.create_from_processor(team=self.team, match_id=self.MATCH_ID, processor=processor)
+        return snapshot_from_temporary_match_data(tmd)
+
+    def test_same_payload_has_no_changes(self):
+        snapshot = self.snapshot(self.data)
+        self.assertFalse(MatchDiff(snapshot, self.snapshot(copy.deepcopy(self.data))))
+
+    def test_snapshot_is_json_serializable(self):
+        snapshot = self.snapshot(self.data)
+        self.assertEqual(json.loads(json.dumps(snapshot)), snapshot)
+
+    def test_new_enemy_lineup(self):
+        data = copy.deepcopy(self.data)
+        data["lineups"] = [x for x in data["lineups"] if x["team_id"] != self.ENEMY_TEAM_ID]
+        old = self.snapshot(data)
+        diff = MatchDiff(old, self.snapshot(self.data))
+        self.assertEqual([x.kind for x in diff], [MatchDiff.NEW_ENEMY_LINEUP])
+
+    def test_missing_lineup_keeps_accepted_lineup(self):
+        data = copy.deepcopy(self.data)
+        data["lineups"] = []
+        old = self.snapshot(self.data)
+        diff = MatchDiff(old, self.snapshot(data))
+        self.assertNotIn(MatchDiff.NEW_ENEMY_LINEUP, diff)
+        self.assertEqual(diff.accepted_snapshot()["enemy_lineup"], old["enemy_lineup"])
+
+    def test_new_comments_ignore_team_members(self):
+        data = copy.deepcopy(self.data)
+        new_comments = data["comments"][-2:]
+        data["comments"] = data["comments"][:-2]
+        old = self.snapshot(data)
+        team_member_id = new_comments[0]["user_id"]
+        diff = MatchDiff(old, self.snapshot(self.data), team_member_ids=[team_member_id])
+        expected = [x["comment_id"] for x in new_comments if x["user_id"] != team_member_id]
+        self.assertEqual(diff.get(MatchDiff.NEW_COMMENTS).data, expected)
+        self.assertEqual(len(diff.accepted_snapshot()["comments"]), len(self.data["comments"]))
+
+    def test_enemy_suggestion_and_confirmation(self):
+        data = copy.deepcopy(self.data)
+        data["match"]["match_scheduling_time"] = 1656885540
+        data["match"]["match_scheduling_status"] = 2
+        data["match"]["match_scheduling_suggest_0"] = 1656522000
+        old = self.snapshot({**self.data, "match": {**self.data["match"], "match_scheduling_time": 1656885540}})
+        self.assertEqual([x.kind for x in MatchDiff(old, self.snapshot(data))], [MatchDiff.NEW_ENEMY_SUGGESTION])
+        diff = MatchDiff(self.snapshot(data), self.snapshot(self.data))
+        self.assertEqual([x.kind for x in diff], [MatchDiff.SCHEDULING_CONFIRMED])
+        self.assertEqual(diff.get(MatchDiff.SCHEDULING_CONFIRMED).data, 1656522000)
+
+    def test_new_enemy_team(self):
+        data = copy.deepcopy(self.data)
+        data["match"]["team_id_2"] = 0
+        diff = MatchDiff(self.snapshot(data), self.snapshot(self.data))
+        self.assertEqual(diff.get(MatchDiff.NEW_ENEMY_TEAM).data, self.ENEMY_TEAM_ID)
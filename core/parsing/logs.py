@@ -2,6 +2,7 @@ from utils.utils import timestamp_to_datetime, string_to_datetime
 
 
 class BaseLog:
+    __slots__ = ("timestamp", "user_id", "details",)
 
     def __init__(self, timestamp, user_id, details):
         self.timestamp = timestamp_to_datetime(timestamp)
@@ -11,34 +12,28 @@ class BaseLog:
     def __repr__(self):
         return f"{self.__class__.__name__} von {self.user_id} um {self.timestamp} === Details: {self.details}"
 
+    @staticmethod
+    def get_log_class(action):
+        """
+        Returns: Log class of the given log action without parsing anything, or None if the action is unknown
+        """
+        return LOG_ACTIONS.get(action, None)
+
     @staticmethod
     def return_specified_log(timestamp, user_id, action, details):
-        log_dict = {
-            "scheduling_suggest": LogSuggestion,
-            "scheduling_confirm": LogSchedulingConfirmation,
-            "lineup_submit": LogLineupSubmit,
-            "played": LogPlayed,
-            "scheduling_autoconfirm": LogSchedulingAutoConfirmation,
-            "disqualify": LogDisqualified,
-            "lineup_missing": LogLineupMissing,
-            "lineup_notready": LogLineupNotReady,
-            "change_time": LogChangeTime,
-            "change_status": LogChangeStatus,
-            "change_score": LogChangeScore,
-            "score_report": LogScoreReport,
-            "lineup_fail": LogLineupFail,
-            "change_score_status": LogChangeScoreStatus,
-        }
-        Log = log_dict.get(action, None)
+        Log = BaseLog.get_log_class(action)
         return None if not Log else Log(timestamp, user_id, details)
 
 
 class BaseMatchIsOverLog(BaseLog):
+    __slots__ = ()
+
     def __init__(self, timestamp, user_id, details):
         super().__init__(timestamp, user_id, details)
 
 
 class LogSuggestion(BaseLog):
+    __slots__ = ()
 
     def __init__(self, timestamp, user_id, details):
         super().__init__(timestamp, user_id, details)
@@ -46,6 +41,7 @@ class LogSuggestion(BaseLog):
 
 
 class LogSchedulingConfirmation(BaseLog):
+    __slots__ = ()
 
     def __init__(self, timestamp, user_id, details):
         super().__init__(timestamp, user_id, details)
@@ -53,42 +49,49 @@ class LogSchedulingConfirmation(BaseLog):
 
 
 class LogSchedulingAutoConfirmation(BaseLog):
+    __slots__ = ()
 
     def __init__(self, timestamp, user_id, details):
         super().__init__(timestamp, user_id, details)
 
 
 class LogPlayed(BaseMatchIsOverLog):
+    __slots__ = ()
 
     def __init__(self, timestamp, user_id, details):
         super().__init__(timestamp, user_id, details)
 
 
 class LogLineupMissing(BaseMatchIsOverLog):
+    __slots__ = ()
 
     def __init__(self, timestamp, user_id, details):
         super().__init__(timestamp, user_id, details)
 
 
 class LogLineupNotReady(BaseMatchIsOverLog):
+    __slots__ = ()
 
     def __init__(self, timestamp, user_id, details):
         super().__init__(timestamp, user_id, details)
 
 
 class LogDisqualified(BaseMatchIsOverLog):
+    __slots__ = ()
 
     def __init__(self, timestamp, user_id, details):
         super().__init__(timestamp, user_id, details)
 
 
 class LogLineupFail(BaseMatchIsOverLog):
+    __slots__ = ()
 
     def __init__(self, timestamp, user_id, details):
         super().__init__(timestamp, user_id, details)
 
 
 class LogChangeScoreStatus(BaseMatchIsOverLog):
+    __slots__ = ()
 
     def __init__(self, timestamp, user_id, details):
         super().__init__(timestamp, user_id, details)
@@ -100,6 +103,7 @@ class LogChangeStatus(BaseLog):
     """
     self.details can currently be "finished" (Stand 21.03.2021)
     """
+    __slots__ = ()
 
     def __init__(self, timestamp, user_id, details):
         super().__init__(timestamp, user_id, details)
@@ -111,6 +115,7 @@ class LogChangeScore(BaseLog):
     """
     Currently deprecated
     """
+    __slots__ = ()
 
     def __init__(self, timestamp, user_id, details):
         super().__init__(timestamp, user_id, details)
@@ -122,12 +127,14 @@ class LogScoreReport(BaseLog):
     """
     Currently deprecated
     """
+    __slots__ = ()
 
     def __init__(self, timestamp, user_id, details):
         super().__init__(timestamp, user_id, details)
 
 
 class LogLineupSubmit(BaseLog):
+    __slots__ = ()
 
     def __init__(self, timestamp, user_id, details):
         super().__init__(timestamp, user_id, details)
@@ -136,7 +143,27 @@ class LogLineupSubmit(BaseLog):
 
 
 class LogChangeTime(BaseLog):
+    __slots__ = ()
+
     def __init__(self, timestamp, user_id, details):
         super().__init__(timestamp, user_id, details)
         prefix = "Manually adjusted time to "
-        self.details = string_to_datetime(self.details[len(prefix):], timestamp_format="%Y-%m-%d %H:%M %z")
\ No newline at end of file
+        self.details = string_to_datetime(self.details[len(prefix):], timestamp_format="%Y-%m-%d %H:%M %z")
+
+
+LOG_ACTIONS = {
+    "scheduling_suggest": LogSuggestion,
+    "scheduling_confirm": LogSchedulingConfirmation,
+    "lineup_submit": LogLineupSubmit,
+    "played": LogPlayed,
+    "scheduling_autoconfirm": LogSchedulingAutoConfirmation,
+    "disqualify": LogDisqualified,
+    "lineup_missing": LogLineupMissing,
+    "lineup_notready": LogLineupNotReady,
+    "change_time": LogChangeTime,
+    "change_status": LogChangeStatus,
+    "change_score": LogChangeScore,
+    "score_report": LogScoreReport,
+    "lineup_fail": LogLineupFail,
+    "change_score_status": LogChangeScoreStatus,
+}
@@ -1,6 +1,7 @@
 from abc import abstractmethod
 
 from core.parsing.logs import BaseLog, LogSchedulingConfirmation, LogSchedulingAutoConfirmation, LogChangeTime
+from core.processors.team_processor import PlayerRecord
 from core.providers.prime_league import PrimeLeagueProvider
 from utils.utils import timestamp_to_datetime
 
@@ -65,17 +66,17 @@ class MatchDataProcessor(__MatchDataMethods, ):
     Converting json data to functions and providing these.
     """
 
-    def __init__(self, match_id: int, team_id: int, **kwargs):
+    def __init__(self, match_id: int, team_id: int, data: dict = None, **kwargs):
         """
         :raises PrimeLeagueConnectionException, PrimeLeagueParseException, Match404Exception
         :param match_id:
         :param team_id: team's point of view to the match. For example to determine enemy_team of the match.
+        :param data: optional already fetched match json. If None, the match is requested from the provider.
         """
-        self.data = PrimeLeagueProvider.get_match(match_id=match_id)
+        self.data = PrimeLeagueProvider.get_match(match_id=match_id) if data is None else data
         self.team_id = team_id
         self.team_is_team_1 = self.data_match.get("team_id_1") == team_id
-        self.logs = []
-        self.__parse_logs()
+        self.__parsed_logs = {}
 
     def has_side_choice(self):
         """
@@ -85,17 +86,31 @@ class MatchDataProcessor(__MatchDataMethods, ):
         """
         return self.team_is_team_1
 
-    def __parse_logs(self):
+    @property
+    def logs(self):
+        """
+        Returns: All known logs, newest first
+        """
+        return list(self.iter_logs())
+
+    def iter_logs(self, *log_classes):
+        """
+        Lazily parses the logs newest first. Logs are only parsed if their class matches one of ``log_classes`` (or
+        ``log_classes`` is empty) and are memoised per processor, so early exits avoid parsing older logs at all.
+        Args:
+            *log_classes: Optional log classes to filter for
+
+        Returns: Generator of logs
+        """
         logs = self.data.get("logs", [])
-        for i in reversed(logs):
-            log = BaseLog.return_specified_log(
-                timestamp=i.get("log_time"),
-                user_id=i.get("user_id"),
-                action=i.get("log_action"),
-                details=i.get("log_details"),
-            )
-            if log is not None:
-                self.logs.append(log)
+        for index in range(len(logs) - 1, -1, -1):
+            Log = BaseLog.get_log_class(logs[index].get("log_action"))
+            if Log is None or (log_classes and not issubclass(Log, log_classes)):
+                continue
+            if index not in self.__parsed_logs:
+                i = logs[index]
+                self.__parsed_logs[index] = Log(i.get("log_time"), i.get("user_id"), i.get("log_details"))
+            yield self.__parsed_logs[index]
 
     @property
     def data_match(self):
@@ -112,21 +127,21 @@ class MatchDataProcessor(__MatchDataMethods, ):
     def get_enemy_lineup(self):
         """
         (id_, name, summoner_name, None)
-        Returns: A list of enemy player tuples. Structure of tuple: (user_id, user_name, summoner_name, None)
+        Returns: A list of enemy ``PlayerRecord``s. Structure of tuple: (user_id, user_name, summoner_name, None)
 
         """
         lineup = self.data.get("lineups", [])
-        return [(x["user_id"], x["user_name"], x["account_value"], None) for x in lineup if
+        return [PlayerRecord(x["user_id"], x["user_name"], x["account_value"]) for x in lineup if
                 x["team_id"] != self.team_id]
 
     def get_team_lineup(self):
         """
         (id_, name, summoner_name, None)
-        Returns: A list of team player tuples. Structure of tuple: (user_id, user_name, summoner_name, None)
+        Returns: A list of team ``PlayerRecord``s. Structure of tuple: (user_id, user_name, summoner_name, None)
 
         """
         lineup = self.data.get("lineups", [])
-        return [(x["user_id"], x["user_name"], x["account_value"], None) for x in lineup if
+        return [PlayerRecord(x["user_id"], x["user_name"], x["account_value"]) for x in lineup if
                 x["team_id"] == self.team_id]
 
     def get_match_closed(self):
@@ -189,14 +204,11 @@ class MatchDataProcessor(__MatchDataMethods, ):
         """
         Returns: Return latest log if begin is set and a log exists, else None
         """
-        for log in self.logs:
-            if isinstance(log, (
-                    LogSchedulingConfirmation,
-                    LogSchedulingAutoConfirmation,
-                    LogChangeTime,
-            )):
-                return log
-        return None
+        return next(self.iter_logs(
+            LogSchedulingConfirmation,
+            LogSchedulingAutoConfirmation,
+            LogChangeTime,
+        ), None)
 
     def get_enemy_team_id(self):
         """
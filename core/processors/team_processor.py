@@ -1,8 +1,19 @@
 from abc import abstractmethod
+from typing import NamedTuple, Optional
 
 from core.providers.prime_league import PrimeLeagueProvider
 
 
+class PlayerRecord(NamedTuple):
+    """
+    Player of a team or of a lineup. Unpacks like the plain tuples used before: (id, name, summoner_name, is_leader)
+    """
+    id: int
+    name: str
+    summoner_name: str
+    is_leader: Optional[bool] = None
+
+
 class __TeamDataMethods:
 
     @abstractmethod
@@ -65,8 +76,8 @@ class TeamDataProcessor(__TeamDataMethods, ):
 
     def get_members(self):
         def _parse_member(x):
-            return x["user_id"], x["user_name"], x["account_value"], x["tu_status"] in [self.ROLE_LEADER,
-                                                                                        self.ROLE_CAPTAIN]
+            return PlayerRecord(x["user_id"], x["user_name"], x["account_value"],
+                                x["tu_status"] in [self.ROLE_LEADER, self.ROLE_CAPTAIN])
 
         members = [_parse_member(x) for x in self.data.get("members", [])]
         return members
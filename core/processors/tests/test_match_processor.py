@@ -1,5 +1,7 @@
+from datetime import datetime
 from unittest.mock import patch
 
+import pytz
 from django.test import TestCase
 
 from core.processors.match_processor import MatchDataProcessor
@@ -482,3 +484,37 @@ class LatestMatchBeginLogTest(TestCase):
         }
         processor = MatchDataProcessor(1, 100)
         self.assertEqual(processor.get_match_day(), 1)
+
+
+class LazyLogsTest(TestCase):
+    databases = []
+
+    @patch.object(PrimeLeagueProvider, 'get_match')
+    def test_latest_match_begin_log_parses_newest_only(self, get_match):
+        get_match.return_value = {
+            "logs": [
+                {
+                    "log_time": 1633266000,
+                    "user_id": 1,
+                    "log_action": "scheduling_confirm",
+                    "log_details": "unparsable, must not be parsed",
+                },
+                {
+                    "log_time": 1633266100,
+                    "user_id": 2,
+                    "log_action": "change_time",
+                    "log_details": "Manually adjusted time to 2021-10-03 17:00 +0000",
+                },
+                {
+                    "log_time": 1633266200,
+                    "user_id": 3,
+                    "log_action": "lineup_submit",
+                    "log_details": "unparsable, must not be parsed",
+                },
+            ]
+        }
+        processor = MatchDataProcessor(1, 1)
+        log = processor.get_latest_match_begin_log()
+        self.assertEqual(log.user_id, 2)
+        self.assertEqual(log.details, datetime(2021, 10, 3, 17, 0, tzinfo=pytz.utc))
+        self.assertIs(processor.get_latest_match_begin_log(), log, "Parsed logs should be memoised")
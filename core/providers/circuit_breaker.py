@@ -0,0 +1,156 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from django.core.cache import cache
+
+from utils.exceptions import PrimeLeagueCircuitOpenException
+
+update_logger = logging.getLogger("updates")
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker guarding calls to an external provider.
+
+    The breaker trips (``open``) after ``failure_threshold`` consecutive failures or if the error rate of the last
+    ``window_size`` calls exceeds ``error_rate_threshold``. While open, calls fail fast with
+    ``PrimeLeagueCircuitOpenException``. After ``recovery_timeout`` seconds the breaker is ``half_open`` and lets
+    ``half_open_max_calls`` probe requests through. A successful probe closes the breaker, a failed one opens it again.
+
+    If ``publish`` is set, every state change is written to the cache, so other processes (e.g. the ``StatusView``)
+    can display it. Only the update commands publish, so the breakers of the web process and the bots do not overwrite
+    their state.
+    """
+    STATE_CLOSED = "closed"
+    STATE_OPEN = "open"
+    STATE_HALF_OPEN = "half_open"
+
+    CACHE_KEY_PATTERN = "circuit_breaker_%s"
+    CACHE_DURATION = 60 * 60 * 24
+
+    def __init__(self, name, failure_threshold=5, error_rate_threshold=0.5, window_size=20, min_calls=10,
+                 recovery_timeout=30, half_open_max_calls=1, publish=False, clock=time.monotonic):
+        self.name = name
+        self.publish = publish
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_calls = min_calls
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.STATE_CLOSED
+        self._results = deque(maxlen=window_size)
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._half_open_calls = 0
+        self._rejected_calls = 0
+        self._changed_at = None
+
+    @property
+    def state(self):
+        with self._lock:
+            self._check_recovery_timeout()
+            return self._state
+
+    @property
+    def cache_key(self):
+        return self.CACHE_KEY_PATTERN % self.name
+
+    def before_call(self):
+        """
+        Must be called before each request.
+        Raises: PrimeLeagueCircuitOpenException if the breaker is open or no probe slot is available.
+        """
+        with self._lock:
+            self._check_recovery_timeout()
+            if self._state == self.STATE_CLOSED:
+                return
+            if self._state == self.STATE_HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return
+            self._rejected_calls += 1
+            retry_in = max(0.0, self._opened_at + self.recovery_timeout - self._clock())
+        raise PrimeLeagueCircuitOpenException(msg=f"Circuit '{self.name}' is open. Retry in {retry_in:.0f}s.")
+
+    def record_success(self):
+        with self._lock:
+            self._results.append(True)
+            self._consecutive_failures = 0
+            if self._state == self.STATE_HALF_OPEN:
+                self._transition(self.STATE_CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._results.append(False)
+            self._consecutive_failures += 1
+            if self._state == self.STATE_HALF_OPEN:
+                self._transition(self.STATE_OPEN)
+            elif self._state == self.STATE_CLOSED and self._should_trip():
+                self._transition(self.STATE_OPEN)
+
+    def reset(self):
+        with self._lock:
+            self._results.clear()
+            self._consecutive_failures = 0
+            self._rejected_calls = 0
+            self._transition(self.STATE_CLOSED)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._check_recovery_timeout()
+            return self._snapshot()
+
+    @classmethod
+    def cached_snapshot(cls, name):
+        """
+        Returns: Latest snapshot published by an update command or None
+        """
+        return cache.get(cls.CACHE_KEY_PATTERN % name)
+
+    def _should_trip(self):
+        if self._consecutive_failures >= self.failure_threshold:
+            return True
+        if len(self._results) < self.min_calls:
+            return False
+        return self._error_rate() >= self.error_rate_threshold
+
+    def _error_rate(self):
+        if not self._results:
+            return 0.0
+        return self._results.count(False) / len(self._results)
+
+    def _check_recovery_timeout(self):
+        if self._state == self.STATE_OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._transition(self.STATE_HALF_OPEN)
+
+    def _transition(self, state):
+        if state == self._state:
+            return
+        update_logger.warning(f"Circuit '{self.name}' changed from {self._state} to {state}.")
+        self._state = state
+        self._changed_at = time.time()
+        if state == self.STATE_OPEN:
+            self._opened_at = self._clock()
+        elif state == self.STATE_CLOSED:
+            self._opened_at = None
+        self._half_open_calls = 0
+        if state == self.STATE_CLOSED:
+            self._results.clear()
+        if not self.publish:
+            return
+        try:
+            cache.set(self.cache_key, self._snapshot(), self.CACHE_DURATION)
+        except Exception as e:
+            update_logger.exception(e)
+
+    def _snapshot(self):
+        return {
+            "state": self._state,
+            "consecutive_failures": self._consecutive_failures,
+            "error_rate": round(self._error_rate(), 2),
+            "rejected_calls": self._rejected_calls,
+            "changed_at": self._changed_at,
+        }
@@ -0,0 +1,140 @@
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+update_logger = logging.getLogger("updates")
+
+
+class _Permit:
+    """
+    Handed out by ``AdaptiveConcurrencyLimiter.acquire``. Set ``overloaded`` if the call was throttled or failed.
+    """
+
+    def __init__(self):
+        self.overloaded = False
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Thread-safe AIMD (additive increase, multiplicative decrease) limiter for concurrent calls to a provider.
+
+    Every successful call below ``latency_target`` seconds raises the limit by ``1 / limit``, so the limit grows by
+    about one per round of concurrent calls. An overloaded call (throttling, server errors, connection errors) or a
+    latency average above ``latency_target`` multiplies the limit by ``decrease_factor``. Decreases happen at most once
+    per ``decrease_cooldown`` seconds, so a single burst of failing in-flight calls does not collapse the limit.
+
+    If ``publish`` is set, the current limit and the observed latency are written to the cache, so they can be
+    inspected by other processes. Only the update commands publish, the limiters of the web process and the bots
+    would overwrite the snapshot with their rarely used ones.
+    """
+    CACHE_KEY_PATTERN = "concurrency_limiter_%s"
+    CACHE_DURATION = 60 * 60 * 24
+    CACHE_INTERVAL = 5
+
+    def __init__(self, name, initial_limit=8, min_limit=1, max_limit=32, latency_target=2.0, decrease_factor=0.5,
+                 decrease_cooldown=1.0, ewma_alpha=0.2, publish=False, clock=time.monotonic):
+        self.name = name
+        self.publish = publish
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.ewma_alpha = ewma_alpha
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._latency = None
+        self._last_decrease = None
+        self._last_cached = None
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def cache_key(self):
+        return self.CACHE_KEY_PATTERN % self.name
+
+    @contextmanager
+    def acquire(self):
+        """
+        Blocks until a slot below the current limit is free.
+        Usage:
+            with limiter.acquire() as permit:
+                response = ...
+                permit.overloaded = response.status_code == 429
+        """
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+        permit = _Permit()
+        start = self._clock()
+        try:
+            yield permit
+        except BaseException:
+            permit.overloaded = True
+            raise
+        finally:
+            self._release(latency=self._clock() - start, overloaded=permit.overloaded)
+
+    def snapshot(self) -> dict:
+        with self._condition:
+            return self._snapshot()
+
+    @classmethod
+    def cached_snapshot(cls, name):
+        """
+        Returns: Latest snapshot published by an update command or None
+        """
+        return cache.get(cls.CACHE_KEY_PATTERN % name)
+
+    def _release(self, latency, overloaded):
+        with self._condition:
+            self._in_flight -= 1
+            if self._latency is None:
+                self._latency = latency
+            else:
+                self._latency = self.ewma_alpha * latency + (1 - self.ewma_alpha) * self._latency
+
+            if overloaded or self._latency > self.latency_target:
+                self._decrease()
+            else:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._condition.notify_all()
+            self._cache_snapshot()
+
+    def _decrease(self):
+        now = self._clock()
+        if self._last_decrease is not None and now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        old_limit = self.limit
+        self._limit = max(self.min_limit, math.floor(self._limit * self.decrease_factor))
+        if self.limit != old_limit:
+            update_logger.info(f"Concurrency limit '{self.name}' decreased from {old_limit} to {self.limit}.")
+
+    def _cache_snapshot(self):
+        if not self.publish:
+            return
+        now = self._clock()
+        if self._last_cached is not None and now - self._last_cached < self.CACHE_INTERVAL:
+            return
+        self._last_cached = now
+        try:
+            cache.set(self.cache_key, self._snapshot(), self.CACHE_DURATION)
+        except Exception as e:
+            update_logger.exception(e)
+
+    def _snapshot(self):
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "latency_ms": None if self._latency is None else round(self._latency * 1000),
+        }
@@ -8,6 +8,7 @@ from core.api import PrimeLeagueAPI
 from utils.exceptions import (
     TeamWebsite404Exception, PrimeLeagueConnectionException, PrimeLeagueParseException,
     Match404Exception, UnauthorizedException)
+from utils.metrics import time_stage
 
 LOCAL = settings.FILES_FROM_STORAGE
 SAVE_REQUEST = settings.DEBUG and not LOCAL
@@ -42,7 +43,8 @@ class PrimeLeagueProvider:
         if LOCAL:
             return cls.__get_local_json(file_name)
 
-        resp = cls.api.request_match(match_id)
+        with time_stage("fetch"):
+            resp = cls.api.request_match(match_id)
 
         if not status.is_success(resp.status_code):
             if resp.status_code == status.HTTP_404_NOT_FOUND:
@@ -55,7 +57,8 @@ class PrimeLeagueProvider:
             cls.__save_object_to_file(resp.text, file_name)
 
         try:
-            return resp.json()
+            with time_stage("decode"):
+                return resp.json()
         except ValueError:
             raise PrimeLeagueParseException(msg=f"Match {match_id}")
 
@@ -72,7 +75,8 @@ class PrimeLeagueProvider:
             text_json = cls.__get_local_team_response(team_id)
             return text_json
 
-        resp = cls.api.request_team(team_id)
+        with time_stage("fetch"):
+            resp = cls.api.request_team(team_id)
         if not status.is_success(resp.status_code):
             if resp.status_code == status.HTTP_404_NOT_FOUND:
                 raise TeamWebsite404Exception(msg=f"Team {team_id}")
@@ -81,7 +85,8 @@ class PrimeLeagueProvider:
             raise PrimeLeagueConnectionException(status_code=resp.status_code, msg=f"Team {team_id}")
 
         try:
-            text_json = resp.json()
+            with time_stage("decode"):
+                text_json = resp.json()
             team_id = text_json.get("team").get("team_id")
             if team_id is None:
                 raise TeamWebsite404Exception(msg=f"Team {team_id}")
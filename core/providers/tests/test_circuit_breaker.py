@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+
+from core.providers.circuit_breaker import CircuitBreaker
+from utils.exceptions import PrimeLeagueCircuitOpenException, PrimeLeagueConnectionException
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(name="test", failure_threshold=3, error_rate_threshold=0.5, window_size=10,
+                                      min_calls=6, recovery_timeout=30, clock=self.clock)
+
+    def test_trips_on_consecutive_failures(self):
+        for _ in range(2):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.STATE_CLOSED)
+        self.breaker.before_call()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.STATE_OPEN)
+        with self.assertRaises(PrimeLeagueCircuitOpenException):
+            self.breaker.before_call()
+
+    def test_trips_on_error_rate(self):
+        for success in [True, False, True, False, True, False]:
+            self.breaker.before_call()
+            self.breaker.record_success() if success else self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.STATE_OPEN)
+
+    def test_error_rate_requires_min_calls(self):
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.STATE_CLOSED)
+
+    def test_half_open_probe_closes(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 31
+        self.assertEqual(self.breaker.state, CircuitBreaker.STATE_HALF_OPEN)
+        self.breaker.before_call()
+        with self.assertRaises(PrimeLeagueCircuitOpenException, msg="Only one probe is allowed"):
+            self.breaker.before_call()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.STATE_CLOSED)
+        self.breaker.before_call()
+
+    def test_half_open_probe_reopens(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 31
+        self.breaker.before_call()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.STATE_OPEN)
+        self.clock.now = 40
+        with self.assertRaises(PrimeLeagueCircuitOpenException):
+            self.breaker.before_call()
+
+    def test_open_exception_is_connection_exception(self):
+        self.assertTrue(issubclass(PrimeLeagueCircuitOpenException, PrimeLeagueConnectionException))
+
+    def test_publish(self):
+        cache = LocMemCache("test_circuit_breaker", {})
+        with mock.patch("core.providers.circuit_breaker.cache", cache):
+            for _ in range(3):
+                self.breaker.record_failure()
+            self.assertIsNone(CircuitBreaker.cached_snapshot("test"))
+            self.breaker.publish = True
+            self.breaker.reset()
+            self.assertEqual(CircuitBreaker.cached_snapshot("test")["state"], CircuitBreaker.STATE_CLOSED)
@@ -0,0 +1,77 @@
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+
+from core.providers.concurrency import AdaptiveConcurrencyLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class AdaptiveConcurrencyLimiterTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.limiter = AdaptiveConcurrencyLimiter(name="test", initial_limit=4, min_limit=1, max_limit=6,
+                                                  latency_target=2.0, decrease_cooldown=1.0, clock=self.clock)
+
+    def call(self, latency=0.1, overloaded=False):
+        with self.limiter.acquire() as permit:
+            self.clock.now += latency
+            permit.overloaded = overloaded
+
+    def test_additive_increase(self):
+        for _ in range(4):
+            self.call()
+        self.assertEqual(self.limiter.limit, 4)
+        self.call()
+        self.assertEqual(self.limiter.limit, 5, "Limit should grow by about one per round of calls")
+
+    def test_increase_is_capped(self):
+        for _ in range(100):
+            self.call()
+        self.assertEqual(self.limiter.limit, 6)
+
+    def test_multiplicative_decrease_on_overload(self):
+        self.call(overloaded=True)
+        self.assertEqual(self.limiter.limit, 2)
+
+    def test_decrease_cooldown(self):
+        self.call(overloaded=True)
+        self.call(overloaded=True)
+        self.assertEqual(self.limiter.limit, 2, "Second decrease within cooldown must be ignored")
+        self.clock.now += 1
+        self.call(overloaded=True)
+        self.assertEqual(self.limiter.limit, 1)
+        self.clock.now += 1
+        self.call(overloaded=True)
+        self.assertEqual(self.limiter.limit, 1, "Limit must not drop below min_limit")
+
+    def test_decrease_on_high_latency(self):
+        self.call(latency=5)
+        self.assertEqual(self.limiter.limit, 2)
+
+    def test_exception_counts_as_overload(self):
+        with self.assertRaises(ValueError):
+            with self.limiter.acquire():
+                raise ValueError()
+        self.assertEqual(self.limiter.limit, 2)
+        self.assertEqual(self.limiter.snapshot()["in_flight"], 0)
+
+    def test_snapshot(self):
+        self.call(latency=0.25)
+        self.assertDictEqual(self.limiter.snapshot(), {"limit": 4, "in_flight": 0, "latency_ms": 250})
+
+    def test_publish(self):
+        cache = LocMemCache("test_concurrency", {})
+        with mock.patch("core.providers.concurrency.cache", cache):
+            self.call()
+            self.assertIsNone(AdaptiveConcurrencyLimiter.cached_snapshot("test"))
+            self.limiter.publish = True
+            self.call(latency=0.25)
+            self.assertEqual(AdaptiveConcurrencyLimiter.cached_snapshot("test")["in_flight"], 0)
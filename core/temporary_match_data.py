@@ -1,22 +1,34 @@
-from dataclasses import dataclass, field
-
 from app_prime_league.models import Team
 from core.processors.match_processor import MatchDataProcessor
 from core.processors.team_processor import TeamDataProcessor
+from core.providers.prime_league import PrimeLeagueProvider
 from utils.exceptions import TeamWebsite404Exception
+from utils.metrics import time_stage
 from utils.utils import timestamp_to_datetime
 
 
-@dataclass
 class TemporaryComment:
-    comment_id: int
-    comment_parent_id: int
-    comment_time: int
-    user_id: int
-    comment_edit_user_id: int
-    comment_flag_staff: bool
-    comment_flag_official: bool
-    content: str = field(default="")
+    __slots__ = ("comment_id", "comment_parent_id", "comment_time", "user_id", "comment_edit_user_id",
+                 "comment_flag_staff", "comment_flag_official", "content",)
+
+    def __init__(self, comment_id: int, comment_parent_id: int, comment_time: int, user_id: int,
+                 comment_edit_user_id: int, comment_flag_staff: bool, comment_flag_official: bool, content: str = ""):
+        self.comment_id = comment_id
+        self.comment_parent_id = comment_parent_id
+        self.comment_time = comment_time
+        self.user_id = user_id
+        self.comment_edit_user_id = comment_edit_user_id
+        self.comment_flag_staff = comment_flag_staff
+        self.comment_flag_official = comment_flag_official
+        self.content = content
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, x) == getattr(other, x) for x in self.__slots__)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(comment_id={self.comment_id}, user_id={self.user_id})"
 
     def comment_as_dict(self):
         return {
@@ -35,6 +47,9 @@ class TemporaryComment:
 
 
 class TemporaryMatchData:
+    __slots__ = ("match_id", "match_day", "match_type", "team", "enemy_team_id", "enemy_team", "enemy_team_members",
+                 "enemy_lineup", "team_lineup", "closed", "result", "team_made_latest_suggestion", "latest_suggestions",
+                 "begin", "latest_confirmation_log", "match_begin_confirmed", "has_side_choice", "comments",)
 
     def __init__(self, match_id=None, match_day=None, match_type=None, team=None, enemy_team_id=None, enemy_team=None,
                  enemy_team_members=None, enemy_lineup=None, closed=None, result=None, team_made_latest_suggestion=None,
@@ -97,9 +112,20 @@ class TemporaryMatchData:
 
         """
 
-        gmd = TemporaryMatchData()
-        processor = MatchDataProcessor(match_id, team.id)
+        data = PrimeLeagueProvider.get_match(match_id=match_id)
+        with time_stage("process"):
+            processor = MatchDataProcessor(match_id, team.id, data=data)
+            gmd = TemporaryMatchData.create_from_processor(team=team, match_id=match_id, processor=processor)
+        if not Team.objects.filter(id=gmd.enemy_team_id).exists():
+            gmd.create_enemy_team_data_from_website()
+        return gmd
 
+    @staticmethod
+    def create_from_processor(team: Team, match_id, processor: MatchDataProcessor) -> "TemporaryMatchData":
+        """
+        Creates the match data of an already requested payload. Does not request the enemy team.
+        """
+        gmd = TemporaryMatchData()
         gmd.match_id = match_id
         gmd.match_day = processor.get_match_day()
         gmd.match_type = processor.get_match_type()
@@ -116,9 +142,6 @@ class TemporaryMatchData:
         gmd.result = processor.get_match_result()
         gmd.has_side_choice = processor.has_side_choice()
         gmd.comments = TemporaryMatchData.create_temporary_comments(processor.get_comments())
-
-        if not Team.objects.filter(id=gmd.enemy_team_id).exists():
-            gmd.create_enemy_team_data_from_website()
         return gmd
 
     def create_enemy_team_data_from_website(self):
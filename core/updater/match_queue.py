@@ -0,0 +1,91 @@
+import heapq
+from datetime import timedelta
+from typing import Iterable, List
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from app_prime_league.models import Match
+
+
+class MatchUpdateQueue:
+    """
+    Priority queue of matches for one update cycle. Matches are popped by urgency:
+
+    1. Matches that missed the time budget of the previous cycle
+    2. Matches beginning within ``IMMINENT_WINDOW`` (earliest first)
+    3. Unconfirmed matches with pending suggestions of the enemy team (lowest match day first)
+    4. Matches with new suggestions or comments within ``RECENT_WINDOW`` (most recent first)
+    5. All other matches
+    """
+    PRIORITY_CARRY_OVER = 0
+    PRIORITY_IMMINENT = 1
+    PRIORITY_PENDING_ENEMY_SUGGESTION = 2
+    PRIORITY_RECENTLY_CHANGED = 3
+    PRIORITY_DEFAULT = 4
+
+    IMMINENT_WINDOW = timedelta(hours=24)
+    RECENT_WINDOW = timedelta(hours=24)
+
+    CARRY_OVER_CACHE_KEY = "match_update_carry_over"
+    CARRY_OVER_CACHE_DURATION = 60 * 60 * 24
+
+    def __init__(self, matches: Iterable[Match], now=None, carried_over=None):
+        """
+        Args:
+            matches: Matches to update, annotated by ``MatchManager.get_matches_to_update``
+            now: Reference time, defaults to ``timezone.now()``
+            carried_over: Match ids (pk) which missed the previous time budget, defaults to the cached ids
+        """
+        self.now = now or timezone.now()
+        self.carried_over = set(self.load_carry_over() if carried_over is None else carried_over)
+        self._heap = []
+        for i, match in enumerate(matches):
+            heapq.heappush(self._heap, (self.priority(match), i, match))
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        while self._heap:
+            yield self.pop()
+
+    def pop(self) -> Match:
+        return heapq.heappop(self._heap)[-1]
+
+    def priority(self, match: Match) -> tuple:
+        """
+        Returns: Sortable tuple, lower values are more urgent
+        """
+        if match.id in self.carried_over:
+            return self.PRIORITY_CARRY_OVER, 0
+        if self._is_imminent(match):
+            return self.PRIORITY_IMMINENT, (match.begin - self.now).total_seconds()
+        if not match.match_begin_confirmed and match.team_made_latest_suggestion is False:
+            return self.PRIORITY_PENDING_ENEMY_SUGGESTION, match.match_day or 0
+        latest_change = self._latest_change(match)
+        if latest_change is not None and latest_change >= self.now - self.RECENT_WINDOW:
+            return self.PRIORITY_RECENTLY_CHANGED, (self.now - latest_change).total_seconds()
+        return self.PRIORITY_DEFAULT, 0
+
+    def _is_imminent(self, match: Match):
+        if match.closed or match.begin is None:
+            return False
+        return self.now - timedelta(hours=1) <= match.begin <= self.now + self.IMMINENT_WINDOW
+
+    @staticmethod
+    def _latest_change(match: Match):
+        changes = [
+            getattr(match, "latest_suggestion_at", None),
+            getattr(match, "latest_comment_at", None),
+        ]
+        changes = [x for x in changes if x is not None]
+        return max(changes) if changes else None
+
+    @classmethod
+    def load_carry_over(cls) -> List[int]:
+        return cache.get(cls.CARRY_OVER_CACHE_KEY) or []
+
+    @classmethod
+    def save_carry_over(cls, match_ids: List[int]):
+        cache.set(cls.CARRY_OVER_CACHE_KEY, list(match_ids), cls.CARRY_OVER_CACHE_DURATION)
@@ -1,11 +1,12 @@
 import concurrent.futures
 import logging
 import threading
+import time
 
 import requests
 from django.conf import settings
 
-from app_prime_league.models import Match, Team, Player
+from app_prime_league.models import Match, MatchEvent, Team, Player
 from bots.message_dispatcher import MessageDispatcher
 from bots.messages import (
     EnemyNewTimeSuggestionsNotificationMessage,
@@ -13,11 +14,13 @@ from bots.messages import (
     NewLineupNotificationMessage,
     NewCommentsNotificationMessage
 )
-from core.comparers.match_comparer import MatchComparer
+from core.comparers.match_diff import MatchChange, MatchDiff, get_match_snapshot, snapshot_from_temporary_match_data
 from core.processors.team_processor import TeamDataProcessor
 from core.temporary_match_data import TemporaryMatchData
-from utils.exceptions import Match404Exception
-from utils.messages_logger import log_exception
+from core.updater.run_stats import update_run
+from utils.exceptions import Match404Exception, PrimeLeagueCircuitOpenException
+from utils.messages_logger import log_exception, update_errors
+from utils.metrics import time_stage
 
 thread_local = threading.local()
 update_logger = logging.getLogger("updates")
@@ -40,16 +43,39 @@ def check_match(match: Match):
         match.delete()
         update_logger.info(f"Match deleted {e}")
         return
+    except PrimeLeagueCircuitOpenException as e:
+        update_logger.debug(f"Skipped {match_id=}: {e}")
+        update_run.record_skipped()
+        return
     except Exception as e:
         update_logger.exception(e)
+        update_errors.record(e, context=f"{match_id=}")
+        update_run.record_failure(e)
         return
 
-    cmp = MatchComparer(match, tmd)
-    # TODO: Nice to have: Eventuell nach einem comparing und updaten mit match.refresh_from_db() arbeiten
-    log_message = f"New notification for {match_id=} ({team=}): "
+    with time_stage("compare"):
+        diff = MatchDiff(
+            old=get_match_snapshot(match),
+            new=snapshot_from_temporary_match_data(tmd),
+            team_member_ids=[x.id for x in team.player_set.all()],
+        )
     update_logger.info(f"Checking {match_id=} ({team=})...")
+    for change in diff:
+        apply_match_change(match, tmd, change)
+    with time_stage("write"):
+        match.update_match_data(tmd, snapshot=diff.accepted_snapshot())
+        MatchEvent.objects.record(match, diff.changes)
+
+
+def apply_match_change(match: Match, tmd: TemporaryMatchData, change: MatchChange):
+    """
+    Updates the match according to the change and notifies the team.
+    """
+    match_id = match.match_id
+    team = match.team
+    log_message = f"New notification for {match_id=} ({team=}): "
     dispatcher = MessageDispatcher(team)
-    if cmp.compare_new_enemy_team():
+    if change.kind == MatchDiff.NEW_ENEMY_TEAM:
         processor = TeamDataProcessor(team_id=tmd.enemy_team_id)
         enemy_team, created = Team.objects.update_or_create(id=tmd.enemy_team_id, defaults={
             "name": processor.get_team_name(),
@@ -59,39 +85,59 @@ def check_match(match: Match):
         match.enemy_team = enemy_team
         Player.objects.remove_old_player_relations(processor.get_members(), team)
         Player.objects.create_or_update_players(processor.get_members(), enemy_team)
-
-    if cmp.compare_new_suggestion(of_enemy_team=True):
+    elif change.kind == MatchDiff.NEW_ENEMY_SUGGESTION:
         notifications_logger.info(f"{log_message}Neuer Terminvorschlag der Gegner")
         match.update_latest_suggestions(tmd)
         dispatcher.dispatch(EnemyNewTimeSuggestionsNotificationMessage, match=match)
-    if cmp.compare_new_suggestion():
+    elif change.kind == MatchDiff.NEW_TEAM_SUGGESTION:
         notifications_logger.info(f"{log_message}Eigener neuer Terminvorschlag")
         match.update_latest_suggestions(tmd)
         dispatcher.dispatch(OwnNewTimeSuggestionsNotificationMessage, match=match)
-    if cmp.compare_scheduling_confirmation():
+    elif change.kind == MatchDiff.SCHEDULING_CONFIRMED:
         notifications_logger.info(f"{log_message}Termin wurde festgelegt")
         match.update_match_begin(tmd)
         dispatcher.dispatch(ScheduleConfirmationNotification, match=match,
                             latest_confirmation_log=tmd.latest_confirmation_log)
-    if cmp.compare_lineup_confirmation(of_enemy_team=True):
+    elif change.kind == MatchDiff.NEW_ENEMY_LINEUP:
         notifications_logger.info(f"{log_message}Neues Lineup des gegnerischen Teams")
         match.update_enemy_lineup(tmd)
         dispatcher.dispatch(NewLineupNotificationMessage, match=match)
-    if cmp.compare_lineup_confirmation(of_enemy_team=False):
+    elif change.kind == MatchDiff.NEW_TEAM_LINEUP:
         notifications_logger.info(f"Silenced notification for {match_id=} ({team=}): Neues eigenes Lineup")
         match.update_team_lineup(tmd)
-    if comment_ids := cmp.compare_new_comments():
-        notifications_logger.info(f"{log_message}Neue Kommentare: {comment_ids}")
+    elif change.kind == MatchDiff.NEW_COMMENTS:
+        notifications_logger.info(f"{log_message}Neue Kommentare: {change.data}")
         match.update_comments(tmd)
-        dispatcher.dispatch(NewCommentsNotificationMessage, match=match, new_comment_ids=comment_ids)
+        dispatcher.dispatch(NewCommentsNotificationMessage, match=match, new_comment_ids=change.data)
+
+
+def update_uncompleted_matches(matches, use_concurrency=not settings.DEBUG, time_budget=None):
+    """
+    Checks the given matches in iteration order.
+    Args:
+        matches: Iterable of matches, usually a ``MatchUpdateQueue``
+        use_concurrency:
+        time_budget: Optional seconds. Matches which were not started within the budget are skipped.
 
-    match.update_match_data(tmd)
+    Returns: List of match ids (pk) which missed the time budget
+    """
+    deadline = time.monotonic() + time_budget if time_budget else None
+    missed = []
+    lock = threading.Lock()
 
+    def _check_within_budget(match):
+        if deadline is not None and time.monotonic() > deadline:
+            with lock:
+                missed.append(match.id)
+            update_run.record_skipped()
+            return
+        with update_run.track():
+            check_match(match)
 
-def update_uncompleted_matches(matches, use_concurrency=not settings.DEBUG):
     if use_concurrency:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-            executor.map(check_match, matches)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=settings.PRIME_LEAGUE_CONCURRENCY_MAX) as executor:
+            executor.map(_check_within_budget, matches)
     else:
         for i in matches:
-            check_match(match=i)
+            _check_within_budget(i)
+    return missed
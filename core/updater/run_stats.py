@@ -0,0 +1,149 @@
+import math
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from app_prime_league.models import UpdateRun
+
+
+class _Item:
+    __slots__ = ("skipped", "failed", "queries")
+
+    def __init__(self):
+        self.skipped = False
+        self.failed = False
+        self.queries = 0
+
+
+def percentile(values, p) -> Optional[float]:
+    """
+    Nearest-rank percentile of ``values`` (0 < p <= 100), None if empty.
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+class UpdateRunRecorder:
+    """
+    Thread-safe statistics of the update run of this process, saved as ``UpdateRun``. Every checked match or team is
+    wrapped in ``track``, which measures its latency and counts the queries of the calling thread.
+    Outside a run (between ``finish`` and ``start``) all calls are ignored, e.g. notifications sent by registrations.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.run: Optional[UpdateRun] = None
+        self._reset()
+
+    @property
+    def active(self):
+        return self.run is not None
+
+    def start(self, command) -> UpdateRun:
+        with self._lock:
+            self._reset()
+            self.run = UpdateRun.objects.create(command=command, started_at=timezone.now())
+        return self.run
+
+    @contextmanager
+    def track(self):
+        """
+        Tracks one match or team. Items marked by ``record_skipped`` are counted as skipped instead of checked, items
+        marked by ``record_failure`` are only counted in the fetch failures. Neither is included in the latencies.
+        """
+        if not self.active:
+            yield
+            return
+        item = _Item()
+
+        def count_queries(execute, sql, params, many, context):
+            item.queries += 1
+            return execute(sql, params, many, context)
+
+        self._local.item = item
+        start = self._clock()
+        try:
+            with connection.execute_wrapper(count_queries):
+                yield
+        finally:
+            latency = self._clock() - start
+            self._local.item = None
+            with self._lock:
+                self._queries += item.queries
+                if item.skipped:
+                    self._skipped += 1
+                elif not item.failed:
+                    self._latencies.append(latency)
+
+    def record_skipped(self):
+        """
+        Marks the tracked item of the calling thread as skipped, or counts an item which was not tracked at all.
+        """
+        if not self.active:
+            return
+        item = getattr(self._local, "item", None)
+        if item is not None:
+            item.skipped = True
+            return
+        with self._lock:
+            self._skipped += 1
+
+    def record_failure(self, e: Exception):
+        """
+        Counts a failed fetch by exception type and marks the tracked item of the calling thread as not checked.
+        """
+        if not self.active:
+            return
+        item = getattr(self._local, "item", None)
+        if item is not None:
+            item.failed = True
+        with self._lock:
+            self._failures[type(e).__name__] += 1
+
+    def record_notification(self, msg_class):
+        if not self.active:
+            return
+        with self._lock:
+            self._notifications[msg_class.__name__] += 1
+
+    def finish(self) -> Optional[UpdateRun]:
+        """
+        Saves the statistics, deletes runs older than ``UPDATE_RUN_RETENTION_DAYS`` and ends the run.
+        Returns: The finished run
+        """
+        with self._lock:
+            run, self.run = self.run, None
+            if run is None:
+                return None
+            run.finished_at = timezone.now()
+            run.checked = len(self._latencies)
+            run.skipped = self._skipped
+            run.fetch_failures = dict(self._failures)
+            run.notifications = dict(self._notifications)
+            run.queries = self._queries
+            run.latency_p50 = percentile(self._latencies, 50)
+            run.latency_p95 = percentile(self._latencies, 95)
+            self._reset()
+        run.save()
+        UpdateRun.objects.prune(days=settings.UPDATE_RUN_RETENTION_DAYS)
+        return run
+
+    def _reset(self):
+        self._latencies = []
+        self._skipped = 0
+        self._queries = 0
+        self._failures = Counter()
+        self._notifications = Counter()
+
+
+update_run = UpdateRunRecorder()
@@ -1,8 +1,6 @@
 import concurrent.futures
 import logging
-import sys
 import threading
-import traceback
 
 from django.conf import settings
 
@@ -10,10 +8,11 @@ from app_prime_league.models import Team, Player
 from app_prime_league.teams import create_matches
 from bots.message_dispatcher import MessageDispatcher
 from bots.messages import MatchesOverview
-from bots.telegram_interface.tg_singleton import send_message_to_devs
 from core.processors.team_processor import TeamDataProcessor
 from core.comparers.team_comparer import TeamComparer
-from utils.messages_logger import log_exception
+from core.updater.run_stats import update_run
+from utils.exceptions import PrimeLeagueCircuitOpenException
+from utils.messages_logger import log_exception, update_errors
 
 thread_local = threading.local()
 update_logger = logging.getLogger("updates")
@@ -24,8 +23,14 @@ notifications_logger = logging.getLogger("notifications")
 def update_team(team: Team):
     try:
         processor = TeamDataProcessor(team.id)
+    except PrimeLeagueCircuitOpenException as e:
+        update_logger.debug(f"Skipped {team}: {e}")
+        update_run.record_skipped()
+        return
     except Exception as e:
         update_logger.exception(e)
+        update_errors.record(e, context=team)
+        update_run.record_failure(e)
         return
 
     to_update = {
@@ -62,18 +67,20 @@ def update_team(team: Team):
             dispatcher.dispatch(MatchesOverview, match_ids=missing_ids)
 
     except Exception as e:
-        trace = "".join(traceback.format_tb(sys.exc_info()[2]))
-        send_message_to_devs(
-            msg=f"Ein Fehler ist beim Updaten der Matches von  Team {team.id} {team.name} aufgetreten:"
-                f"\n<code>{trace}\n{e}</code>", )
         update_logger.exception(e)
+        update_errors.record(e, context=team)
     return team
 
 
+def _update_tracked_team(team: Team):
+    with update_run.track():
+        update_team(team)
+
+
 def update_teams(teams, use_concurrency=not settings.DEBUG):
     if use_concurrency:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            executor.map(update_team, teams)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=settings.PRIME_LEAGUE_CONCURRENCY_MAX) as executor:
+            executor.map(_update_tracked_team, teams)
     else:
         for i in teams:
-            update_team(team=i)
+            _update_tracked_team(team=i)
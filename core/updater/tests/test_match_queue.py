@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from app_prime_league.models import Match, Team, Suggestion
+from core.updater.match_queue import MatchUpdateQueue
+from core.updater.matches_check_executor import update_uncompleted_matches
+
+
+class MatchUpdateQueueTest(TestCase):
+    def setUp(self) -> None:
+        self.now = timezone.now()
+        self.team = Team.objects.create(id=1, name="Team 1", team_tag="T1")
+        self.default = self.create_match(1, begin=self.now + timedelta(days=5), match_begin_confirmed=True)
+        self.recently_changed = self.create_match(2, match_begin_confirmed=True)
+        Suggestion.objects.create(match=self.recently_changed, begin=self.now + timedelta(days=3))
+        self.enemy_suggestion = self.create_match(3, team_made_latest_suggestion=False)
+        self.later = self.create_match(4, begin=self.now + timedelta(hours=20), match_begin_confirmed=True)
+        self.imminent = self.create_match(5, begin=self.now + timedelta(minutes=30), match_begin_confirmed=True)
+        self.closed = self.create_match(6, begin=self.now - timedelta(minutes=30), closed=True)
+
+    def create_match(self, match_id, **kwargs):
+        return Match.objects.create(match_id=match_id, match_day=1, match_type=Match.MATCH_TYPE_LEAGUE,
+                                    team=self.team, has_side_choice=True, **kwargs)
+
+    def queued_match_ids(self, **kwargs):
+        queue = MatchUpdateQueue(Match.objects.get_matches_to_update(), now=self.now, **kwargs)
+        return [x.match_id for x in queue]
+
+    def test_order(self):
+        self.assertListEqual(self.queued_match_ids(carried_over=[]), [5, 4, 3, 2, 1, 6])
+
+    def test_carry_over_first(self):
+        self.assertListEqual(self.queued_match_ids(carried_over=[self.default.id]), [1, 5, 4, 3, 2, 6])
+
+    def test_time_budget_misses(self):
+        queue = MatchUpdateQueue(Match.objects.none(), now=self.now, carried_over=[])
+        self.assertListEqual(update_uncompleted_matches(queue, use_concurrency=False, time_budget=1), [])
+
+        missed = update_uncompleted_matches([self.default, self.imminent], use_concurrency=False, time_budget=-1)
+        self.assertListEqual(missed, [self.default.id, self.imminent.id])
@@ -0,0 +1,75 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from app_prime_league.models import Match, Team, UpdateRun
+from bots.messages import MatchesOverview
+from core.updater.matches_check_executor import update_uncompleted_matches
+from core.updater.run_stats import UpdateRunRecorder, percentile
+from utils.exceptions import PrimeLeagueConnectionException
+
+
+class UpdateRunRecorderTest(TestCase):
+    def setUp(self) -> None:
+        self.team = Team.objects.create(id=1, name="Team 1", team_tag="T1")
+        self.matches = [
+            Match.objects.create(match_id=i, match_day=1, match_type=Match.MATCH_TYPE_LEAGUE, team=self.team,
+                                 has_side_choice=True)
+            for i in range(1, 4)
+        ]
+        self.clock = mock.Mock(side_effect=[float(x) for x in range(100)])
+        self.recorder = UpdateRunRecorder(clock=self.clock)
+        patcher = mock.patch("core.updater.matches_check_executor.update_run", self.recorder)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_percentile(self):
+        self.assertIsNone(percentile([], 50))
+        self.assertEqual(percentile([3, 1, 2], 50), 2)
+        self.assertEqual(percentile(list(range(1, 101)), 95), 95)
+
+    def test_calls_outside_of_a_run_are_ignored(self):
+        with self.recorder.track():
+            self.recorder.record_skipped()
+            self.recorder.record_failure(ValueError())
+            self.recorder.record_notification(MatchesOverview)
+        self.assertIsNone(self.recorder.finish())
+        self.assertFalse(UpdateRun.objects.exists())
+
+    def test_run(self):
+        def check_match(match):
+            Team.objects.filter(id=match.team_id).exists()
+            if match.match_id == 1:
+                self.recorder.record_notification(MatchesOverview)
+            elif match.match_id == 2:
+                self.recorder.record_failure(PrimeLeagueConnectionException())
+            else:
+                self.recorder.record_skipped()
+
+        run = self.recorder.start(UpdateRun.Commands.UPDATE_MATCHES)
+        self.assertIsNone(UpdateRun.objects.get().finished_at)
+        with mock.patch("core.updater.matches_check_executor.check_match", side_effect=check_match):
+            update_uncompleted_matches(self.matches, use_concurrency=False)
+        self.recorder.record_skipped()
+        self.recorder.finish()
+
+        run.refresh_from_db()
+        self.assertIsNotNone(run.finished_at)
+        self.assertEqual(run.checked, 1)
+        self.assertEqual(run.skipped, 2)
+        self.assertEqual(run.queries, 3)
+        self.assertEqual(run.fetch_failures, {"PrimeLeagueConnectionException": 1})
+        self.assertEqual(run.notifications, {"MatchesOverview": 1})
+        self.assertEqual((run.latency_p50, run.latency_p95), (1.0, 1.0))
+        self.assertFalse(self.recorder.active)
+
+    @override_settings(UPDATE_RUN_RETENTION_DAYS=30)
+    def test_old_runs_are_pruned(self):
+        now = timezone.now()
+        UpdateRun.objects.create(command=UpdateRun.Commands.UPDATE_TEAMS, started_at=now - timedelta(days=31))
+        recent = UpdateRun.objects.create(command=UpdateRun.Commands.UPDATE_TEAMS, started_at=now - timedelta(days=29))
+        run = self.recorder.start(UpdateRun.Commands.UPDATE_TEAMS)
+        self.recorder.finish()
+        self.assertCountEqual(UpdateRun.objects.values_list("id", flat=True), [recent.id, run.id])
@@ -2,6 +2,7 @@
 ASGI config for primebot_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Requests to ``settings.EVENT_STREAM_PATH`` are served by the match event stream, all others by django.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
@@ -9,8 +10,26 @@ https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'primebot_backend.settings')
 
-application = get_asgi_application()
+django.setup(set_prefix=False)
+
+from django.conf import settings  # noqa: E402 Apps must be loaded first
+
+from app_api.common.asgi import ASGIHandler  # noqa: E402
+from app_api.modules.events.stream import EventStreamRouter, MatchEventBroadcaster, MatchEventStream  # noqa: E402
+
+# Pulls streaming responses (e.g. the export) outside the event loop, unlike ``get_asgi_application()``
+django_application = ASGIHandler()
+
+application = EventStreamRouter(
+    django_application=django_application,
+    stream_application=MatchEventStream(
+        broadcaster=MatchEventBroadcaster(poll_interval=settings.EVENT_STREAM_POLL_INTERVAL),
+        heartbeat_interval=settings.EVENT_STREAM_HEARTBEAT_INTERVAL,
+        max_connections=settings.EVENT_STREAM_MAX_CONNECTIONS,
+        max_connections_per_client=settings.EVENT_STREAM_MAX_CONNECTIONS_PER_CLIENT,
+    ),
+)
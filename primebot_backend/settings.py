@@ -66,6 +66,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.security.SecurityMiddleware',
+    'app_api.common.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -119,6 +120,7 @@ DATABASES = {
         }
     }
 }
+DB_CONNECTION_IDLE_TIMEOUT = env.int("DB_CONNECTION_IDLE_TIMEOUT", 60)  # seconds, idle bot connections are pinged
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -168,6 +170,13 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = env.str("MEDIA_ROOT", None)
 
 GAME_SPORTS_BASE_URL = env.str("GAME_SPORTS_BASE_URL", None)
+PRIME_LEAGUE_CIRCUIT_FAILURE_THRESHOLD = env.int("PRIME_LEAGUE_CIRCUIT_FAILURE_THRESHOLD", 5)
+PRIME_LEAGUE_CIRCUIT_ERROR_RATE_THRESHOLD = env.float("PRIME_LEAGUE_CIRCUIT_ERROR_RATE_THRESHOLD", 0.5)
+PRIME_LEAGUE_CIRCUIT_RECOVERY_TIMEOUT = env.int("PRIME_LEAGUE_CIRCUIT_RECOVERY_TIMEOUT", 30)  # seconds
+PRIME_LEAGUE_CONCURRENCY_INITIAL = env.int("PRIME_LEAGUE_CONCURRENCY_INITIAL", 8)
+PRIME_LEAGUE_CONCURRENCY_MIN = env.int("PRIME_LEAGUE_CONCURRENCY_MIN", 1)
+PRIME_LEAGUE_CONCURRENCY_MAX = env.int("PRIME_LEAGUE_CONCURRENCY_MAX", 16)  # also the number of worker threads
+PRIME_LEAGUE_LATENCY_TARGET = env.float("PRIME_LEAGUE_LATENCY_TARGET", 2.0)  # seconds
 
 MATCH_URI = "https://www.primeleague.gg/de/leagues/matches/"
 TEAM_URI = "https://www.primeleague.gg/de/leagues/teams/"
@@ -180,11 +189,15 @@ STORAGE_DIR = os.path.join(BASE_DIR, "storage", )
 TELEGRAM_BOT_KEY = env.str("TELEGRAM_BOT_API_KEY", None)
 TG_DEVELOPER_GROUP = env.int("TG_DEVELOPER_GROUP", None)
 TELEGRAM_START_LINK = "https://t.me/prime_league_bot?startgroup=start"
+DEVELOPER_LOG_FLUSH_INTERVAL = env.float("DEVELOPER_LOG_FLUSH_INTERVAL", 10.0)  # seconds, logs are sent in batches
+DEVELOPER_LOG_MAX_QUEUE_SIZE = env.int("DEVELOPER_LOG_MAX_QUEUE_SIZE", 1000)
 
 DISCORD_BOT_KEY = env.str("DISCORD_API_KEY", None)
 DISCORD_APP_CLIENT_ID = env.int("DISCORD_APP_CLIENT_ID", None)
 DISCORD_SERVER_LINK = "https://discord.gg/K8bYxJMDzu"
 DISCORD_GUILD_ID = env.int("DISCORD_GUILD_ID", None)  # Only used for development
+DISCORD_DB_WORKERS = env.int("DISCORD_DB_WORKERS", 8)  # threads (and database connections) for ORM access of the bot
+DISCORD_TEAM_REGISTRY_TTL = env.int("DISCORD_TEAM_REGISTRY_TTL", 300)  # seconds until queryset updates apply
 
 LOGIN_URL = "/admin/login/"
 
@@ -203,6 +216,24 @@ DEFAULT_SCOUTING_SEP = ","
 
 TEMP_LINK_TIMEOUT_MINUTES = 60
 
+REGISTRATION_BACKFILL_WORKERS = env.int("REGISTRATION_BACKFILL_WORKERS", 2)  # concurrent match backfills of new teams
+
+MATCH_UPDATE_TIME_BUDGET = env.int("MATCH_UPDATE_TIME_BUDGET", 600)  # seconds, 0 disables the budget
+UPDATE_RUN_RETENTION_DAYS = env.int("UPDATE_RUN_RETENTION_DAYS", 90)  # statistics of older update runs are deleted
+
+MATCH_EVENT_SETTLE_TIME = env.float("MATCH_EVENT_SETTLE_TIME", 5.0)  # seconds, newer events are hidden from cursors
+EVENT_STREAM_PATH = "/api/events/stream/"
+EVENT_STREAM_POLL_INTERVAL = env.float("EVENT_STREAM_POLL_INTERVAL", 1.0)  # seconds, one query for all clients
+EVENT_STREAM_HEARTBEAT_INTERVAL = env.float("EVENT_STREAM_HEARTBEAT_INTERVAL", 15.0)  # seconds
+EVENT_STREAM_MAX_CONNECTIONS = env.int("EVENT_STREAM_MAX_CONNECTIONS", 1000)  # open streams of all clients
+EVENT_STREAM_MAX_CONNECTIONS_PER_CLIENT = env.int("EVENT_STREAM_MAX_CONNECTIONS_PER_CLIENT", 5)
+
+METRICS_TEXTFILE_DIR = env.str("METRICS_TEXTFILE_DIR", None)  # node exporter textfile collector of commands and bots
+METRICS_EXPORT_INTERVAL = env.int("METRICS_EXPORT_INTERVAL", 60)  # seconds between textfile writes of the bots
+METRICS_TOKEN = env.str("METRICS_TOKEN", None)  # bearer token of /api/metrics/, unset denies every request
+
+STATUS_REFRESH_INTERVAL = env.int("STATUS_REFRESH_INTERVAL", 60)  # seconds, older status snapshots are revalidated
+
 FILES_FROM_STORAGE = env.bool("FILES_FROM_STORAGE", False)
 
 CACHES = {
@@ -219,7 +250,18 @@ LOCALE_PATHS = [
     BASE_DIR / "app_prime_league" / "locale",
 ]
 
+LOG_FORMAT = env.str("LOG_FORMAT", "text")  # "text" or "json" (one json object per line)
+LOG_QUEUE = env.bool("LOG_QUEUE", False)  # write log files from a listener thread per logger, pays off on slow disks
+LOG_QUEUE_SIZE = env.int("LOG_QUEUE_SIZE", 10000)  # records per logger waiting to be written, newer ones are dropped
+
 if not DEBUG:
+    # Every logger writes to its own file. With LOG_QUEUE, loggers only enqueue records and a listener thread per
+    # logger formats and writes them. That only pays off if disk writes block, with writes to the page cache the queue
+    # costs more than it saves (scripts/benchmark_logging.py). Handlers are configured alphabetically, so the queues
+    # come after the files.
+    LOGGERS = ('django', 'notifications', 'commands', 'updates', 'discord')
+    LOG_FILE_FORMATTER = 'json' if LOG_FORMAT == 'json' else 'to_file'
+    LOG_HANDLER = 'queue_%s' if LOG_QUEUE else 'file_%s'
     LOGGING = {
         'version': 1,
         'disable_existing_loggers': False,
@@ -231,6 +273,9 @@ if not DEBUG:
             'to_console': {
                 'format': '[%(levelname)s] %(name)s: %(message)s'
             },
+            'json': {
+                '()': 'utils.log_handlers.JSONFormatter',
+            },
         },
         'handlers': {
             'console': {
@@ -238,74 +283,92 @@ if not DEBUG:
                 'formatter': 'to_console',
                 'class': 'logging.StreamHandler',
             },
-            'django': {
+            'file_django': {
                 'level': "INFO",
                 'class': 'logging.handlers.WatchedFileHandler',
                 'filename': os.path.join(LOGGING_DIR, 'django.log'),
-                'formatter': 'to_file',
+                'formatter': LOG_FILE_FORMATTER,
             },
-            'notifications': {
+            'file_notifications': {
                 'level': 'INFO',
                 'class': 'logging.handlers.WatchedFileHandler',
                 'filename': os.path.join(LOGGING_DIR, 'notifications.log'),
-                'formatter': 'to_file',
+                'formatter': LOG_FILE_FORMATTER,
             },
-            'commands': {
+            'file_commands': {
                 'level': 'INFO',
                 'class': 'logging.handlers.WatchedFileHandler',
                 'filename': os.path.join(LOGGING_DIR, 'commands.log'),
-                'formatter': 'to_file',
+                'formatter': LOG_FILE_FORMATTER,
             },
-            'updates': {
+            'file_updates': {
                 'level': "INFO",
                 'class': 'logging.handlers.TimedRotatingFileHandler',
                 'filename': os.path.join(LOGGING_DIR, 'updates.log'),
                 'when': 'midnight',
-                'formatter': 'to_file',
+                'formatter': LOG_FILE_FORMATTER,
             },
-            'discord': {
+            'file_discord': {
                 'level': "INFO",
                 'class': 'logging.handlers.TimedRotatingFileHandler',
                 'filename': os.path.join(LOGGING_DIR, 'discord.log'),
                 'when': 'midnight',
-                'formatter': 'to_file',
+                'formatter': LOG_FILE_FORMATTER,
+            },
+            **{
+                f'queue_{name}': {
+                    'level': "INFO",
+                    '()': 'utils.log_handlers.QueueListenerHandler',
+                    'handlers': [f'cfg://handlers.file_{name}'],
+                    'max_queue_size': LOG_QUEUE_SIZE,
+                } for name in LOGGERS if LOG_QUEUE
             },
         },
         'loggers': {
             'django': {
-                'handlers': ['django'],
+                'handlers': [LOG_HANDLER % 'django'],
                 'level': "DEBUG",
                 'propagate': False,
             },
             'notifications': {
-                'handlers': ['notifications'],
+                'handlers': [LOG_HANDLER % 'notifications'],
                 'level': "DEBUG",
                 'propagate': False,
             },
             'commands': {
-                'handlers': ['commands', ],
+                'handlers': [LOG_HANDLER % 'commands'],
                 'level': "INFO",
                 'propagate': False,
             },
             'updates': {
-                'handlers': ['updates'],
+                'handlers': [LOG_HANDLER % 'updates'],
                 'level': "DEBUG",
                 'propagate': False,
             },
             'discord': {
-                'handlers': ['discord'],
+                'handlers': [LOG_HANDLER % 'discord'],
                 'level': "DEBUG",
                 'propagate': False,
             }
         }
     }
 
+API_CACHE_MAX_AGE = env.int("API_CACHE_MAX_AGE", 30)  # seconds, detail responses are revalidated by ETag afterwards
+API_BULK_MAX_IDS = env.int("API_BULK_MAX_IDS", 100)
+API_BULK_IDS_PER_REQUEST = env.int("API_BULK_IDS_PER_REQUEST", 10)  # throttling weight of bulk requests
+
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'app_api.common.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.ScopedRateThrottle',
+        'app_api.common.throttling.WeightedScopedRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'teams': '250/day',
         'matches': '250/day',
+        'events': '2500/day',
+        'export': '24/day',
     }
 }
@@ -0,0 +1,82 @@
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import TimedRotatingFileHandler
+
+from utils.log_handlers import JSONFormatter, QueueListenerHandler
+
+FILE_FORMAT = "[%(asctime)s] %(levelname)s [%(name)s:%(lineno)s] %(message)s"
+
+
+def check_match(logger, match_id):
+    """
+    The logging of one checked match: the check itself, two notifications and one skipped debug line.
+    """
+    team = f"Team {match_id % 500}"
+    logger.info(f"Checking {match_id=} ({team=})...")
+    logger.debug(f"Skipped {match_id=}: unchanged")
+    logger.info(f"New notification for {match_id=} ({team=}): Neuer Terminvorschlag der Gegner")
+    logger.info(f"New notification for {match_id=} ({team=}): Neues Lineup des gegnerischen Teams")
+
+
+def measure(handler, matches, workers):
+    """
+    Returns: Seconds per match spent in the worker threads, seconds until everything is written
+    """
+    logger = logging.getLogger("benchmark_logging")
+    logger.handlers = [handler]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda x: check_match(logger, x), range(matches)))
+    logged = time.perf_counter() - start
+    handler.flush()
+    written = time.perf_counter() - start
+    handler.close()
+    return logged / matches, written
+
+
+class SyncedFileHandler(TimedRotatingFileHandler):
+    """
+    Waits for the disk after every record, like a log file on a slow or busy disk.
+    """
+
+    def flush(self):
+        super().flush()
+        if self.stream:
+            os.fsync(self.stream.fileno())
+
+
+def file_handler(directory, name, formatter, handler_class=TimedRotatingFileHandler):
+    handler = handler_class(os.path.join(directory, f"{name}.log"), when="midnight")
+    handler.setLevel(logging.INFO)
+    handler.setFormatter(formatter)
+    return handler
+
+
+def main(matches=20000, workers=10):
+    formatters = (("text", logging.Formatter(FILE_FORMAT)), ("json", JSONFormatter()))
+    disks = (("page cache", TimedRotatingFileHandler, matches), ("fsync", SyncedFileHandler, matches // 10))
+    with tempfile.TemporaryDirectory() as directory:
+        for disk, handler_class, disk_matches in disks:
+            print(f"{disk_matches} matches, {workers} threads, {disk}:")
+            for name, formatter in formatters:
+                handlers = (
+                    ("file", file_handler(directory, f"file_{name}", formatter, handler_class)),
+                    ("queue", QueueListenerHandler([
+                        file_handler(directory, f"queue_{name}", formatter, handler_class),
+                    ])),
+                )
+                for handler_name, handler in handlers:
+                    handler.setLevel(logging.INFO)
+                    per_match, written = measure(handler, disk_matches, workers)
+                    print(f"  {name} {handler_name:>5}: {per_match * 1e6:>6.1f} µs per match, "
+                          f"written after {written:.2f}s")
+
+
+# python manage.py runscript benchmark_logging
+def run():
+    main()
@@ -0,0 +1,60 @@
+import glob
+import json
+import os
+import timeit
+
+from django.conf import settings
+
+from core.parsing.logs import BaseLog
+from core.processors.match_processor import MatchDataProcessor
+
+
+def load_fixtures():
+    fixtures = []
+    for file_name in sorted(glob.glob(os.path.join(settings.STORAGE_DIR, "match_*.json"))):
+        with open(file_name, "r", encoding="utf8") as f:
+            data = json.load(f)
+        fixtures.append((data["match"]["match_id"], data["match"]["team_id_1"], data))
+    return fixtures
+
+
+def eager_poll(fixtures):
+    """
+    Previous behaviour: every log is parsed in the constructor, then the latest match begin log is searched.
+    """
+    for match_id, team_id, data in fixtures:
+        processor = MatchDataProcessor(match_id, team_id, data=data)
+        logs = [
+            BaseLog.return_specified_log(
+                timestamp=i.get("log_time"),
+                user_id=i.get("user_id"),
+                action=i.get("log_action"),
+                details=i.get("log_details"),
+            )
+            for i in reversed(data.get("logs", []))
+        ]
+        processor.get_latest_match_begin_log()
+        assert logs is not None
+
+
+def lazy_poll(fixtures):
+    for match_id, team_id, data in fixtures:
+        processor = MatchDataProcessor(match_id, team_id, data=data)
+        processor.get_latest_match_begin_log()
+
+
+def main(number=200):
+    fixtures = load_fixtures()
+    logs = sum(len(data.get("logs", [])) for *_, data in fixtures)
+    print(f"{len(fixtures)} match fixtures with {logs} logs, {number} polls each")
+    eager = timeit.timeit(lambda: eager_poll(fixtures), number=number)
+    lazy = timeit.timeit(lambda: lazy_poll(fixtures), number=number)
+    per_poll = 1_000_000 / (number * len(fixtures))
+    print(f"eager: {eager:.3f}s ({eager * per_poll:.1f}µs per match)")
+    print(f"lazy:  {lazy:.3f}s ({lazy * per_poll:.1f}µs per match)")
+    print(f"speedup: {eager / lazy:.1f}x")
+
+
+# python manage.py runscript benchmark_match_logs
+def run():
+    main()
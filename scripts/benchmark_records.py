@@ -0,0 +1,76 @@
+import tracemalloc
+from types import SimpleNamespace
+
+from core.parsing.logs import BaseLog
+from core.processors.match_processor import MatchDataProcessor
+from core.temporary_match_data import TemporaryComment, TemporaryMatchData
+from scripts.benchmark_match_logs import load_fixtures
+
+
+def _logs(data):
+    for i in data.get("logs", []):
+        yield i.get("log_time"), i.get("user_id"), i.get("log_action"), i.get("log_details")
+
+
+def build_slotted(fixtures):
+    records = []
+    for match_id, team_id, data in fixtures:
+        processor = MatchDataProcessor(match_id, team_id, data=data)
+        records.extend(BaseLog.return_specified_log(*x) for x in _logs(data))
+        records.append(TemporaryMatchData(
+            match_id=match_id,
+            match_day=processor.get_match_day(),
+            enemy_lineup=processor.get_enemy_lineup(),
+            team_lineup=processor.get_team_lineup(),
+            comments=[TemporaryComment(**x) for x in processor.get_comments()],
+        ))
+    return records
+
+
+def build_dict_backed(fixtures):
+    """
+    Previous behaviour: same records as ``build_slotted``, but every record carries its own ``__dict__``.
+    """
+    records = []
+    for match_id, team_id, data in fixtures:
+        processor = MatchDataProcessor(match_id, team_id, data=data)
+        for timestamp, user_id, action, details in _logs(data):
+            log = BaseLog.return_specified_log(timestamp, user_id, action, details)
+            if log is not None:
+                log = SimpleNamespace(timestamp=log.timestamp, user_id=log.user_id, details=log.details)
+            records.append(log)
+        records.append(SimpleNamespace(**{
+            **dict.fromkeys(TemporaryMatchData.__slots__),
+            "match_id": match_id,
+            "match_day": processor.get_match_day(),
+            "enemy_lineup": [tuple(x) for x in processor.get_enemy_lineup()],
+            "team_lineup": [tuple(x) for x in processor.get_team_lineup()],
+            "comments": [SimpleNamespace(**{"content": "", **x}) for x in processor.get_comments()],
+        }))
+    return records
+
+
+def measure(build, fixtures, cycles):
+    tracemalloc.start()
+    kept = [build(fixtures) for _ in range(cycles)]
+    size, peak = tracemalloc.get_traced_memory()
+    blocks = sum(x.count for x in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    del kept
+    return size, peak, blocks
+
+
+def main(cycles=20):
+    fixtures = load_fixtures()
+    print(f"{len(fixtures)} match fixtures, {cycles} cycles")
+    results = {}
+    for name, build in (("dict", build_dict_backed), ("slots", build_slotted)):
+        size, peak, blocks = measure(build, fixtures, cycles)
+        results[name] = size
+        print(f"{name:>5}: retained {size / 1024:.0f} KiB, peak {peak / 1024:.0f} KiB, {blocks} live allocations")
+    print(f"reduction: {1 - results['slots'] / results['dict']:.0%}")
+
+
+# python manage.py runscript benchmark_records
+def run():
+    main()
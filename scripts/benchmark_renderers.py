@@ -0,0 +1,70 @@
+import gzip
+import timeit
+from datetime import datetime, timedelta
+
+import pytz
+from rest_framework.renderers import JSONRenderer
+
+from app_api.common.middleware import brotli, compress_string_brotli
+from app_api.common.renderers import FastJSONRenderer
+
+
+def team_detail_payload(players=10, matches=40):
+    now = datetime(2022, 10, 3, 18, tzinfo=pytz.utc)
+    return {
+        "id": 183281,
+        "team_tag": "BTZ",
+        "name": "Beta Team Zeta",
+        "division": "4.12",
+        "players": [{
+            "id": 1_500_000 + i,
+            "summoner_name": f"Summoner {i}",
+            "name": f"Player {i}",
+            "is_leader": i == 0,
+            "created_at": now - timedelta(days=i),
+            "updated_at": now,
+        } for i in range(players)],
+        "created_at": now,
+        "updated_at": now,
+        "logo_url": "https://cdn0.gamesports.net/league_team_logos/183000/183281.jpg",
+        "matches_against": [{
+            "id": i,
+            "match_id": 930_000 + i,
+            "enemy_team_id": 160_000 + i,
+            "enemy_team_name": f"Enemy Team {i}",
+        } for i in range(matches)],
+    }
+
+
+def match_list_payload(matches=100):
+    team = {"id": 183281, "name": "Beta Team Zeta", "team_tag": "BTZ", "matches_count": 12}
+    return {
+        "next": "http://localhost/api/matches/?cursor=cD0xMDA%3D",
+        "previous": None,
+        "results": [{
+            "id": i,
+            "match_id": 930_000 + i,
+            "team": team,
+            "enemy_team": {**team, "id": 160_000 + i, "name": f"Enemy Team {i}"},
+            "result": "2:1",
+        } for i in range(matches)],
+    }
+
+
+def main(number=2000):
+    renderers = (("json", JSONRenderer()), ("orjson", FastJSONRenderer()))
+    for name, payload in (("team detail", team_detail_payload()), ("match list", match_list_payload())):
+        print(f"{name}:")
+        for renderer_name, renderer in renderers:
+            seconds = timeit.timeit(lambda: renderer.render(payload), number=number)
+            print(f"  {renderer_name:>6}: {number / seconds:>8.0f} responses/s")
+        content = FastJSONRenderer().render(payload)
+        sizes = f"  bytes: {len(content)} raw, {len(gzip.compress(content, 6))} gzip"
+        if brotli is not None:
+            sizes += f", {len(compress_string_brotli(content))} brotli"
+        print(sizes)
+
+
+# python manage.py runscript benchmark_renderers
+def run():
+    main()
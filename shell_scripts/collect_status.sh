@@ -0,0 +1,2 @@
+#!/bin/sh
+cd /opt/prime_bot/prime_bot_backend/ && venv/bin/python manage.py collect_status &
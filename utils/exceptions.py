@@ -22,6 +22,10 @@ class PrimeLeagueParseException(PrimeLeagueConnectionException):
     pass
 
 
+class PrimeLeagueCircuitOpenException(PrimeLeagueConnectionException):
+    pass
+
+
 class Div1orDiv2TeamException(Exception):
     pass
 
@@ -0,0 +1,161 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from prometheus_client import Counter
+
+from utils.metrics import NAMESPACE
+
+dropped_records = Counter(
+    "log_records_dropped", "Log records dropped because the queue of the listener was full.", labelnames=("handler",),
+    namespace=NAMESPACE,
+)
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Non-blocking handler for loggers used by many threads, e.g. the ``check_match`` workers of the updater.
+
+    ``emit`` only merges the message arguments and enqueues the record. A listener thread passes the records to the
+    target ``handlers``, so formatting, the locks and disk writes of the file handlers are taken by one thread. Use
+    one instance per logger and file. The listener is started lazily, also after a fork (gunicorn workers), and
+    flushed on exit. If the queue is full, records are dropped instead of blocking the caller. Drops are counted in
+    ``primebot_log_records_dropped_total`` and reported by a warning in front of the next enqueued record.
+
+    Configure it with ``dictConfig`` after the target handlers, they are referenced as ``cfg://handlers.<name>``.
+    Handlers are configured in alphabetical order of their names.
+    """
+
+    def __init__(self, handlers, max_queue_size=10000, respect_handler_level=True):
+        # indexing resolves the cfg:// references of dictConfig, iterating does not
+        self.handlers = [self._resolve(handlers[i]) for i in range(len(handlers))]
+        super().__init__(queue.Queue(maxsize=max_queue_size))
+        self.respect_handler_level = respect_handler_level
+        self.dropped = 0
+        self._unreported = 0
+        self._listener = None
+        self._pid = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    @staticmethod
+    def _resolve(handler):
+        if not isinstance(handler, logging.Handler):
+            raise ValueError(f"Target handler {handler!r} is not configured yet. Is its name sorted before the queue?")
+        return handler
+
+    def prepare(self, record):
+        """
+        Merges the arguments into the message and renders the traceback, so the record does not reference objects
+        which may change until the listener handles it. Unlike ``QueueHandler.prepare`` the message is not formatted,
+        that is left to the formatters of the target handlers.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        self.start()
+        if self._unreported:
+            self._report_dropped(record)
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._drop()
+
+    def _drop(self):
+        with self._lock:
+            self.dropped += 1
+            self._unreported += 1
+        dropped_records.labels(handler=self.name or "queue").inc()
+
+    def _report_dropped(self, record):
+        with self._lock:
+            count, self._unreported = self._unreported, 0
+        warning = logging.makeLogRecord({
+            "name": record.name, "levelno": logging.WARNING, "levelname": "WARNING", "module": __name__,
+            "msg": f"{count} log records dropped, the queue was full",
+        })
+        try:
+            self.queue.put_nowait(warning)
+        except queue.Full:
+            with self._lock:
+                self._unreported += count
+
+    def start(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # forked: the listener thread of the parent is gone and its queue may be in any state
+                self.queue = queue.Queue(maxsize=self.queue.maxsize)
+            self._listener = QueueListener(self.queue, *self.handlers, respect_handler_level=self.respect_handler_level)
+            self._listener.start()
+            self._pid = os.getpid()
+
+    def flush(self):
+        """
+        Waits until all enqueued records are handled.
+        """
+        if self._pid == os.getpid():
+            self.queue.join()
+        for handler in self.handlers:
+            handler.flush()
+
+    def close(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+            self._pid = None
+        for handler in self.handlers:
+            handler.flush()
+        super().close()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"queued": self.queue.qsize(), "dropped": self.dropped}
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats every record as one line of json for log shippers. Attributes given by ``extra`` are included if they are
+    listed in ``fields``.
+    """
+
+    def __init__(self, fields=(), **kwargs):
+        super().__init__(**kwargs)
+        self.fields = tuple(fields)
+
+    def format(self, record):
+        data = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "location": f"{record.module}:{record.lineno}",
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for field in self.fields:
+            if hasattr(record, field):
+                data[field] = getattr(record, field)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        if record.stack_info:
+            data["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
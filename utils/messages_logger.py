@@ -1,5 +1,12 @@
+import atexit
 import html
 import logging
+import os
+import queue
+import re
+import threading
+import traceback
+from collections import Counter
 
 from discord import Interaction
 from django.conf import settings
@@ -10,6 +17,184 @@ from utils.utils import Encoder
 logger = logging.getLogger("commands")
 
 
+class DeveloperLogSink:
+    """
+    Batches log messages for the developer group. ``emit`` only enqueues and never blocks, a background thread sends
+    all queued messages every ``flush_interval`` seconds as few Telegram messages as possible. If the queue is full,
+    new messages are dropped and counted.
+    """
+    MAX_MESSAGE_LENGTH = 4096  # Telegram limit
+    SEPARATOR = "\n\n"
+    TRUNCATION_RESERVE = 100  # characters for the closing tags and the marker of truncated texts
+    TRUNCATED = "\n[...]"
+    HTML_TAG = re.compile(r"<(/?)([a-zA-Z]+)[^>]*>")
+
+    def __init__(self, send=send_message_to_devs, flush_interval=10.0, max_queue_size=1000):
+        self.send = send
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = None
+
+    def emit(self, text: str):
+        try:
+            self._queue.put_nowait(text)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+        self._start()
+
+    def flush(self):
+        """
+        Sends all queued messages.
+        """
+        texts = []
+        while True:
+            try:
+                texts.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        with self._lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            texts.append(f"{dropped} log messages were dropped.")
+        for batch in self.batch(texts):
+            self.send(batch)
+
+    def batch(self, texts):
+        """
+        Joins the texts to messages of at most ``MAX_MESSAGE_LENGTH`` characters. Longer texts are truncated.
+        """
+        current = ""
+        for text in texts:
+            text = self.truncate(text)
+            if current and len(current) + len(self.SEPARATOR) + len(text) > self.MAX_MESSAGE_LENGTH:
+                yield current
+                current = ""
+            current = f"{current}{self.SEPARATOR}{text}" if current else text
+        if current:
+            yield current
+
+    def truncate(self, text):
+        """
+        Truncates texts longer than ``MAX_MESSAGE_LENGTH`` without breaking their HTML, otherwise Telegram rejects the
+        whole batch: the text is cut at the last line break, or within a line before a split tag or entity, and all
+        tags still open are closed.
+        """
+        if len(text) <= self.MAX_MESSAGE_LENGTH:
+            return text
+        limit = self.MAX_MESSAGE_LENGTH - self.TRUNCATION_RESERVE
+        text = text[:limit]
+        line_end = text.rfind("\n")
+        if line_end > limit // 2:
+            text = text[:line_end]
+        if text.rfind("<") > text.rfind(">"):
+            text = text[:text.rfind("<")]
+        if text.rfind("&") > text.rfind(";"):
+            text = text[:text.rfind("&")]
+        open_tags = []
+        for closing, name in self.HTML_TAG.findall(text):
+            name = name.lower()
+            if not closing:
+                open_tags.append(name)
+            elif name in open_tags:
+                del open_tags[len(open_tags) - 1 - open_tags[::-1].index(name)]
+        return text + "".join(f"</{x}>" for x in reversed(open_tags)) + self.TRUNCATED
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="developer_log_sink", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def close(self):
+        """
+        Stops the background thread and sends all queued messages.
+        """
+        self._closed.set()
+        self.flush()
+
+    def _run(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.exception(e)
+
+
+developer_log_sink = DeveloperLogSink(
+    flush_interval=settings.DEVELOPER_LOG_FLUSH_INTERVAL, max_queue_size=settings.DEVELOPER_LOG_MAX_QUEUE_SIZE,
+)
+
+
+class ErrorAggregator:
+    """
+    Thread-safe collection of the errors of one update run. Errors are fingerprinted by exception type and the
+    innermost stack frame in project code, so ``report`` sends one digest per run instead of one message per error.
+    """
+    MAX_DIGEST_ENTRIES = 10
+
+    def __init__(self, send=send_message_to_devs):
+        self.send = send
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._examples = {}
+
+    def record(self, e: Exception, context=None):
+        fingerprint = self.fingerprint(e)
+        with self._lock:
+            self._counts[fingerprint] += 1
+            if fingerprint not in self._examples:
+                self._examples[fingerprint] = f"{context}: {e}" if context is not None else str(e)
+
+    def report(self, title: str):
+        """
+        Logs and sends the digest of all recorded errors and resets the aggregator. Does nothing without errors.
+        """
+        with self._lock:
+            counts, examples = self._counts, self._examples
+            self._counts, self._examples = Counter(), {}
+        if not counts:
+            return
+        digest = self.digest(title, counts, examples)
+        logging.getLogger("updates").warning(digest.replace("\n", ";"))
+        self.send(digest)
+
+    @classmethod
+    def digest(cls, title, counts: Counter, examples: dict) -> str:
+        lines = [f"<b>{html.escape(title)}</b>: {sum(counts.values())} errors, {len(counts)} distinct"]
+        for fingerprint, count in counts.most_common(cls.MAX_DIGEST_ENTRIES):
+            example = html.escape(examples[fingerprint][:200])
+            lines.append(f"{count}x <code>{html.escape(fingerprint)}</code>\n{example}")
+        if len(counts) > cls.MAX_DIGEST_ENTRIES:
+            lines.append(f"... and {len(counts) - cls.MAX_DIGEST_ENTRIES} more")
+        return "\n".join(lines)
+
+    @staticmethod
+    def fingerprint(e: Exception) -> str:
+        """
+        Returns: Exception type and the innermost frame in project code, e.g.
+            ``PrimeLeagueConnectionException at core/api.py:42 (_request)``
+        """
+        frames = traceback.extract_tb(e.__traceback__)
+        base_dir = str(settings.BASE_DIR)
+        own_frames = [x for x in frames if x.filename.startswith(base_dir) and "site-packages" not in x.filename]
+        if not (own_frames or frames):
+            return type(e).__name__
+        frame = (own_frames or frames)[-1]
+        filename = os.path.relpath(frame.filename, base_dir) if own_frames else os.path.basename(frame.filename)
+        return f"{type(e).__name__} at {filename}:{frame.lineno} ({frame.name})"
+
+
+update_errors = ErrorAggregator()
+
+
 def create_log_message(prefix=None, separator="\n", **kwargs, ):
     """
     Anonymisiere ``user``, `channel` und ``chat_id`` und erstelle dann eine message.
@@ -111,18 +296,21 @@ async def log_from_discord(interaction: Interaction, optional=None):
 
 
 def log_exception(fn):
+    """
+    Logs exceptions of update functions and records them for the digest of the update run (``update_errors``).
+    """
+
     def wrapper(*args, **kwargs):
         try:
             result = fn(*args, **kwargs)
             return result
         except Exception as e:
             logging.getLogger("updates").exception(e)
-            text = f"Error in Updates: <code>{e}</code>\n. See <code>update.log</code> for more information."
-            # send_message_to_devs(text) # TODO Nur einen Log senden und nicht 1000 alle 15 Minuten"
+            update_errors.record(e)
 
     return wrapper
 
 
 def spread_message(log_text: str, ):
     logger.info(log_text.replace("\n", ";"))
-    send_message_to_devs(log_text)
+    developer_log_sink.emit(log_text)
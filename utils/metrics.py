@@ -0,0 +1,155 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from prometheus_client import REGISTRY, CollectorRegistry, Gauge, Histogram, generate_latest, multiprocess, \
+    write_to_textfile
+from prometheus_client.exposition import CONTENT_TYPE_LATEST
+from prometheus_client.metrics_core import Metric
+
+logger = logging.getLogger("django")
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+NAMESPACE = "primebot"
+
+# Metrics are defined with ``prometheus_client``. The web server sets ``PROMETHEUS_MULTIPROC_DIR`` for its workers
+# (multiprocess mode), so ``/api/metrics/`` aggregates the metrics of all workers. The directory must be emptied
+# before the server starts and ``prometheus_client.multiprocess.mark_process_dead`` called when a worker exits.
+# All other processes (update commands, bots) keep their metrics in memory and write them to ``METRICS_TEXTFILE_DIR``
+# for the textfile collector of the node exporter.
+
+stage_seconds = Histogram(
+    "stage_duration_seconds", "Duration of the stages of match and team updates.", labelnames=("stage",),
+    namespace=NAMESPACE,
+)
+external_request_seconds = Histogram(
+    "external_request_duration_seconds", "Latency of requests to external services by HTTP status.",
+    labelnames=("service", "status"), namespace=NAMESPACE,
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+def is_multiprocess():
+    return "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+
+def render() -> bytes:
+    """
+    Returns: Metrics of this process in the Prometheus text format, in multiprocess mode those of all processes
+    """
+    registry = REGISTRY
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def time_stage(stage):
+    """
+    Context manager timing one stage of an update, e.g. ``fetch``, ``decode`` or ``dispatch``.
+    """
+    return stage_seconds.labels(stage=stage).time()
+
+
+class ExternalRequest:
+    __slots__ = ("status",)
+
+    def __init__(self):
+        self.status = None
+
+
+@contextmanager
+def track_request(service):
+    """
+    Times a request to an external service. Set ``status`` of the yielded object to the HTTP status of the response.
+    The status of failed requests is taken from the exception (``status``, ``status_code`` or ``error_code``),
+    otherwise ``error``.
+    """
+    request = ExternalRequest()
+    start = time.perf_counter()
+    try:
+        yield request
+    except Exception as e:
+        if request.status is None:
+            request.status = next(
+                (getattr(e, x) for x in ("status", "status_code", "error_code") if getattr(e, x, None)), "error"
+            )
+        raise
+    finally:
+        external_request_seconds.labels(service=service, status=request.status or "ok").observe(
+            time.perf_counter() - start
+        )
+
+
+class LabelledCollector:
+    """
+    Adds ``labels`` to every sample of ``registry``.
+    """
+
+    def __init__(self, registry, labels: dict):
+        self.registry = registry
+        self.labels = labels
+
+    def collect(self):
+        for metric in self.registry.collect():
+            labelled = Metric(metric.name, metric.documentation, metric.type, metric.unit)
+            labelled.samples = [x._replace(labels={**self.labels, **x.labels}) for x in metric.samples]
+            yield labelled
+
+
+def write_textfile(name, labels: dict, *registries):
+    """
+    Writes the metrics of this process and of ``registries`` atomically to ``METRICS_TEXTFILE_DIR/primebot_<name>.prom``
+    if the directory is configured. The node exporter rejects series which appear in more than one file, so every
+    process writing a file must add distinguishing ``labels``.
+    """
+    if not settings.METRICS_TEXTFILE_DIR:
+        return
+    registry = CollectorRegistry(auto_describe=False)
+    for collected in (REGISTRY, *registries):
+        registry.register(LabelledCollector(collected, labels))
+    write_to_textfile(os.path.join(settings.METRICS_TEXTFILE_DIR, f"primebot_{name}.prom"), registry)
+
+
+def export_command_metrics(command, duration):
+    """
+    Records the run of a management command and writes all metrics of the process, labelled with the command.
+    """
+    registry = CollectorRegistry()
+    Gauge(
+        "command_duration_seconds", "Duration of the last run of a management command.", namespace=NAMESPACE,
+        registry=registry,
+    ).set(duration)
+    Gauge(
+        "command_finished_timestamp_seconds", "Unix time the last run of a management command finished.",
+        namespace=NAMESPACE, registry=registry,
+    ).set_to_current_time()
+    write_textfile(command, {"command": command}, registry)
+
+
+def export_process_metrics(name, interval=None):
+    """
+    Writes the metrics of a long-running process, like a bot, labelled with ``process=<name>`` every ``interval``
+    seconds (default ``METRICS_EXPORT_INTERVAL``) from a daemon thread.
+
+    Returns: Event stopping the export or None if ``METRICS_TEXTFILE_DIR`` is not configured
+    """
+    if not settings.METRICS_TEXTFILE_DIR:
+        return None
+    interval = interval or settings.METRICS_EXPORT_INTERVAL
+    stopped = threading.Event()
+
+    def run():
+        while True:
+            try:
+                write_textfile(name, {"process": name})
+            except Exception as e:
+                logger.exception(e)
+            if stopped.wait(interval):
+                return
+
+    threading.Thread(target=run, name=f"metrics_export_{name}", daemon=True).start()
+    return stopped
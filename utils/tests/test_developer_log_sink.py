@@ -0,0 +1,64 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from utils.messages_logger import DeveloperLogSink
+
+
+class DeveloperLogSinkTest(SimpleTestCase):
+
+    def test_batches_messages(self):
+        send = mock.Mock()
+        sink = DeveloperLogSink(send=send, flush_interval=60)
+        with mock.patch.object(sink, "_start"):
+            for i in range(3):
+                sink.emit(f"message {i}")
+        sink.flush()
+        send.assert_called_once_with("message 0\n\nmessage 1\n\nmessage 2")
+
+    def test_split_at_message_length(self):
+        sink = DeveloperLogSink(send=mock.Mock())
+        batches = list(sink.batch(["a" * 3000, "b" * 3000, "c" * 5000]))
+        self.assertEqual([len(x) for x in batches[:2]], [3000, 3000])
+        self.assertEqual(batches[2], "c" * 3996 + "\n[...]")
+
+    def assertValidHTML(self, text):
+        self.assertLessEqual(len(text), DeveloperLogSink.MAX_MESSAGE_LENGTH)
+        self.assertTrue(text.endswith("\n[...]"))
+        for tag in ("b", "pre", "code"):
+            self.assertEqual(text.count(f"<{tag}>"), text.count(f"</{tag}>"), tag)
+        self.assertNotRegex(text, r"&[a-z]*(?![a-z;])|<[^>]*<")
+
+    def test_truncate_oversized_html_at_line_break(self):
+        text = "<b>update_matches</b>\n<pre>" + "".join(
+            f"<code>match {i}</code>: Team &amp; Co &lt;3\n" for i in range(500)
+        ) + "</pre>"
+        truncated = DeveloperLogSink(send=mock.Mock()).truncate(text)
+        self.assertValidHTML(truncated)
+        self.assertTrue(truncated.endswith("&lt;3</pre>\n[...]"))
+
+    def test_truncate_oversized_html_line(self):
+        sink = DeveloperLogSink(send=mock.Mock())
+        for padding in range(5):
+            text = "<b>Error</b> <code>" + "x" * padding + "&lt;<i>a</i>&gt;" * 500 + "</code>"
+            self.assertValidHTML(sink.truncate(text))
+
+    def test_drops_messages_if_queue_is_full(self):
+        send = mock.Mock()
+        sink = DeveloperLogSink(send=send, max_queue_size=2)
+        with mock.patch.object(sink, "_start"):
+            for i in range(5):
+                sink.emit(f"message {i}")
+        sink.flush()
+        send.assert_called_once_with("message 0\n\nmessage 1\n\n3 log messages were dropped.")
+
+    def test_background_flush(self):
+        sent = threading.Event()
+        sink = DeveloperLogSink(send=lambda text: sent.set(), flush_interval=0.01)
+        with mock.patch("utils.messages_logger.atexit"):
+            sink.emit("message")
+        self.assertTrue(sent.wait(timeout=2))
+        sink.close()
+        sink._thread.join(timeout=2)
+        self.assertFalse(sink._thread.is_alive())
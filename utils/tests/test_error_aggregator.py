@@ -0,0 +1,48 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from utils.messages_logger import ErrorAggregator, log_exception
+
+
+def fail(exception_class):
+    raise exception_class("Prime League not reachable")
+
+
+class ErrorAggregatorTest(SimpleTestCase):
+
+    def record(self, aggregator, exception_class, context=None):
+        try:
+            fail(exception_class)
+        except Exception as e:
+            aggregator.record(e, context=context)
+
+    def test_one_digest_per_run(self):
+        send = mock.Mock()
+        aggregator = ErrorAggregator(send=send)
+        for i in range(100):
+            self.record(aggregator, ConnectionError, context=f"team {i}")
+        self.record(aggregator, ValueError)
+        with self.assertLogs("updates", level="WARNING"):
+            aggregator.report("update_teams")
+        send.assert_called_once()
+        digest = send.call_args.args[0]
+        self.assertIn("101 errors, 2 distinct", digest)
+        self.assertIn("100x <code>ConnectionError at utils/tests/test_error_aggregator.py:", digest)
+        self.assertIn("team 0: Prime League not reachable", digest)
+
+        aggregator.report("update_teams")
+        send.assert_called_once()
+
+    def test_fingerprint(self):
+        try:
+            fail(KeyError)
+        except KeyError as e:
+            fingerprint = ErrorAggregator.fingerprint(e)
+        self.assertRegex(fingerprint, r"^KeyError at utils/tests/test_error_aggregator.py:\d+ \(fail\)$")
+
+    def test_log_exception_records_errors(self):
+        aggregator = ErrorAggregator(send=mock.Mock())
+        with mock.patch("utils.messages_logger.update_errors", aggregator), self.assertLogs("updates"):
+            self.assertIsNone(log_exception(fail)(ValueError))
+        self.assertEqual(sum(aggregator._counts.values()), 1)
@@ -0,0 +1,148 @@
+import json
+import logging
+import logging.config
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+from prometheus_client import REGISTRY
+
+from utils.log_handlers import JSONFormatter, QueueListenerHandler
+
+
+class RecordingHandler(logging.Handler):
+
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level=level)
+        self.records = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.add(threading.current_thread().name)
+
+
+class QueueListenerHandlerTest(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch("utils.log_handlers.atexit")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.target = RecordingHandler(level=logging.INFO)
+        self.handler = QueueListenerHandler([self.target])
+        self.logger = logging.getLogger("test_log_handlers")
+        self.logger.handlers = [self.handler]
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        self.addCleanup(self.handler.close)
+
+    def test_listener_writes_records_of_all_threads(self):
+        threads = [threading.Thread(target=self.logger.info, args=("match %s", i)) for i in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.handler.flush()
+
+        self.assertCountEqual([x.getMessage() for x in self.target.records], [f"match {i}" for i in range(10)])
+        self.assertEqual(len(self.target.threads), 1)
+        self.assertNotIn(threading.current_thread().name, self.target.threads)
+
+    def test_arguments_are_merged_before_enqueue(self):
+        data = {"state": "old"}
+        with mock.patch.object(self.handler, "start"):
+            self.logger.info("match %s", data)
+        data["state"] = "new"
+        record = self.handler.queue.get_nowait()
+        self.assertEqual(record.getMessage(), "match {'state': 'old'}")
+        self.assertIsNone(record.args)
+
+    def test_exception_is_rendered(self):
+        try:
+            raise ValueError("broken")
+        except ValueError:
+            self.logger.exception("failed")
+        self.handler.flush()
+
+        record, = self.target.records
+        self.assertIsNone(record.exc_info)
+        self.assertIn("ValueError: broken", record.exc_text)
+        self.assertIn("ValueError: broken", logging.Formatter().format(record))
+
+    def test_respects_level_of_target_handler(self):
+        self.logger.debug("skipped")
+        self.logger.warning("written")
+        self.handler.flush()
+        self.assertEqual([x.getMessage() for x in self.target.records], ["written"])
+
+    def test_drops_records_if_queue_is_full(self):
+        handler = QueueListenerHandler([self.target], max_queue_size=2)
+        handler.name = "queue_test"
+        self.logger.handlers = [handler]
+        before = REGISTRY.get_sample_value("primebot_log_records_dropped_total", {"handler": "queue_test"}) or 0
+        with mock.patch.object(handler, "start"):
+            for i in range(5):
+                self.logger.info("match %s", i)
+        self.assertEqual(handler.snapshot(), {"queued": 2, "dropped": 3})
+        self.assertEqual(REGISTRY.get_sample_value("primebot_log_records_dropped_total", {"handler": "queue_test"}),
+                         before + 3)
+
+        handler.queue.get_nowait()
+        handler.queue.get_nowait()
+        with mock.patch.object(handler, "start"):
+            self.logger.info("match 5")
+        warning, record = handler.queue.get_nowait(), handler.queue.get_nowait()
+        self.assertEqual((warning.levelname, warning.name), ("WARNING", "test_log_handlers"))
+        self.assertEqual(warning.getMessage(), "3 log records dropped, the queue was full")
+        self.assertEqual(record.getMessage(), "match 5")
+
+    def test_close_writes_pending_records(self):
+        for i in range(100):
+            self.logger.info("match %s", i)
+        self.handler.close()
+        self.assertEqual(len(self.target.records), 100)
+
+    def test_dict_config(self):
+        target = RecordingHandler()
+        configurator = logging.config.DictConfigurator({
+            "handlers": {
+                "file_updates": target,
+                "queue": {
+                    "()": "utils.log_handlers.QueueListenerHandler",
+                    "handlers": ["cfg://handlers.file_updates"],
+                },
+            },
+        })
+        handler = configurator.configure_handler(configurator.config["handlers"]["queue"])
+        self.addCleanup(handler.close)
+        self.assertEqual(handler.handlers, [target])
+
+    def test_unconfigured_target_handler(self):
+        with self.assertRaisesMessage(ValueError, "not configured yet"):
+            QueueListenerHandler(["cfg://handlers.file_updates"])
+
+
+class JSONFormatterTest(SimpleTestCase):
+
+    def make_record(self, **kwargs):
+        return logging.makeLogRecord({
+            "name": "updates", "levelno": logging.INFO, "levelname": "INFO", "msg": "Checking match_id=%s",
+            "args": (930001,), "module": "matches_check_executor", "lineno": 57, "created": 1665000000.0, **kwargs,
+        })
+
+    def test_format(self):
+        data = json.loads(JSONFormatter().format(self.make_record()))
+        self.assertEqual(data["message"], "Checking match_id=930001")
+        self.assertEqual(data["time"], "2022-10-05T20:00:00.000+00:00")
+        self.assertEqual(data["level"], "INFO")
+        self.assertEqual(data["logger"], "updates")
+        self.assertEqual(data["location"], "matches_check_executor:57")
+        self.assertNotIn("exception", data)
+
+    def test_extra_fields_and_exception(self):
+        record = self.make_record(team_id=183281, secret="x", exc_text="Traceback ...\nValueError")
+        data = json.loads(JSONFormatter(fields=["team_id", "match_id"]).format(record))
+        self.assertEqual(data["team_id"], 183281)
+        self.assertNotIn("match_id", data)
+        self.assertNotIn("secret", data)
+        self.assertEqual(data["exception"], "Traceback ...\nValueError")
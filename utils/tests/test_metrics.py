@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from prometheus_client import REGISTRY, CollectorRegistry, Counter
+
+from utils.metrics import export_command_metrics, render, time_stage, track_request, write_textfile
+
+WORKER = """
+from prometheus_client import Counter
+Counter("test_worker_requests", "Requests.").inc({})
+"""
+
+
+class MetricsTest(SimpleTestCase):
+
+    def test_time_stage(self):
+        before = REGISTRY.get_sample_value("primebot_stage_duration_seconds_count", {"stage": "test"}) or 0
+        with time_stage("test"):
+            pass
+        self.assertEqual(REGISTRY.get_sample_value("primebot_stage_duration_seconds_count", {"stage": "test"}),
+                         before + 1)
+
+    def test_render_aggregates_processes_in_multiprocess_mode(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for value in (1, 2):
+                subprocess.run([sys.executable, "-c", WORKER.format(value)], check=True,
+                               env={**os.environ, "PROMETHEUS_MULTIPROC_DIR": directory})
+            with mock.patch.dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directory):
+                content = render().decode()
+        self.assertIn("test_worker_requests_total 3.0\n", content)
+
+    def test_write_textfile_adds_labels(self):
+        registry = CollectorRegistry()
+        Counter("runs", "Runs.", registry=registry).inc()
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_TEXTFILE_DIR=directory):
+            write_textfile("test", {"process": "test"}, registry)
+            self.assertEqual(os.listdir(directory), ["primebot_test.prom"])
+            with open(os.path.join(directory, "primebot_test.prom"), encoding="utf8") as f:
+                self.assertIn('runs_total{process="test"} 1.0\n', f.read())
+
+    def test_export_command_metrics_without_shared_series(self):
+        with time_stage("fetch"):
+            pass
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_TEXTFILE_DIR=directory):
+            series = []
+            for command in ("update_matches", "update_teams"):
+                export_command_metrics(command, duration=1.5)
+                with open(os.path.join(directory, f"primebot_{command}.prom"), encoding="utf8") as f:
+                    lines = [x for x in f.read().splitlines() if not x.startswith("#")]
+                self.assertIn(f'primebot_command_duration_seconds{{command="{command}"}} 1.5', lines)
+                series.append({x.rsplit(" ", 1)[0] for x in lines})
+        self.assertFalse(series[0] & series[1])
+
+
+class TrackRequestTest(SimpleTestCase):
+
+    def count(self, service, status):
+        labels = {"service": service, "status": str(status)}
+        return REGISTRY.get_sample_value("primebot_external_request_duration_seconds_count", labels) or 0
+
+    def test_status_of_response(self):
+        before = self.count("test", 200)
+        with track_request("test") as request:
+            request.status = 200
+        self.assertEqual(self.count("test", 200), before + 1)
+
+    def test_status_of_exception(self):
+        class HTTPException(Exception):
+            status = 503
+
+        before = self.count("test", 503), self.count("test", "error")
+        with self.assertRaises(HTTPException), track_request("test"):
+            raise HTTPException()
+        with self.assertRaises(ValueError), track_request("test"):
+            raise ValueError()
+        self.assertEqual((self.count("test", 503), self.count("test", "error")), (before[0] + 1, before[1] + 1))